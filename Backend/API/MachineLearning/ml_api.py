@@ -31,6 +31,9 @@ from pydantic import BaseModel, Field, field_validator
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# SoilType yanıtlarındaki eksik değer işaretleri
+_MISSING = frozenset({-9, -9.0})
+
 
 # FastAPI Router (yalnızca router, server başlatmaz)
 router = APIRouter(prefix="/ml", tags=["Machine Learning"])
@@ -39,22 +42,8 @@ router = APIRouter(prefix="/ml", tags=["Machine Learning"])
 # ---------- Pydantic Modelleri ----------
 class Coordinates(BaseModel):
     """Koordinat verisi modeli (enlem/boylam doğrulaması içerir)."""
-    longitude: float
-    latitude: float
-
-    @field_validator('longitude')
-    @classmethod
-    def validate_longitude(cls, v: float) -> float:
-        if not (-180 <= v <= 180):
-            raise ValueError('Longitude must be between -180 and 180')
-        return float(v)
-
-    @field_validator('latitude')
-    @classmethod
-    def validate_latitude(cls, v: float) -> float:
-        if not (-90 <= v <= 90):
-            raise ValueError('Latitude must be between -90 and 90')
-        return float(v)
+    longitude: float = Field(..., ge=-180, le=180, description="Boylam (-180 ile 180 arası)")
+    latitude: float = Field(..., ge=-90, le=90, description="Enlem (-90 ile 90 arası)")
 
 
 class MLRequest(BaseModel):
@@ -332,7 +321,7 @@ class MLService:
             for prop in properties:
                 if prop.get('name') == property_name:
                     value = prop.get('value')
-                    if value is not None and value != -9.0 and value != -9:
+                    if value is not None and value not in _MISSING:
                         return float(value)
             return 0.0  # Varsayılan değer
             
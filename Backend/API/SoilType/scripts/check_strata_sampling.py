@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Stratified örnekleme yansızlık kontrolü
+=======================================
+
+Sentetik bir kara maskesinde (hücrelerin yarısı tamamen kara, yarısı yarı kara)
+SoilAnalysisService._sample_land_strata ile aday üretir, maskeden geçen noktaları
+sayar ve kara birim alanı başına yoğunluğun tam kara ve yarı kara hücrelerde aynı
+olduğunu doğrular. Bbox içinde düzgün örnekleme ile eşdeğer (kıyı/sınır
+bölgelerini seyreltmeyen) bir örneklemede iki yoğunluk arasındaki fark yalnızca
+örnekleme gürültüsü kadardır.
+
+Kullanım (Backend/API klasöründen):
+    python SoilType/scripts/check_strata_sampling.py
+    python SoilType/scripts/check_strata_sampling.py --points 400000 --tolerance 0.03
+"""
+
+import argparse
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from SoilType.soil_api import STRATA_GRID, SoilAnalysisService, _land_strata_weights  # noqa: E402
+
+
+def _synthetic_mask(lons: np.ndarray, lats: np.ndarray) -> np.ndarray:
+    """Sol yarıdaki hücreler tamamen kara, sağ yarıdakilerin yalnızca alt yarısı kara (bbox: 0-1)"""
+    cell_lat = lats * STRATA_GRID % 1.0
+    return (lons < 0.5) | (cell_lat < 0.5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stratified örneklemenin kara alanı başına yoğunluğunu kontrol et")
+    parser.add_argument('--points', type=int, default=400_000, help='Üretilecek aday sayısı')
+    parser.add_argument('--tolerance', type=float, default=0.03, help='İzin verilen göreli yoğunluk farkı')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    # Hücre kara oranları (p_S): sol yarı 1.0, sağ yarı 0.5
+    fractions = np.where(np.arange(STRATA_GRID) < STRATA_GRID // 2, 1.0, 0.5)
+    fractions = np.repeat(fractions, STRATA_GRID)  # hücre indeksi = lon hücresi * STRATA_GRID + lat hücresi
+    weights, acceptance = _land_strata_weights(fractions)
+
+    # _sample_land_strata yalnızca bbox, hücre boyutu ve ağırlıkları kullanır
+    service = SimpleNamespace(
+        turkey_bounds=SimpleNamespace(bounds=(0.0, 0.0, 1.0, 1.0)),
+        _strata_cell=(1.0 / STRATA_GRID, 1.0 / STRATA_GRID),
+        _strata_weights=weights,
+    )
+    rng = np.random.default_rng(args.seed)
+    lons, lats = SoilAnalysisService._sample_land_strata(service, rng, args.points)
+    inside = _synthetic_mask(lons, lats)
+
+    full = lons[inside] < 0.5
+    land_area_full = 0.5 * 1.0
+    land_area_half = 0.5 * 0.5
+    density_full = np.count_nonzero(full) / land_area_full
+    density_half = np.count_nonzero(~full) / land_area_half
+    difference = abs(density_full - density_half) / density_full
+    observed_acceptance = inside.mean()
+
+    print(f"Kara alanı başına yoğunluk: tam kara {density_full:.0f}, yarı kara {density_half:.0f} "
+          f"(fark %{difference * 100:.2f})")
+    print(f"Kabul oranı: beklenen {acceptance:.4f}, gözlenen {observed_acceptance:.4f}")
+
+    if difference > args.tolerance or abs(observed_acceptance - acceptance) > args.tolerance * acceptance:
+        print("❌ Stratified örnekleme kara alanına göre yanlı")
+        sys.exit(1)
+    print("✅ Stratified örnekleme kara alanı başına düzgün")
+
+
+if __name__ == "__main__":
+    main()
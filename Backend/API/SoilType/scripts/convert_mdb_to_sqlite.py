@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+HWSD2.mdb -> HWSD2.sqlite dönüştürücü
+=====================================
+
+Soil API'nin kullandığı HWSD2_SMU ve HWSD2_LAYERS tablolarını Access
+veritabanından (ODBC) tek seferlik okuyup SQLite dosyasına yazar ve
+HWSD2_SMU_ID kolonuna indeks ekler. SQLite dosyası Data klasöründe
+bulunduğunda soil_api.py ODBC yerine onu kullanır.
+
+Kullanım (Access ODBC sürücüsü kurulu bir makinede):
+    python scripts/convert_mdb_to_sqlite.py
+    python scripts/convert_mdb_to_sqlite.py --mdb Data/HWSD2.mdb --out Data/HWSD2.sqlite
+"""
+
+import argparse
+import os
+import sqlite3
+from decimal import Decimal
+
+import pyodbc
+
+# Dönüştürülecek tablolar
+TABLES = ('HWSD2_SMU', 'HWSD2_LAYERS')
+
+# executemany ile tek seferde yazılacak satır sayısı
+BATCH_SIZE = 5000
+
+
+def _sqlite_type(type_code) -> str:
+    """ODBC kolon tipini SQLite tip adına çevir"""
+    if type_code in (int, bool):
+        return 'INTEGER'
+    if type_code in (float, Decimal):
+        return 'REAL'
+    if type_code is str:
+        return 'TEXT'
+    return 'BLOB'
+
+
+def _to_sqlite_value(value):
+    """Decimal değerleri float'a çevir (sqlite3 Decimal saklayamaz)"""
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def convert_table(odbc_conn, sqlite_conn, table: str) -> int:
+    """Tek bir tabloyu SQLite'a kopyala, yazılan satır sayısını döndür"""
+    cursor = odbc_conn.cursor()
+    cursor.execute(f"SELECT * FROM [{table}]")
+    columns = [(column[0], _sqlite_type(column[1])) for column in cursor.description]
+
+    column_defs = ', '.join(f'[{name}] {col_type}' for name, col_type in columns)
+    placeholders = ', '.join('?' for _ in columns)
+    sqlite_conn.execute(f"DROP TABLE IF EXISTS [{table}]")
+    sqlite_conn.execute(f"CREATE TABLE [{table}] ({column_defs})")
+
+    total = 0
+    while True:
+        rows = cursor.fetchmany(BATCH_SIZE)
+        if not rows:
+            break
+        sqlite_conn.executemany(
+            f"INSERT INTO [{table}] VALUES ({placeholders})",
+            [tuple(_to_sqlite_value(v) for v in row) for row in rows]
+        )
+        total += len(rows)
+
+    sqlite_conn.execute(f"CREATE INDEX [idx_{table}_smu_id] ON [{table}] ([HWSD2_SMU_ID])")
+    return total
+
+
+def main():
+    data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Data')
+
+    parser = argparse.ArgumentParser(description="HWSD2.mdb tablolarını SQLite'a dönüştür")
+    parser.add_argument('--mdb', default=os.path.join(data_dir, 'HWSD2.mdb'), help='Kaynak Access dosyası')
+    parser.add_argument('--out', default=os.path.join(data_dir, 'HWSD2.sqlite'), help='Hedef SQLite dosyası')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.mdb):
+        raise FileNotFoundError(f"Database file not found: {args.mdb}")
+
+    conn_str = (
+        r'DRIVER={Microsoft Access Driver (*.mdb, *.accdb)};'
+        rf'DBQ={args.mdb};'
+    )
+
+    odbc_conn = pyodbc.connect(conn_str)
+    sqlite_conn = sqlite3.connect(args.out)
+    try:
+        for table in TABLES:
+            count = convert_table(odbc_conn, sqlite_conn, table)
+            sqlite_conn.commit()
+            print(f"✅ {table}: {count} satır yazıldı")
+    finally:
+        sqlite_conn.close()
+        odbc_conn.close()
+
+    print(f"✅ SQLite veritabanı hazır: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
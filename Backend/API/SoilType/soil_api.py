@@ -20,20 +20,40 @@ Version: 1.0.0
 """
 
 import pyodbc
+import sqlite3
 import rasterio
+from rasterio.coords import BoundingBox
+from rasterio.transform import Affine
+from rasterio.features import rasterize
 import os
+import csv
+import asyncio
+import shelve
 import geocoder
+import httpx
 import re
-import random
 import math
+import threading
+import time
+import pickle
+import numpy as np
+from scipy.stats import qmc
 import geopandas as gpd
+import shapely
+import shapely.wkb
 from shapely.geometry import Point
-from geopy.geocoders import Nominatim
-from typing import Optional, Dict, Any, List
+from shapely.strtree import STRtree
+from typing import Optional, Dict, Any, List, Tuple
 from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel, Field, field_validator
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 import logging
 from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 # Logging konfigürasyonu
 logging.basicConfig(
@@ -49,6 +69,8 @@ router = APIRouter(prefix="/soiltype", tags=["Soil Analysis"])
 # Pydantic modelleri
 class ManualRequest(BaseModel):
     """Manuel koordinat girişi için model"""
+    model_config = ConfigDict(extra='forbid')
+    
     method: str = Field(..., description="Method type", example="Manual")
     longitude: float = Field(..., ge=-180, le=180, description="Boylam (-180 ile 180 arası)")
     latitude: float = Field(..., ge=-90, le=90, description="Enlem (-90 ile 90 arası)")
@@ -60,21 +82,14 @@ class ManualRequest(BaseModel):
             raise ValueError('Method must be "Manual" for manual coordinates')
         return v.title()
     
-    @field_validator('longitude', 'latitude')
-    @classmethod
-    def validate_coordinates(cls, v):
-        """Koordinat değerlerini doğrula ve güvenlik kontrolü yap"""
-        if not isinstance(v, (int, float)):
-            raise ValueError('Coordinates must be numeric')
-        
-        # SQL injection koruması - sadece sayısal değerlere izin ver
-        if re.search(r'[^0-9.\-]', str(v)):
-            raise ValueError('Invalid coordinate format - only numbers, dots and minus allowed')
-        
-        return float(v)
+    # Koordinatlar için ayrı validator yok: Pydantic değeri float'a çevirir ve
+    # ge/le sınırlarını uygular. Değerler SQL'e metin olarak girmez, soil_id
+    # parametre olarak bağlanır (cursor.execute(sql, soil_id)).
 
 class AutoRequest(BaseModel):
     """Otomatik konum tespiti için model"""
+    model_config = ConfigDict(extra='forbid')
+    
     method: str = Field(..., description="Method type", example="Auto")
     
     @field_validator('method')
@@ -86,12 +101,16 @@ class AutoRequest(BaseModel):
 
 class SoilProperty(BaseModel):
     """Toprak özelliği modeli"""
+    model_config = ConfigDict(extra='forbid')
+    
     name: str
     value: Any
     unit: Optional[str] = None
 
 class SoilClassification(BaseModel):
     """Toprak sınıflandırması modeli"""
+    model_config = ConfigDict(extra='forbid')
+    
     wrb4_code: str
     wrb4_description: Optional[str] = None
     wrb2_code: str
@@ -100,6 +119,8 @@ class SoilClassification(BaseModel):
 
 class SoilAnalysisResponse(BaseModel):
     """Toprak analizi yanıt modeli"""
+    model_config = ConfigDict(extra='forbid')
+    
     success: bool
     message: str
     timestamp: datetime
@@ -114,6 +135,8 @@ class SoilAnalysisResponse(BaseModel):
 
 class ErrorResponse(BaseModel):
     """Hata yanıt modeli"""
+    model_config = ConfigDict(extra='forbid')
+    
     success: bool = False
     error: str
     timestamp: datetime
@@ -121,12 +144,16 @@ class ErrorResponse(BaseModel):
 
 class PointResponse(BaseModel):
     """Koordinat noktası modeli"""
+    model_config = ConfigDict(extra='forbid')
+    
     longitude: float
     latitude: float
     city: Optional[str] = None
 
 class TurkeyPointsResponse(BaseModel):
     """Türkiye noktaları yanıt modeli"""
+    model_config = ConfigDict(extra='forbid')
+    
     success: bool
     message: str
     timestamp: datetime
@@ -139,6 +166,8 @@ class TurkeyPointsResponse(BaseModel):
 
 class SoilAnalysisCSVResponse(BaseModel):
     """Toprak analizi CSV yanıt modeli"""
+    model_config = ConfigDict(extra='forbid')
+    
     success: bool
     message: str
     timestamp: datetime
@@ -183,6 +212,159 @@ WRB_DESCRIPTIONS = {
     'RG': 'Regosols - No significant profile development'
 }
 
+# analyze_soil yanıt önbelleğinin azami kayıt sayısı
+RESPONSE_CACHE_SIZE = 8192
+
+# İl sınırları shapefile'ında şehir adının aranacağı kolonlar (ilk bulunan kullanılır)
+CITY_NAME_COLUMNS = ('NAME_1', 'ADM1_TR', 'ADM1_EN', 'IL_ADI', 'il_adi', 'NAME', 'name')
+
+# Şehir adı önbelleği: koordinatlar CITY_CELL_SCALE ile hücreye indirgenir (100 -> 0.01°)
+CITY_CELL_SCALE = 100
+CITY_CELL_CACHE_SIZE = 100_000
+
+# İl kimliği rasteri: her hücre tek bir ilin içindeyse il indeksi, hiçbir ile değmiyorsa
+# CITY_RASTER_NONE, il sınırına denk geliyorsa CITY_RASTER_BOUNDARY (kesin STRtree sorgusu)
+CITY_RASTER_RESOLUTION = 0.02
+CITY_RASTER_NONE, CITY_RASTER_BOUNDARY = -2, -1
+
+# Reverse geocoding (Nominatim) ayarları
+NOMINATIM_REVERSE_URL = "https://nominatim.openstreetmap.org/reverse"
+GEOCODE_CONCURRENCY = 5
+# Nominatim kullanım politikası: en fazla 1 istek/saniye (istek başlangıçları arası en az bu kadar)
+GEOCODE_MIN_INTERVAL = 1.0  # saniye
+
+# IP tabanlı konum sonucu geocode önbelleğinde bu anahtarla (bitiş zamanı, boylam, enlem) saklanır
+IP_LOCATION_CACHE_KEY = 'ip:me'
+IP_LOCATION_TTL = 3600  # saniye
+
+# Stratified nokta üretiminde en fazla aday turu (şehir adı bulunamayan noktalar için)
+STRATIFIED_MAX_BATCHES = 20
+
+# Stratified örneklemede bbox'un bölündüğü katman ızgarası (STRATA_GRID x STRATA_GRID hücre)
+# ve her hücrenin kara oranı için eksen başına alt örnek sayısı
+STRATA_GRID = 64
+STRATA_SUBSAMPLES = 4
+
+
+def _land_strata_weights(fractions: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Hücre kara oranlarından (p_S) aday dağılım ağırlıklarını ve beklenen kabul oranını hesapla
+    
+    Kara içeren (p_S > 0) her hücreye eşit sayıda aday verilir; hücre içindeki adayların
+    p_S kadarı Türkiye maskesinden geçtiğinden kabul edilen nokta sayısı p_S ile orantılı,
+    yani kara km²'si başına yoğunluk bbox'taki düzgün örneklemedeki gibi her yerde aynı olur.
+    (Adayları p_S ile orantılı dağıtmak kabulü p_S²'ye bağlar ve kıyı/sınır hücrelerini seyreltir.)
+    
+    Returns:
+        (ağırlıklar, beklenen kabul oranı = kara hücrelerinde ortalama p_S)
+    """
+    land = fractions > 0
+    weights = land / np.count_nonzero(land)
+    return weights, float(fractions[land].mean())
+
+# Türkiye içinde testlerinden önce bakılan kaba hücre maskesi (derece) ve hücre durumları;
+# yalnızca sınır hücrelerindeki noktalar için kesin poligon testi yapılır
+LAND_MASK_RESOLUTION = 0.05
+CELL_OUTSIDE, CELL_INSIDE, CELL_BOUNDARY = 0, 1, 2
+
+# Diskteki mekansal önbellek biçim sürümü; maske/raster yapısı değişince artırılmalı
+SPATIAL_CACHE_VERSION = 2
+
+# CSV toplu analizinde eşzamanlı çalışan iş parçacığı sayısı
+CSV_ANALYSIS_WORKERS = 8
+
+# Yedek ODBC yolunda soil_id -> toprak verisi önbelleğinin boyutu
+SOIL_DATA_CACHE_SIZE = 8192
+
+# Analizde kullanılan HWSD2 kolonları (ön yüklenen tablo yalnızca bunları tutar)
+SOIL_FIELDS = (
+    'WRB4', 'WRB2', 'FAO90',
+    'PH_WATER', 'ORG_CARBON', 'TOTAL_N', 'CN_RATIO',
+    'CLAY', 'SILT', 'SAND', 'COARSE',
+    'BULK', 'REF_BULK', 'ROOT_DEPTH', 'AWC',
+    'CEC_SOIL', 'CEC_CLAY', 'CEC_EFF', 'TEB', 'BSAT', 'ESP', 'ALUM_SAT',
+    'ELEC_COND', 'TCARBON_EQ', 'GYPSUM'
+)
+
+# Hem Access (ODBC) hem SQLite bağlantı hataları
+DB_ERRORS = (pyodbc.Error, sqlite3.Error)
+
+# Kalıcı bağlantı üzerinde tekrar kullanılan sorgular (Access ve SQLite'ta aynı sözdizimi)
+SMU_SQL = "SELECT * FROM [HWSD2_SMU] WHERE [HWSD2_SMU_ID] = ?"
+LAYERS_SQL = "SELECT * FROM [HWSD2_LAYERS] WHERE [HWSD2_SMU_ID] = ?"
+
+# HWSD2'de eksik değer işaretleri (None ayrıca `is not None` ile elenir)
+_MISSING = frozenset({-9, -9.0})
+
+# Özellik tabloları: (HWSD2 kolonu, özellik adı, birim)
+BASIC_SPEC = (
+    ('PH_WATER', 'pH', 'pH units'),
+    ('ORG_CARBON', 'Organic Carbon', '%'),
+    ('TOTAL_N', 'Total Nitrogen', '%'),
+    ('CN_RATIO', 'C/N Ratio', 'ratio'),
+)
+
+TEXTURE_SPEC = (
+    ('CLAY', 'Clay', '%'),
+    ('SILT', 'Silt', '%'),
+    ('SAND', 'Sand', '%'),
+    ('COARSE', 'Coarse Fragments', '%'),
+)
+
+PHYSICAL_SPEC = (
+    ('BULK', 'Bulk Density', 'g/cm³'),
+    ('REF_BULK', 'Reference Bulk Density', 'g/cm³'),
+    ('ROOT_DEPTH', 'Root Depth', 'm'),
+    ('AWC', 'Available Water Capacity', 'mm/m'),
+)
+
+CHEMICAL_SPEC = (
+    ('CEC_SOIL', 'Cation Exchange Capacity', 'cmol/kg'),
+    ('CEC_CLAY', 'Clay CEC', 'cmol/kg'),
+    ('CEC_EFF', 'Effective CEC', 'cmol/kg'),
+    ('TEB', 'Total Exchangeable Bases', 'cmol/kg'),
+    ('BSAT', 'Base Saturation', '%'),
+    ('ESP', 'Exchangeable Sodium Percentage', '%'),
+    ('ALUM_SAT', 'Aluminum Saturation', '%'),
+)
+
+SALINITY_SPEC = (
+    ('ELEC_COND', 'Electrical Conductivity', 'dS/m'),
+    ('TCARBON_EQ', 'Total Carbon Equivalent', '%'),
+    ('GYPSUM', 'Gypsum Content', '%'),
+)
+
+# Yanıt alanı -> özellik tablosu
+PROPERTY_SPECS = (
+    ('basic_properties', BASIC_SPEC),
+    ('texture_properties', TEXTURE_SPEC),
+    ('physical_properties', PHYSICAL_SPEC),
+    ('chemical_properties', CHEMICAL_SPEC),
+    ('salinity_properties', SALINITY_SPEC),
+)
+
+# Toplu analiz CSV'sinin sabit başlığı: koordinat/sınıflandırma + kategori önekli özellikler
+CSV_RESULT_COLUMNS = (
+    'longitude', 'latitude', 'city', 'soil_id',
+    'wrb4_code', 'wrb4_description', 'wrb2_code', 'wrb2_description', 'fao90_code'
+) + tuple(
+    f'{field.split("_", 1)[0]}_{name.lower().replace(" ", "_")}'
+    for field, spec in PROPERTY_SPECS
+    for _, name, _ in spec
+)
+
+# Özellik kolonlarının HWSD2 alan adları (CSV_RESULT_COLUMNS'taki özellik sırasıyla)
+CSV_PROPERTY_KEYS = tuple(key for _, spec in PROPERTY_SPECS for key, _, _ in spec)
+
+# CSV toplu analizinde ilerleme log aralığı (satır)
+CSV_LOG_EVERY = 500
+
+# CSV yazımında tek writerows çağrısıyla yazılıp diske boşaltılan parça boyu (satır)
+CSV_WRITE_CHUNK = 4096
+
+# Nokta dosyaları (TXT/CSV) için yazma tamponu (bayt)
+POINTS_WRITE_BUFFER = 1 << 20
+
 class SoilAnalysisService:
     """Toprak analizi servis sınıfı"""
     
@@ -208,7 +390,8 @@ class SoilAnalysisService:
         for d in candidate_dirs:
             raster_path = os.path.join(d, 'HWSD2.bil')
             db_path = os.path.join(d, 'HWSD2.mdb')
-            if os.path.exists(raster_path) and os.path.exists(db_path):
+            sqlite_path = os.path.join(d, 'HWSD2.sqlite')
+            if os.path.exists(raster_path) and (os.path.exists(db_path) or os.path.exists(sqlite_path)):
                 data_dir = d
                 break
 
@@ -220,17 +403,210 @@ class SoilAnalysisService:
         self.data_dir = data_dir
         self.raster_file = os.path.join(self.data_dir, 'HWSD2.bil')
         self.db_file = os.path.join(self.data_dir, 'HWSD2.mdb')
+        # scripts/convert_mdb_to_sqlite.py ile üretilir; varsa ODBC yerine kullanılır
+        self.sqlite_file = os.path.join(self.data_dir, 'HWSD2.sqlite')
         self.country_shapefile = os.path.join(self.data_dir, 'country.shp')
+        self.turkey_cache_file = os.path.join(self.data_dir, 'turkey_bounds.wkb')
+        # İsteğe bağlı il sınırları (varsa şehir adları Nominatim'e gitmeden bulunur)
+        self.city_shapefile = os.path.join(self.data_dir, 'cities.shp')
+        # Kara maskesi, örnekleme katmanları ve il poligonları/rasteri (shapefile'lar değişince yenilenir)
+        self.spatial_cache_file = os.path.join(self.data_dir, 'spatial_index.pkl')
         
         # Dosya varlığını kontrol et
         if not os.path.exists(self.raster_file):
             raise FileNotFoundError(f"Raster file not found: {self.raster_file}")
-        if not os.path.exists(self.db_file):
+        if not os.path.exists(self.db_file) and not os.path.exists(self.sqlite_file):
             raise FileNotFoundError(f"Database file not found: {self.db_file}")
         
-        # Türkiye sınırlarını yükle
+        self.conn_str = (
+            r'DRIVER={Microsoft Access Driver (*.mdb, *.accdb)};'
+            rf'DBQ={self.db_file};'
+        )
+        
+        # .bil dosyası başlıksız ham raster: .hdr okunabiliyorsa dönüşüm oradan hesaplanır
+        # ve dosya doğrudan bellek eşlemesiyle okunur (rasterio hiç açılmaz)
+        self._raster_ds = None
+        self._raster_mm: Optional[np.memmap] = self._open_raster_memmap()
+        if self._raster_mm is None:
+            # Yedek yol: raster'ı bir kez aç ve açık tut (GDAL blok önbelleği korunur)
+            self._raster_ds = rasterio.open(self.raster_file, sharing=False)
+            self._raster_bounds = self._raster_ds.bounds
+            self._raster_inv_transform = ~self._raster_ds.transform
+            self._raster_shape = (self._raster_ds.height, self._raster_ds.width)
+        # Tek nokta sıcak yolu için sınırlar ve ters dönüşüm katsayıları düz float olarak
+        # (BoundingBox/Affine nesnelerine her çağrıda girilmez)
+        bounds = self._raster_bounds
+        self._raster_extent = (bounds.left, bounds.bottom, bounds.right, bounds.top)
+        self._raster_inv_coeffs = tuple(self._raster_inv_transform)[:6]
+        # rasterio piksel okumaları (row, col) anahtarıyla önbelleğe alınır
+        self._raster_soil_id_cached = lru_cache(maxsize=65536)(self._read_raster_pixel)
+        
+        # Yedek ODBC yolu için iş parçacığı başına kalıcı bağlantı (ilk sorguda açılır)
+        self._db_local = threading.local()
+        self._db_connections: List[Any] = []
+        self._db_lock = threading.Lock()
+        # soil_id -> birleşik toprak verisi, LRU sırasıyla (yeniden bağlanınca temizlenir)
+        self._soil_cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        
+        # HWSD2 tablolarını belleğe kolon dizileri olarak yükle
+        # (başarısızsa kalıcı ODBC bağlantısı kullanılır)
+        self._soil_index: Dict[int, int] = {}
+        self._soil_columns: Dict[str, np.ndarray] = {}
+        self._load_soil_table()
+        
+        # Son analiz sonuçları (lon, lat) -> yanıt şablonu, LRU sırasıyla
+        self._response_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        
+        # Türkiye sınırlarını yükle ve nokta-içinde testleri için indeksle
         self.turkey_bounds = None
         self._load_turkey_bounds()
+        self._build_turkey_index()
+        
+        # İl poligonları ve STRtree indeksi (dosya yoksa boş kalır)
+        self._city_polygons: List[Any] = []
+        self._city_names: List[str] = []
+        self._city_tree = None
+        self._city_raster = None
+        
+        # Türetilmiş mekansal yapılar önbellekten yüklenir; yoksa kurulup kaydedilir
+        if not self._load_spatial_cache():
+            self._build_land_mask()
+            self._build_land_strata()
+            self._load_city_polygons()
+            self._build_city_raster()
+            self._save_spatial_cache()
+        
+        # Hücre (int(lon*100), int(lat*100)) -> şehir adı, LRU sırasıyla
+        self._city_cell_lock = threading.Lock()
+        self._city_cell_cache: "OrderedDict[Tuple[int, int], str]" = OrderedDict()
+        
+        # Reverse geocoding sonuçları diskte saklanır: "lon,lat" (3 hane) -> şehir adı ('' = yok)
+        self._geo_lock = threading.Lock()
+        
+        # Nominatim hız sınırı: sıradaki isteğin en erken başlayabileceği an (time.monotonic)
+        # Her _reverse_many çağrısı kendi event loop'unda çalıştığından loop'tan bağımsız
+        # bir saat ve thread kilidi kullanılır; böylece art arda/eşzamanlı gruplar da sınıra uyar
+        self._geocode_rate_lock = threading.Lock()
+        self._geocode_next_start = 0.0
+        try:
+            self._geo_cache = shelve.open(os.path.join(self.script_dir, 'geocode_cache'))
+        except Exception as e:
+            logger.warning(f"Geocode cache could not be opened, using memory cache: {str(e)}")
+            self._geo_cache = {}
+    
+    def _open_raster_memmap(self) -> Optional[np.memmap]:
+        """
+        HWSD2.hdr'yi okuyup HWSD2.bil'i np.memmap olarak aç
+        
+        Başarılı olursa raster sınırları, ters affine dönüşümü ve boyutları da
+        başlıktan ayarlanır. Başarısızsa None döner ve rasterio kullanılır.
+        """
+        hdr_file = os.path.splitext(self.raster_file)[0] + '.hdr'
+        try:
+            header = {}
+            with open(hdr_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) >= 2:
+                        header[parts[0].upper()] = parts[1]
+            
+            if header.get('LAYOUT', 'BIL').upper() != 'BIL' or int(header.get('NBANDS', 1)) != 1:
+                raise ValueError("Only single-band BIL rasters are supported")
+            
+            nrows, ncols = int(header['NROWS']), int(header['NCOLS'])
+            nbits = int(header.get('NBITS', 8))
+            kind = {'SIGNEDINT': 'i', 'UNSIGNEDINT': 'u', 'FLOAT': 'f'}[header.get('PIXELTYPE', 'UNSIGNEDINT').upper()]
+            byteorder = '>' if header.get('BYTEORDER', 'I').upper() == 'M' else '<'
+            dtype = np.dtype(f"{byteorder}{kind}{nbits // 8}")
+            
+            # ULXMAP/ULYMAP sol üst pikselin merkezidir (GDAL EHdr sürücüsüyle aynı yorum)
+            xdim, ydim = float(header['XDIM']), float(header['YDIM'])
+            left = float(header['ULXMAP']) - xdim / 2
+            top = float(header['ULYMAP']) + ydim / 2
+            
+            raster_mm = np.memmap(self.raster_file, dtype=dtype, mode='r',
+                                  offset=int(header.get('SKIPBYTES', 0)), shape=(nrows, ncols))
+            
+            self._raster_bounds = BoundingBox(left, top - nrows * ydim, left + ncols * xdim, top)
+            self._raster_inv_transform = ~Affine(xdim, 0.0, left, 0.0, -ydim, top)
+            self._raster_shape = (nrows, ncols)
+            logger.info(f"Raster memory-mapped: {nrows}x{ncols} {dtype}")
+            return raster_mm
+        except Exception as e:
+            logger.warning(f"Raster memory-map failed, using rasterio: {str(e)}")
+            return None
+    
+    def _load_soil_table(self):
+        """HWSD2_SMU ve HWSD2_LAYERS tablolarını tek seferde okuyup soil_id -> kayıt tablosu oluştur"""
+        conn = None
+        try:
+            conn = self._open_db_connection()
+            cursor = conn.cursor()
+            
+            # SMU kayıtları: her soil_id için SOIL_FIELDS sırasında değerler
+            cursor.execute("SELECT * FROM [HWSD2_SMU]")
+            columns = [column[0] for column in cursor.description]
+            id_idx = columns.index('HWSD2_SMU_ID')
+            smu_positions = [(i, columns.index(f)) for i, f in enumerate(SOIL_FIELDS) if f in columns]
+            records: Dict[int, list] = {}
+            for row in cursor.fetchall():
+                values = [None] * len(SOIL_FIELDS)
+                for i, col in smu_positions:
+                    values[i] = row[col]
+                records[int(row[id_idx])] = values
+            
+            # LAYERS kayıtları: soil_id başına ilk katman SMU değerlerini ezer
+            # (eski `{**smu_data, **layers_data}` birleştirmesiyle aynı öncelik)
+            cursor.execute("SELECT * FROM [HWSD2_LAYERS]")
+            columns = [column[0] for column in cursor.description]
+            id_idx = columns.index('HWSD2_SMU_ID')
+            layer_positions = [(i, columns.index(f)) for i, f in enumerate(SOIL_FIELDS) if f in columns]
+            seen = set()
+            for row in cursor.fetchall():
+                soil_id = int(row[id_idx])
+                if soil_id in seen or soil_id not in records:
+                    continue
+                seen.add(soil_id)
+                values = records[soil_id]
+                for i, col in layer_positions:
+                    values[i] = row[col]
+            
+            # Satır listelerini kolon dizilerine çevir (soil_id -> yoğun satır indeksi)
+            soil_ids = list(records)
+            self._soil_columns = {
+                field: self._to_column([records[soil_id][i] for soil_id in soil_ids])
+                for i, field in enumerate(SOIL_FIELDS)
+            }
+            self._soil_index = {soil_id: row for row, soil_id in enumerate(soil_ids)}
+            logger.info(f"HWSD2 soil table preloaded: {len(self._soil_index)} records")
+        except Exception as e:
+            logger.warning(f"Soil table preload failed, falling back to per-request queries: {str(e)}")
+            self._soil_index = {}
+            self._soil_columns = {}
+        finally:
+            if conn:
+                conn.close()
+    
+    def _open_db_connection(self):
+        """HWSD2 veritabanına bağlan: SQLite kopyası varsa onu, yoksa Access ODBC'yi kullan"""
+        if os.path.exists(self.sqlite_file):
+            return sqlite3.connect(self.sqlite_file, check_same_thread=False)
+        return pyodbc.connect(self.conn_str)
+    
+    @staticmethod
+    def _to_json_scalar(value: Any) -> Any:
+        """ODBC'den gelen Decimal değerleri float'a çevir (orjson Decimal serileştiremez)"""
+        return float(value) if isinstance(value, Decimal) else value
+    
+    @staticmethod
+    def _to_column(values: List[Any]) -> np.ndarray:
+        """Kolon değerlerini uygun dtype'lı diziye çevir (eksik sayılar -9, eksik metinler '')"""
+        present = [v for v in values if v is not None]
+        if present and all(isinstance(v, str) for v in present):
+            return np.array(['' if v is None else v for v in values], dtype=str)
+        if all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+            return np.array([-9 if v is None else v for v in values], dtype=np.int32)
+        return np.array([-9.0 if v is None else float(v) for v in values], dtype=np.float64)
     
     def _load_turkey_bounds(self):
         """Türkiye sınırlarını shapefile'dan yükle (dayanıklı yöntem)"""
@@ -240,6 +616,10 @@ class SoilAnalysisService:
                 self._set_fallback_bounds()
                 return
             
+            # Önceki çalıştırmadan kalan WKB önbelleği shapefile'dan yeniyse onu kullan
+            if self._load_cached_turkey_bounds():
+                return
+            
             # Shapefile'ı yükle
             gdf = gpd.read_file(self.country_shapefile)
             if gdf is None or gdf.empty:
@@ -263,29 +643,24 @@ class SoilAnalysisService:
             name_variants_contains = ['Turkey', 'Türkiye']
             code_equals = ['TUR', 'TR']
             
+            # Desen ve mevcut kolonlar bir kez hazırlanır
+            name_pattern = re.compile('|'.join(name_variants_contains), re.IGNORECASE)
+            cols_to_try = [col for col in candidate_columns if col in gdf.columns]
+            
             turkey_gdf = None
-            for col in candidate_columns:
-                if col in gdf.columns:
-                    # Metin içerik eşleşmesi
-                    if gdf[col].dtype == object:
-                        mask_contains = gdf[col].astype(str).str.contains('|'.join(name_variants_contains), case=False, na=False)
-                    else:
-                        mask_contains = None
-                    
-                    # Kod eşitlik eşleşmesi
-                    mask_equals = gdf[col].astype(str).isin(code_equals) if gdf[col].dtype == object else None
-                    
-                    combined_mask = None
-                    if mask_contains is not None and mask_equals is not None:
-                        combined_mask = mask_contains | mask_equals
-                    elif mask_contains is not None:
-                        combined_mask = mask_contains
-                    elif mask_equals is not None:
-                        combined_mask = mask_equals
-                    
-                    if combined_mask is not None and combined_mask.any():
-                        turkey_gdf = gdf[combined_mask]
-                        break
+            for col in cols_to_try:
+                # Yalnızca metin kolonları (object veya pandas string dtype, ikisinin de kind'ı 'O')
+                series = gdf[col]
+                if series.dtype.kind != 'O':
+                    continue
+                
+                # Metin içerik eşleşmesi veya kod eşitliği
+                values = series.astype(str)
+                combined_mask = values.str.contains(name_pattern, na=False) | values.isin(code_equals)
+                
+                if combined_mask.any():
+                    turkey_gdf = gdf[combined_mask]
+                    break
             
             # Hala bulunamadıysa, kabaca Türkiye bbox'una göre mekansal filtre dene
             if (turkey_gdf is None) or turkey_gdf.empty:
@@ -297,9 +672,9 @@ class SoilAnalysisService:
                     if intersects_mask.any():
                         # İçinde "Turkey"/"Türkiye" geçenlerden öncelik ver
                         subset = gdf[intersects_mask]
-                        for col in candidate_columns:
-                            if col in subset.columns and subset[col].dtype == object:
-                                sub_mask = subset[col].astype(str).str.contains('|'.join(name_variants_contains), case=False, na=False)
+                        for col in cols_to_try:
+                            if subset[col].dtype.kind == 'O':
+                                sub_mask = subset[col].astype(str).str.contains(name_pattern, na=False)
                                 if sub_mask.any():
                                     turkey_gdf = subset[sub_mask]
                                     break
@@ -317,6 +692,7 @@ class SoilAnalysisService:
                     turkey_geom = turkey_gdf.geometry.iloc[0]
                 self.turkey_bounds = turkey_geom
                 logger.info("Turkey bounds loaded successfully from shapefile")
+                self._save_cached_turkey_bounds()
                 return
             
             # Başarısızsa fallback
@@ -326,6 +702,279 @@ class SoilAnalysisService:
             logger.error(f"Error loading Turkey bounds: {str(e)}")
             self._set_fallback_bounds()
     
+    def _load_cached_turkey_bounds(self) -> bool:
+        """Türkiye geometrisini WKB önbelleğinden yükle (shapefile'dan eskiyse kullanma)"""
+        try:
+            if not os.path.exists(self.turkey_cache_file):
+                return False
+            if os.path.getmtime(self.turkey_cache_file) < os.path.getmtime(self.country_shapefile):
+                return False
+            
+            with open(self.turkey_cache_file, 'rb') as f:
+                self.turkey_bounds = shapely.wkb.loads(f.read())
+            logger.info("Turkey bounds loaded from WKB cache")
+            return True
+        except Exception as e:
+            logger.warning(f"Turkey bounds cache could not be read: {str(e)}")
+            return False
+    
+    def _save_cached_turkey_bounds(self):
+        """Shapefile'dan elde edilen Türkiye geometrisini WKB olarak kaydet"""
+        try:
+            with open(self.turkey_cache_file, 'wb') as f:
+                f.write(shapely.wkb.dumps(self.turkey_bounds))
+        except Exception as e:
+            logger.warning(f"Turkey bounds cache could not be written: {str(e)}")
+    
+    def _spatial_cache_key(self) -> tuple:
+        """Önbellek anahtarı: biçim sürümü ve kaynak shapefile'ların değişiklik zamanları"""
+        return (
+            SPATIAL_CACHE_VERSION,
+            os.path.getmtime(self.country_shapefile) if os.path.exists(self.country_shapefile) else None,
+            os.path.getmtime(self.city_shapefile) if os.path.exists(self.city_shapefile) else None,
+        )
+    
+    def _load_spatial_cache(self) -> bool:
+        """Kara maskesi, katmanlar ve il yapılarını pickle önbelleğinden yükle (anahtar tutmazsa kullanma)"""
+        try:
+            if not os.path.exists(self.spatial_cache_file):
+                return False
+            
+            with open(self.spatial_cache_file, 'rb') as f:
+                cache = pickle.load(f)
+            if cache.get('key') != self._spatial_cache_key():
+                return False
+            
+            self._land_mask = cache['land_mask']
+            self._land_mask_origin = cache['land_mask_origin']
+            self._strata_weights = cache['strata_weights']
+            self._strata_acceptance = cache['strata_acceptance']
+            self._strata_cell = cache['strata_cell']
+            self._city_polygons = cache['city_polygons']
+            self._city_names = cache['city_names']
+            self._city_raster = cache['city_raster']
+            self._city_raster_origin = cache['city_raster_origin']
+            
+            # Hazırlanmış geometri ve STRtree pickle'a girmez, yüklemeden sonra kurulur
+            if self._city_polygons:
+                shapely.prepare(self._city_polygons)
+                self._city_tree = STRtree(self._city_polygons)
+            logger.info(f"Spatial index loaded from cache: {len(self._city_polygons)} city polygons")
+            return True
+        except Exception as e:
+            logger.warning(f"Spatial index cache could not be read: {str(e)}")
+            self._land_mask = None
+            self._strata_weights = None
+            self._city_polygons = []
+            self._city_names = []
+            self._city_tree = None
+            self._city_raster = None
+            return False
+    
+    def _save_spatial_cache(self):
+        """Kurulan mekansal yapıları pickle olarak kaydet (geçici dosya + os.replace ile atomik)"""
+        if self._land_mask is None and not self._city_polygons:
+            return
+        
+        cache = {
+            'key': self._spatial_cache_key(),
+            'land_mask': self._land_mask,
+            'land_mask_origin': getattr(self, '_land_mask_origin', None),
+            'strata_weights': self._strata_weights,
+            'strata_acceptance': getattr(self, '_strata_acceptance', None),
+            'strata_cell': getattr(self, '_strata_cell', None),
+            'city_polygons': self._city_polygons,
+            'city_names': self._city_names,
+            'city_raster': self._city_raster,
+            'city_raster_origin': getattr(self, '_city_raster_origin', None),
+        }
+        # Birden çok worker aynı anda kurarsa her biri kendi geçici dosyasını yazar, son replace kazanır
+        tmp_file = f"{self.spatial_cache_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.spatial_cache_file)
+        except Exception as e:
+            logger.warning(f"Spatial index cache could not be written: {str(e)}")
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+    
+    def _build_turkey_index(self):
+        """Türkiye geometrisinin parçaları üzerinde STRtree ve hazırlanmış geometriler oluştur"""
+        self._turkey_parts = []
+        self._turkey_tree = None
+        
+        # Fallback (dict) sınırlarında indekse gerek yok
+        if not hasattr(self.turkey_bounds, 'contains'):
+            return
+        
+        # Tüm geometriyi yerinde hazırla: contains_xy (toplu maske) ve STRtree kurulamadığında
+        # kullanılan tekil contains, GEOS'un kenar indeksini her çağrıda yeniden kurmaz
+        try:
+            shapely.prepare(self.turkey_bounds)
+        except Exception as e:
+            logger.warning(f"Turkey geometry could not be prepared: {str(e)}")
+        
+        try:
+            # Parçalar da yerinde hazırlanır; ağaç sorgusu predicate ile bbox + contains'i C'de yapar
+            self._turkey_parts = list(shapely.get_parts(self.turkey_bounds))
+            shapely.prepare(self._turkey_parts)
+            self._turkey_tree = STRtree(self._turkey_parts)
+        except Exception as e:
+            logger.warning(f"Turkey geometry index could not be built: {str(e)}")
+            self._turkey_parts = []
+            self._turkey_tree = None
+    
+    def _build_land_mask(self):
+        """Bbox'u LAND_MASK_RESOLUTION'lık hücrelere böl ve her hücreyi iç/dış/sınır olarak işaretle"""
+        self._land_mask = None
+        
+        # Fallback (dict) sınırlarında aralık kontrolü zaten O(1)
+        if not hasattr(self.turkey_bounds, 'bounds'):
+            return
+        
+        try:
+            min_lon, min_lat, max_lon, max_lat = self.turkey_bounds.bounds
+            nx = int(math.ceil((max_lon - min_lon) / LAND_MASK_RESOLUTION))
+            ny = int(math.ceil((max_lat - min_lat) / LAND_MASK_RESOLUTION))
+            xs, ys = np.meshgrid(min_lon + np.arange(nx) * LAND_MASK_RESOLUTION,
+                                 min_lat + np.arange(ny) * LAND_MASK_RESOLUTION, indexing='ij')
+            cells = shapely.box(xs, ys, xs + LAND_MASK_RESOLUTION, ys + LAND_MASK_RESOLUTION)
+            
+            # Sınıra değmeden tamamen içeride kalan hücreler iç, hiç kesişmeyenler dış sayılır
+            land_mask = np.full((nx, ny), CELL_BOUNDARY, dtype=np.int8)
+            land_mask[~shapely.intersects(self.turkey_bounds, cells)] = CELL_OUTSIDE
+            land_mask[shapely.contains_properly(self.turkey_bounds, cells)] = CELL_INSIDE
+            
+            self._land_mask = land_mask
+            self._land_mask_origin = (min_lon, min_lat)
+            logger.info(f"Land mask built: {nx}x{ny} cells, "
+                        f"{np.count_nonzero(land_mask == CELL_BOUNDARY)} on the boundary")
+        except Exception as e:
+            logger.warning(f"Land mask could not be built: {str(e)}")
+            self._land_mask = None
+    
+    def _land_cell_status(self, longitude: float, latitude: float) -> int:
+        """Noktanın düştüğü kaba maske hücresinin durumunu döndür (bbox dışı = CELL_OUTSIDE)"""
+        min_lon, min_lat = self._land_mask_origin
+        ix = math.floor((longitude - min_lon) / LAND_MASK_RESOLUTION)
+        iy = math.floor((latitude - min_lat) / LAND_MASK_RESOLUTION)
+        nx, ny = self._land_mask.shape
+        if 0 <= ix < nx and 0 <= iy < ny:
+            return int(self._land_mask[ix, iy])
+        return CELL_OUTSIDE
+    
+    def _build_land_strata(self):
+        """Bbox'u STRATA_GRID x STRATA_GRID hücreye böl ve her hücrenin kara (Türkiye) oranını hesapla"""
+        self._strata_weights = None
+        
+        # Fallback (dict) sınırlarında bbox'un tamamı kara sayılır, katmanlamaya gerek yok
+        if not hasattr(self.turkey_bounds, 'bounds'):
+            return
+        
+        try:
+            min_lon, min_lat, max_lon, max_lat = self.turkey_bounds.bounds
+            cell_w = (max_lon - min_lon) / STRATA_GRID
+            cell_h = (max_lat - min_lat) / STRATA_GRID
+            
+            # Her hücre içinde STRATA_SUBSAMPLES x STRATA_SUBSAMPLES düzenli alt nokta
+            offsets = (np.arange(STRATA_SUBSAMPLES) + 0.5) / STRATA_SUBSAMPLES
+            fine = np.arange(STRATA_GRID)[:, None] + offsets[None, :]
+            lons, lats = np.meshgrid(min_lon + fine.ravel() * cell_w,
+                                     min_lat + fine.ravel() * cell_h, indexing='ij')
+            inside = self._points_in_turkey_mask(lons.ravel(), lats.ravel())
+            
+            # (lon hücresi, lon alt, lat hücresi, lat alt) -> hücre başına kara oranı
+            fractions = inside.reshape(
+                STRATA_GRID, STRATA_SUBSAMPLES, STRATA_GRID, STRATA_SUBSAMPLES
+            ).mean(axis=(1, 3)).ravel()
+            if fractions.sum() <= 0:
+                return
+            
+            # Kara hücrelerine eşit dağılım ağırlıkları ve beklenen kabul oranı: mean(p_S)
+            self._strata_weights, self._strata_acceptance = _land_strata_weights(fractions)
+            self._strata_cell = (cell_w, cell_h)
+            logger.info(f"Land strata built: {np.count_nonzero(fractions)} of {fractions.size} cells on land")
+        except Exception as e:
+            logger.warning(f"Land strata could not be built: {str(e)}")
+            self._strata_weights = None
+    
+    def _sample_land_strata(self, rng: np.random.Generator, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Kara içeren hücrelere eşit dağıtılmış n aday noktayı hücreler içinde düzgün dağılımla üret"""
+        min_lon, min_lat = self.turkey_bounds.bounds[:2]
+        cell_w, cell_h = self._strata_cell
+        
+        # m kara hücresi için N_S = n / m: tam kısımlar doğrudan, kalan noktalar kara hücreleri
+        # arasında multinomial dağıtılır (maskeden sonra kabul edilen nokta sayısı p_S ile orantılı)
+        alloc = np.floor(self._strata_weights * n).astype(np.int64)
+        alloc += rng.multinomial(n - int(alloc.sum()), self._strata_weights)
+        
+        cells = np.repeat(np.arange(alloc.size), alloc)
+        rng.shuffle(cells)  # Kısmi dilimleme bbox'un bir köşesine yığılmasın
+        lons = min_lon + (cells // STRATA_GRID + rng.random(cells.size)) * cell_w
+        lats = min_lat + (cells % STRATA_GRID + rng.random(cells.size)) * cell_h
+        return lons, lats
+    
+    def _load_city_polygons(self):
+        """İl sınırlarını shapefile'dan yükle ve STRtree indeksi kur"""
+        if not os.path.exists(self.city_shapefile):
+            return
+        
+        try:
+            gdf = gpd.read_file(self.city_shapefile)
+            if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+                gdf = gdf.to_crs(epsg=4326)
+            
+            name_column = next((col for col in CITY_NAME_COLUMNS if col in gdf.columns), None)
+            if name_column is None:
+                logger.warning(f"No city name column found in {self.city_shapefile}")
+                return
+            
+            gdf = gdf[gdf.geometry.notna() & gdf[name_column].notna()]
+            self._city_polygons = list(gdf.geometry)
+            self._city_names = [str(name).strip() for name in gdf[name_column]]
+            shapely.prepare(self._city_polygons)
+            self._city_tree = STRtree(self._city_polygons)
+            logger.info(f"City polygons loaded: {len(self._city_polygons)} features")
+        except Exception as e:
+            logger.warning(f"City polygons could not be loaded: {str(e)}")
+            self._city_polygons = []
+            self._city_names = []
+            self._city_tree = None
+    
+    def _build_city_raster(self):
+        """İl poligonlarını CITY_RASTER_RESOLUTION'lık ızgaraya il indeksi olarak rasterleştir"""
+        if self._city_tree is None:
+            return
+        
+        try:
+            min_lon, min_lat, max_lon, max_lat = shapely.total_bounds(self._city_polygons)
+            nx = int(math.ceil((max_lon - min_lon) / CITY_RASTER_RESOLUTION))
+            ny = int(math.ceil((max_lat - min_lat) / CITY_RASTER_RESOLUTION))
+            transform = Affine(CITY_RASTER_RESOLUTION, 0.0, min_lon,
+                               0.0, -CITY_RASTER_RESOLUTION, min_lat + ny * CITY_RASTER_RESOLUTION)
+            
+            # Hücre merkezine göre il indeksi; il sınırlarının geçtiği tüm hücreler BOUNDARY.
+            # Sınır geçmeyen hücre ya tamamen tek bir ilin içinde ya da hiçbir ilde değildir
+            city_raster = rasterize(
+                zip(self._city_polygons, range(len(self._city_polygons))),
+                out_shape=(ny, nx), transform=transform, fill=CITY_RASTER_NONE, dtype='int32'
+            )
+            borders = rasterize(
+                ((shapely.boundary(polygon), 1) for polygon in self._city_polygons),
+                out_shape=(ny, nx), transform=transform, fill=0, all_touched=True, dtype='uint8'
+            )
+            city_raster[borders == 1] = CITY_RASTER_BOUNDARY
+            
+            # Satırlar kuzeyden güneye; [boylam indeksi, enlem indeksi] düzenine çevir
+            self._city_raster = np.ascontiguousarray(city_raster[::-1].T)
+            self._city_raster_origin = (min_lon, min_lat)
+            logger.info(f"City raster built: {nx}x{ny} cells, "
+                        f"{np.count_nonzero(borders)} on province borders")
+        except Exception as e:
+            logger.warning(f"City raster could not be built: {str(e)}")
+            self._city_raster = None
+    
     def _set_fallback_bounds(self):
         """Yedek sınırları ayarla (basit dikdörtgen)"""
         self.turkey_bounds = {
@@ -343,6 +992,16 @@ class SoilAnalysisService:
             if self.turkey_bounds is None:
                 return False
             
+            # Kaba maske: iç/dış hücrelerde tek dizi erişimi yeterli, sınır hücreleri kesin teste düşer
+            if self._land_mask is not None:
+                cell = self._land_cell_status(longitude, latitude)
+                if cell != CELL_BOUNDARY:
+                    return cell == CELL_INSIDE
+            
+            # İndeks varsa yalnızca bbox'ı kesişen parçalar hazırlanmış geometriyle test edilir
+            if self._turkey_tree is not None:
+                return self._turkey_tree.query(Point(longitude, latitude), predicate='within').size > 0
+            
             # Eğer bounds bir shapely geometry ise
             if hasattr(self.turkey_bounds, 'contains'):
                 point = Point(longitude, latitude)
@@ -359,59 +1018,238 @@ class SoilAnalysisService:
             logger.error(f"Error checking point in Turkey: {str(e)}")
             return False
     
-    def _get_city_name(self, longitude: float, latitude: float) -> Optional[str]:
-        """Koordinat için şehir adını al (geopy ile güvenli istek)"""
+    def _points_in_turkey_mask(self, lons: np.ndarray, lats: np.ndarray) -> np.ndarray:
+        """Nokta dizileri için Türkiye içinde olma maskesini tek seferde hesapla"""
+        lons = np.asarray(lons, dtype=np.float64)
+        lats = np.asarray(lats, dtype=np.float64)
+        
+        if self.turkey_bounds is None:
+            return np.zeros(lons.shape, dtype=bool)
+        
+        # Fallback (dict) sınırları için basit aralık kontrolü
+        if isinstance(self.turkey_bounds, dict):
+            return ((lons >= self.turkey_bounds['min_lon']) & (lons <= self.turkey_bounds['max_lon']) &
+                    (lats >= self.turkey_bounds['min_lat']) & (lats <= self.turkey_bounds['max_lat']))
+        
         try:
-            import time
-            
-            # İstekler arası bekleme (rate limit koruması)
-            time.sleep(0.01)  # 0.2 saniye bekle
+            if self._land_mask is not None:
+                # Kaba maskeden hücre durumları; yalnızca sınır hücrelerindeki noktalar GEOS'a gider
+                min_lon, min_lat = self._land_mask_origin
+                nx, ny = self._land_mask.shape
+                with np.errstate(invalid='ignore'):
+                    ix = np.floor((lons - min_lon) / LAND_MASK_RESOLUTION)
+                    iy = np.floor((lats - min_lat) / LAND_MASK_RESOLUTION)
+                valid = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+                cells = np.full(lons.shape, CELL_OUTSIDE, dtype=np.int8)
+                cells[valid] = self._land_mask[ix[valid].astype(np.intp), iy[valid].astype(np.intp)]
+                
+                inside = cells == CELL_INSIDE
+                boundary = cells == CELL_BOUNDARY
+                if boundary.any():
+                    inside[boundary] = shapely.contains_xy(self.turkey_bounds, lons[boundary], lats[boundary])
+                return inside
             
-            # Geopy ile reverse geocoding
-            geolocator = Nominatim(user_agent="soil_analysis_api")
-            location = geolocator.reverse(f"{latitude}, {longitude}", language='tr')
+            # GEOS toplu yolu (shapely 2.0)
+            return shapely.contains_xy(self.turkey_bounds, lons, lats)
+        except Exception as e:
+            logger.error(f"Error checking points in Turkey: {str(e)}")
+            return np.fromiter(
+                (self._is_point_in_turkey(lon, lat) for lon, lat in zip(lons.tolist(), lats.tolist())),
+                dtype=bool, count=lons.size
+            )
+    
+    def _get_city_names(self, coords: List[Tuple[float, float]]) -> List[Optional[str]]:
+        """
+        Koordinat listesi için şehir adlarını al
+        
+        Koordinatlar 0.01°'lik hücrelere indirgenir; aynı hücredeki noktalar tek
+        sorguyla çözülür ve sonuç bellekte tutulur. Önbellekte olmayan hücreler için
+        il poligonları yüklüyse önce yerel STRtree sorgusu yapılır; bulunamayan
+        noktalar disk önbelleği ve reverse geocoding ile çözülür.
+        
+        Args:
+            coords: (boylam, enlem) listesi
             
-            if location and location.raw:
-                # Türkiye kontrolü
-                address = location.raw.get('address', {})
-                country = address.get('country', '').lower()
-                
-                if 'turkey' in country or 'türkiye' in country or 'tr' in country:
-                    # Şehir ve ilçe bilgilerini al
-                    state = address.get('state', '').strip()
-                    city = address.get('city', '').strip()
-                    town = address.get('town', '').strip()
-                    
-                    # Şehir/il ve ilçe kombinasyonu oluştur
-                    location_parts = []
-                    
-                    # İl/şehir ekle
-                    if state:
-                        location_parts.append(state)
-                    elif city:
-                        location_parts.append(city)
-                    
-                    # İlçe ekle (varsa ve mahalle/köy değilse)
-                    if town and len(town) > 3 and not any(suffix in town.lower() for suffix in ['mahallesi', 'köyü', 'beldesi']):
-                        location_parts.append(town)
-                    
-                    if location_parts:
-                        city_name = ', '.join(location_parts)
-                        print(f"✅ Şehir bulundu: {city_name} ({longitude}, {latitude})")
-                        return city_name
-                    else:
-                        print(f"❌ Şehir adı bulunamadı: ({longitude}, {latitude})")
+        Returns:
+            Her koordinat için şehir adı veya None
+        """
+        cells = [(int(lon * CITY_CELL_SCALE), int(lat * CITY_CELL_SCALE)) for lon, lat in coords]
+        cell_names: Dict[Tuple[int, int], Optional[str]] = {}
+        pending: Dict[Tuple[int, int], Tuple[float, float]] = {}
+        
+        with self._city_cell_lock:
+            cache = self._city_cell_cache
+            for cell, coord in zip(cells, coords):
+                if cell in cell_names or cell in pending:
+                    continue
+                name = cache.get(cell)
+                if name is None:
+                    pending[cell] = coord  # Hücrenin ilk noktası temsilci olarak sorgulanır
                 else:
-                    print(f"❌ Türkiye dışı: {country} ({longitude}, {latitude})")
-            else:
-                print(f"❌ Konum bilgisi alınamadı: ({longitude}, {latitude})")
+                    cache.move_to_end(cell)
+                    cell_names[cell] = name
+        
+        if pending:
+            lookup = list(pending.values())
+            names = self._lookup_city_names_local(lookup)
             
-            return None
+            unresolved = [i for i, name in enumerate(names) if name is None]
+            if unresolved:
+                remote_names = self._reverse_geocode_names([lookup[i] for i in unresolved])
+                for i, name in zip(unresolved, remote_names):
+                    names[i] = name
             
-        except Exception as e:
-            logger.warning(f"Error getting city name for ({longitude}, {latitude}): {str(e)}")
-            print(f"❌ Hata: {str(e)} ({longitude}, {latitude})")
+            # Bulunamayan hücreler önbelleğe yazılmaz (ağ hatası olabilir)
+            with self._city_cell_lock:
+                for cell, name in zip(pending, names):
+                    cell_names[cell] = name
+                    if name is not None:
+                        cache[cell] = name
+                        if len(cache) > CITY_CELL_CACHE_SIZE:
+                            cache.popitem(last=False)
+        
+        return [cell_names[cell] for cell in cells]
+    
+    def _lookup_city_names_local(self, coords: List[Tuple[float, float]]) -> List[Optional[str]]:
+        """Noktaları il poligonlarında ara (yalnızca bbox'ı kesişen poligonlar test edilir)"""
+        names: List[Optional[str]] = [None] * len(coords)
+        if self._city_tree is None or not coords:
+            return names
+        
+        xy = np.asarray(coords, dtype=np.float64)
+        pending = np.arange(len(coords))
+        
+        if self._city_raster is not None:
+            # Rasterden il indeksi: iç hücreler doğrudan çözülür, yalnızca sınır hücreleri ağaca gider
+            min_lon, min_lat = self._city_raster_origin
+            nx, ny = self._city_raster.shape
+            ix = np.floor((xy[:, 0] - min_lon) / CITY_RASTER_RESOLUTION)
+            iy = np.floor((xy[:, 1] - min_lat) / CITY_RASTER_RESOLUTION)
+            valid = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+            city_ids = np.full(len(coords), CITY_RASTER_NONE, dtype=np.int32)
+            city_ids[valid] = self._city_raster[ix[valid].astype(np.intp), iy[valid].astype(np.intp)]
+            
+            for p in np.flatnonzero(city_ids >= 0).tolist():
+                names[p] = self._city_names[city_ids[p]]
+            pending = np.flatnonzero(city_ids == CITY_RASTER_BOUNDARY)
+            if pending.size == 0:
+                return names
+        
+        points = shapely.points(xy[pending])
+        point_idx, city_idx = self._city_tree.query(points, predicate='within')
+        for p, c in zip(pending[point_idx].tolist(), city_idx.tolist()):
+            if names[p] is None:
+                names[p] = self._city_names[c]
+        return names
+    
+    def _reverse_geocode_names(self, coords: List[Tuple[float, float]]) -> List[Optional[str]]:
+        """
+        Şehir adlarını reverse geocoding ile al
+        
+        Yakın noktalar (3 ondalık hane) önbellekten döner, kalanlar eşzamanlı
+        istekle tek seferde sorgulanır.
+        """
+        keys = [f"{round(lon, 3)},{round(lat, 3)}" for lon, lat in coords]
+        names: Dict[str, Optional[str]] = {}
+        missing = []
+        
+        with self._geo_lock:
+            for key, coord in zip(keys, coords):
+                if key in names:
+                    continue
+                cached = self._geo_cache.get(key)
+                names[key] = cached or None
+                if cached is None:
+                    missing.append((key, coord))
+        
+        if missing:
+            try:
+                addresses = asyncio.run(self._reverse_many([coord for _, coord in missing]))
+            except Exception as e:
+                logger.warning(f"Batch reverse geocoding failed: {str(e)}")
+                addresses = [None] * len(missing)
+            
+            with self._geo_lock:
+                for (key, (lon, lat)), address in zip(missing, addresses):
+                    # Ağ hatası önbelleğe yazılmaz, sonraki istekte tekrar denenir
+                    if address is None:
+                        continue
+                    city_name = self._format_city_name(address)
+                    if city_name is None:
+                        logger.debug(f"No Turkish city name for ({lon}, {lat})")
+                    self._geo_cache[key] = city_name or ''
+                    names[key] = city_name
+                if hasattr(self._geo_cache, 'sync'):
+                    self._geo_cache.sync()
+            
+            logger.info(f"Reverse geocoded {len(missing)} points ({len(coords) - len(missing)} from cache)")
+        
+        return [names[key] for key in keys]
+    
+    async def _wait_geocode_slot(self):
+        """Sıradaki Nominatim isteği için zaman dilimi ayır ve başlangıç anına kadar bekle"""
+        with self._geocode_rate_lock:
+            now = time.monotonic()
+            start = max(now, self._geocode_next_start)
+            self._geocode_next_start = start + GEOCODE_MIN_INTERVAL
+        if start > now:
+            await asyncio.sleep(start - now)
+    
+    async def _reverse_many(self, coords: List[Tuple[float, float]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Nominatim reverse isteklerini gönder, adres sözlüklerini döndür
+        
+        İstek başlangıçları GEOCODE_MIN_INTERVAL aralıkla sıraya konur (1 istek/saniye);
+        yavaş yanıtlar sırayı tıkamasın diye en fazla GEOCODE_CONCURRENCY istek aynı anda açık kalır.
+        """
+        semaphore = asyncio.Semaphore(GEOCODE_CONCURRENCY)
+        
+        async with httpx.AsyncClient(headers={"User-Agent": "soil_analysis_api"}, timeout=10.0) as client:
+            async def reverse_one(longitude: float, latitude: float) -> Optional[Dict[str, Any]]:
+                async with semaphore:
+                    await self._wait_geocode_slot()
+                    try:
+                        response = await client.get(NOMINATIM_REVERSE_URL, params={
+                            "format": "jsonv2",
+                            "lat": latitude,
+                            "lon": longitude,
+                            "accept-language": "tr"
+                        })
+                        response.raise_for_status()
+                        return response.json().get('address', {})
+                    except Exception as e:
+                        logger.warning(f"Error getting city name for ({longitude}, {latitude}): {str(e)}")
+                        return None
+            
+            return await asyncio.gather(*(reverse_one(lon, lat) for lon, lat in coords))
+    
+    @staticmethod
+    def _format_city_name(address: Dict[str, Any]) -> Optional[str]:
+        """Nominatim adresinden "İl, İlçe" biçiminde şehir adı oluştur (Türkiye dışı için None)"""
+        # Türkiye kontrolü
+        country = address.get('country', '').lower()
+        if not ('turkey' in country or 'türkiye' in country or 'tr' in country):
             return None
+        
+        # Şehir ve ilçe bilgilerini al
+        state = address.get('state', '').strip()
+        city = address.get('city', '').strip()
+        town = address.get('town', '').strip()
+        
+        # Şehir/il ve ilçe kombinasyonu oluştur
+        location_parts = []
+        
+        # İl/şehir ekle
+        if state:
+            location_parts.append(state)
+        elif city:
+            location_parts.append(city)
+        
+        # İlçe ekle (varsa ve mahalle/köy değilse)
+        if town and len(town) > 3 and not any(suffix in town.lower() for suffix in ['mahallesi', 'köyü', 'beldesi']):
+            location_parts.append(town)
+        
+        return ', '.join(location_parts) if location_parts else None
     
     def get_soil_id_from_raster(self, longitude: float, latitude: float) -> Optional[int]:
         """
@@ -428,27 +1266,152 @@ class SoilAnalysisService:
             Exception: Raster okuma hatası
         """
         try:
-            with rasterio.open(self.raster_file) as src:
-                # Koordinat sınırlarını kontrol et
-                if not (src.bounds.left <= longitude <= src.bounds.right and 
-                        src.bounds.bottom <= latitude <= src.bounds.top):
-                    logger.warning(f"Coordinates ({longitude}, {latitude}) outside map bounds")
-                    return None
-
-                # Koordinatı piksel koordinatına çevir
-                row, col = src.index(longitude, latitude)
-                pixel_value = src.read(1, window=((row, row + 1), (col, col + 1)))
-                
-                if pixel_value.size > 0:
-                    soil_id = int(pixel_value[0, 0])
-                    logger.info(f"Soil ID found from raster: {soil_id}")
-                    return soil_id
+            # Koordinat sınırlarını kontrol et
+            left, bottom, right, top = self._raster_extent
+            if not (left <= longitude <= right and bottom <= latitude <= top):
+                logger.warning(f"Coordinates ({longitude}, {latitude}) outside map bounds")
                 return None
+
+            # Koordinatı piksel koordinatına çevir (src.index ile aynı: floor)
+            a, b, c, d, e, f = self._raster_inv_coeffs
+            col = math.floor(a * longitude + b * latitude + c)
+            row = math.floor(d * longitude + e * latitude + f)
+            
+            # Bellek eşlemeli raster varsa tek bir dizi erişimi yeterli
+            raster_mm = self._raster_mm
+            if raster_mm is not None:
+                nrows, ncols = self._raster_shape
+                if 0 <= row < nrows and 0 <= col < ncols:
+                    return int(raster_mm[row, col])
+                return None
+            
+            return self._raster_soil_id_cached(row, col)
                 
         except Exception as e:
             logger.error(f"Error reading raster file: {str(e)}")
             raise Exception(f"Raster file reading error: {str(e)}")
     
+    def get_soil_ids_batch(self, points: List[Tuple[float, float]]) -> List[Optional[int]]:
+        """
+        Çok sayıda koordinat için toprak ID'lerini tek seferde al
+        
+        Args:
+            points: (longitude, latitude) listesi
+            
+        Returns:
+            Her nokta için toprak ID'si (harita dışındaysa None)
+        """
+        if not points:
+            return []
+        
+        lons, lats = np.asarray(points, dtype=np.float64).T
+        bounds = self._raster_bounds
+        inside = ((bounds.left <= lons) & (lons <= bounds.right) &
+                  (bounds.bottom <= lats) & (lats <= bounds.top))
+        
+        # Tüm noktaların piksel koordinatları tek vektörel işlemle
+        cols, rows = self._raster_inv_transform * (lons, lats)
+        rows = np.floor(rows).astype(np.int64)
+        cols = np.floor(cols).astype(np.int64)
+        nrows, ncols = self._raster_shape
+        inside &= (rows >= 0) & (rows < nrows) & (cols >= 0) & (cols < ncols)
+        values = np.zeros(len(lons), dtype=np.int64)
+        
+        if self._raster_mm is not None:
+            values[inside] = self._raster_mm[rows[inside], cols[inside]]
+        else:
+            # Raster tamamen okunmaz (~1.8 GB); noktalar tek sample çağrısıyla toplanır
+            idx = np.flatnonzero(inside)
+            samples = self._raster_ds.sample(zip(lons[idx], lats[idx]), indexes=1)
+            for i, sample in zip(idx, samples):
+                values[i] = int(sample[0])
+        
+        return [int(v) if ok else None for v, ok in zip(values.tolist(), inside.tolist())]
+    
+    def _read_raster_pixel(self, row: int, col: int) -> Optional[int]:
+        """Tek bir raster pikselini oku (get_soil_id_from_raster içinde lru_cache ile sarılır)"""
+        pixel_value = self._raster_ds.read(1, window=((row, row + 1), (col, col + 1)))
+        
+        if pixel_value.size > 0:
+            soil_id = int(pixel_value[0, 0])
+            logger.info(f"Soil ID found from raster: {soil_id}")
+            return soil_id
+        return None
+    
+    def close(self):
+        """Açık raster ve veritabanı kaynaklarını serbest bırak"""
+        self._raster_mm = None
+        if self._raster_ds is not None and not self._raster_ds.closed:
+            self._raster_ds.close()
+        with self._db_lock:
+            connections, self._db_connections = self._db_connections, []
+            self._soil_cache.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except DB_ERRORS:
+                pass
+        self._db_local = threading.local()
+        with self._geo_lock:
+            if hasattr(self._geo_cache, 'close'):
+                self._geo_cache.close()
+                self._geo_cache = {}
+    
+    def _connect_database(self):
+        """Bu iş parçacığı için kalıcı veritabanı bağlantısını ve sorgu cursor'larını aç"""
+        local = self._db_local
+        local.conn = self._open_db_connection()
+        local.smu_cursor = local.conn.cursor()
+        local.layers_cursor = local.conn.cursor()
+        with self._db_lock:
+            self._db_connections.append(local.conn)
+    
+    def _reset_database(self):
+        """Bu iş parçacığının veritabanı bağlantısını kapat (sonraki sorguda yeniden açılır)"""
+        local = self._db_local
+        conn = getattr(local, 'conn', None)
+        local.conn = None
+        local.smu_cursor = None
+        local.layers_cursor = None
+        with self._db_lock:
+            self._soil_cache.clear()
+            if conn in self._db_connections:
+                self._db_connections.remove(conn)
+        if conn is not None:
+            try:
+                conn.close()
+            except DB_ERRORS:
+                pass
+    
+    def _query_soil_rows(self, soil_id: int) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """SMU ve LAYERS satırlarını kalıcı bağlantıdan al; bağlantı koptuysa bir kez yeniden dene"""
+        local = self._db_local
+        for attempt in range(2):
+            try:
+                if getattr(local, 'conn', None) is None:
+                    self._connect_database()
+                
+                local.smu_cursor.execute(SMU_SQL, (soil_id,))
+                smu_row = local.smu_cursor.fetchone()
+                if not smu_row:
+                    return None, None
+                smu_columns = [column[0] for column in local.smu_cursor.description]
+                smu_data = {k: self._to_json_scalar(v) for k, v in zip(smu_columns, smu_row)}
+                
+                local.layers_cursor.execute(LAYERS_SQL, (soil_id,))
+                layers_row = local.layers_cursor.fetchone()
+                if not layers_row:
+                    return smu_data, None
+                layers_columns = [column[0] for column in local.layers_cursor.description]
+                layers_data = {k: self._to_json_scalar(v) for k, v in zip(layers_columns, layers_row)}
+                return smu_data, layers_data
+            
+            except DB_ERRORS as ex:
+                self._reset_database()
+                if attempt or 'IM002' in str(ex):
+                    raise
+                logger.warning(f"Database connection lost, reconnecting: {str(ex)}")
+    
     def get_soil_data_from_database(self, soil_id: int) -> Optional[Dict[str, Any]]:
         """
         Veritabanından toprak verilerini al
@@ -462,47 +1425,48 @@ class SoilAnalysisService:
         Raises:
             Exception: Veritabanı bağlantı hatası
         """
-        conn_str = (
-            r'DRIVER={Microsoft Access Driver (*.mdb, *.accdb)};'
-            rf'DBQ={self.db_file};'
-        )
-        conn = None
+        # Ön yüklenen tablo varsa ODBC'ye hiç gitme
+        if self._soil_index:
+            row_idx = self._soil_index.get(soil_id)
+            if row_idx is None:
+                logger.warning(f"No record found in HWSD2_SMU for ID: {soil_id}")
+                return None
+            soil_data = {}
+            for field, column in self._soil_columns.items():
+                value = column[row_idx].item()
+                soil_data[field] = None if value == '' else value
+            return soil_data
         
         try:
-            conn = pyodbc.connect(conn_str)
-            cursor = conn.cursor()
-
-            # HWSD2_SMU tablosundan toprak bilgilerini al
-            smu_query = "SELECT * FROM [HWSD2_SMU] WHERE [HWSD2_SMU_ID] = ?"
-            cursor.execute(smu_query, soil_id)
-            smu_row = cursor.fetchone()
-
-            if not smu_row:
+            cache = self._soil_cache
+            with self._db_lock:
+                soil_data = cache.get(soil_id)
+                if soil_data is not None:
+                    cache.move_to_end(soil_id)
+                    return soil_data
+            
+            # Sorgu iş parçacığının kendi bağlantısında, kilit dışında çalışır
+            smu_data, layers_data = self._query_soil_rows(soil_id)
+            
+            if smu_data is None:
                 logger.warning(f"No record found in HWSD2_SMU for ID: {soil_id}")
                 return None
             
-            # SMU verilerini al
-            smu_columns = [column[0] for column in cursor.description]
-            smu_data = dict(zip(smu_columns, smu_row))
-            
-            # HWSD2_LAYERS tablosundan detaylı katman bilgilerini al
-            layers_query = "SELECT * FROM [HWSD2_LAYERS] WHERE [HWSD2_SMU_ID] = ?"
-            cursor.execute(layers_query, soil_id)
-            layers_row = cursor.fetchone()
-
-            if layers_row:
-                layers_columns = [column[0] for column in cursor.description]
-                layers_data = dict(zip(layers_columns, layers_row))
-                
+            if layers_data is not None:
                 # SMU ve Layers verilerini birleştir
-                combined_data = {**smu_data, **layers_data}
+                soil_data = {**smu_data, **layers_data}
                 logger.info(f"Soil data retrieved successfully for ID: {soil_id}")
-                return combined_data
             else:
                 logger.warning(f"No record found in HWSD2_LAYERS for ID: {soil_id}")
-                return smu_data
+                soil_data = smu_data
+            
+            with self._db_lock:
+                cache[soil_id] = soil_data
+                if len(cache) > SOIL_DATA_CACHE_SIZE:
+                    cache.popitem(last=False)
+            return soil_data
 
-        except pyodbc.Error as ex:
+        except DB_ERRORS as ex:
             logger.error(f"Database error: {str(ex)}")
             if 'IM002' in str(ex):
                 raise Exception("Microsoft Access Database Engine driver not found")
@@ -511,9 +1475,6 @@ class SoilAnalysisService:
         except Exception as e:
             logger.error(f"Unexpected database error: {str(e)}")
             raise Exception(f"Database connection error: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
     
     def get_automatic_coordinates(self) -> tuple[Optional[float], Optional[float]]:
         """
@@ -525,17 +1486,24 @@ class SoilAnalysisService:
         Raises:
             Exception: Konum tespit hatası
         """
+        # Sunucunun IP'si nadiren değişir; son başarılı sonuç TTL boyunca diskten döner
+        with self._geo_lock:
+            cached = self._geo_cache.get(IP_LOCATION_CACHE_KEY)
+        if cached is not None and cached[0] > time.time():
+            return cached[1], cached[2]
+        
         try:
             logger.info("Attempting automatic location detection...")
             g = geocoder.ip('me')
             
             if g.ok:
                 lat, lon = g.latlng
-                # Koordinatları virgülden sonra 2 haneye yuvarla
-                lat_rounded = round(lat, 1)
-                lon_rounded = round(lon, 1)
-                logger.info(f"Location detected: Lat={lat_rounded}, Lon={lon_rounded}")
-                return lon_rounded, lat_rounded
+                logger.info(f"Location detected: Lat={lat}, Lon={lon}")
+                with self._geo_lock:
+                    self._geo_cache[IP_LOCATION_CACHE_KEY] = (time.time() + IP_LOCATION_TTL, lon, lat)
+                    if hasattr(self._geo_cache, 'sync'):
+                        self._geo_cache.sync()
+                return lon, lat
             else:
                 logger.warning("Automatic location detection failed")
                 return None, None
@@ -544,28 +1512,65 @@ class SoilAnalysisService:
             logger.error(f"Error in automatic location detection: {str(e)}")
             raise Exception(f"Location detection error: {str(e)}")
     
-    def analyze_soil(self, longitude: float, latitude: float) -> SoilAnalysisResponse:
+    def analyze_soil(self, longitude: float, latitude: float) -> Dict[str, Any]:
         """
-        Toprak analizi yap
+        Toprak analizi yap (sonuçlar koordinat başına önbelleğe alınır)
         
         Args:
             longitude: Boylam
             latitude: Enlem
             
         Returns:
-            Toprak analizi sonucu
+            SoilAnalysisResponse şemasında düz sözlük (pydantic doğrulaması olmadan)
             
         Raises:
             HTTPException: Analiz hatası
         """
+        # HWSD2 statik olduğundan sonuç deterministik; yalnızca zaman damgası ve
+        # koordinatlar isteğe özeldir. Önbellek hiç geçersizleştirilmez.
+        key = (round(longitude, 4), round(latitude, 4))
+        cache = self._response_cache
+        template = cache.get(key)
+        if template is None:
+            template = self._analyze_soil_uncached(longitude, latitude)
+            cache[key] = template
+            if len(cache) > RESPONSE_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        
+        # Önbellekteki şablon paylaşılır: iç içe sözlük/listeler de kopyalanır ki çağıranın
+        # döndürülen yanıtı değiştirmesi sonraki isteklerin sonucunu bozmasın
+        # (özellik kayıtlarının değerleri skaler olduğundan bu kopya tam bir derin kopyadır)
+        response = {
+            **template,
+            "timestamp": datetime.now(),
+            "coordinates": {"longitude": longitude, "latitude": latitude},
+            "classification": dict(template["classification"])
+        }
+        for field, _ in PROPERTY_SPECS:
+            response[field] = [dict(prop) for prop in template[field]]
+        return response
+    
+    def _analyze_soil_uncached(self, longitude: float, latitude: float) -> Dict[str, Any]:
+        """Önbelleğe bakmadan toprak analizi yap (bkz. analyze_soil)"""
         try:
-            # Koordinatları virgülden sonra 2 haneye yuvarla
-            longitude = round(longitude, 1)
-            latitude = round(latitude, 1)
-            
-            # Toprak ID'sini al
+            # Toprak ID'sini al (koordinatlar yuvarlanmaz; ~900 m raster çözünürlüğü korunur)
             soil_id = self.get_soil_id_from_raster(longitude, latitude)
+            return self._build_analysis(longitude, latitude, soil_id)
             
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Soil analysis error: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Soil analysis failed: {str(e)}"
+            )
+    
+    def _build_analysis(self, longitude: float, latitude: float, soil_id: Optional[int]) -> Dict[str, Any]:
+        """Raster'dan bulunmuş toprak ID'si için analiz yanıtını oluştur"""
+        try:
             if not soil_id or soil_id == 0:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -582,34 +1587,28 @@ class SoilAnalysisService:
                 )
             
             # Sınıflandırma bilgilerini hazırla
-            classification = SoilClassification(
-                wrb4_code=soil_data.get('WRB4', 'N/A'),
-                wrb4_description=WRB_DESCRIPTIONS.get(soil_data.get('WRB4', '')),
-                wrb2_code=soil_data.get('WRB2', 'N/A'),
-                wrb2_description=WRB_DESCRIPTIONS.get(soil_data.get('WRB2', '')),
-                fao90_code=soil_data.get('FAO90', 'N/A')
-            )
+            classification = {
+                "wrb4_code": soil_data.get('WRB4', 'N/A'),
+                "wrb4_description": WRB_DESCRIPTIONS.get(soil_data.get('WRB4', '')),
+                "wrb2_code": soil_data.get('WRB2', 'N/A'),
+                "wrb2_description": WRB_DESCRIPTIONS.get(soil_data.get('WRB2', '')),
+                "fao90_code": soil_data.get('FAO90', 'N/A')
+            }
+            
+            analysis = {
+                "success": True,
+                "message": "Soil analysis completed successfully",
+                "timestamp": datetime.now(),
+                "coordinates": {"longitude": longitude, "latitude": latitude},
+                "soil_id": soil_id,
+                "classification": classification
+            }
             
             # Toprak özelliklerini kategorilere ayır
-            basic_properties = self._extract_basic_properties(soil_data)
-            texture_properties = self._extract_texture_properties(soil_data)
-            physical_properties = self._extract_physical_properties(soil_data)
-            chemical_properties = self._extract_chemical_properties(soil_data)
-            salinity_properties = self._extract_salinity_properties(soil_data)
+            for field, spec in PROPERTY_SPECS:
+                analysis[field] = self._extract_properties(soil_data, spec)
             
-            return SoilAnalysisResponse(
-                success=True,
-                message="Soil analysis completed successfully",
-                timestamp=datetime.now(),
-                coordinates={"longitude": longitude, "latitude": latitude},
-                soil_id=soil_id,
-                classification=classification,
-                basic_properties=basic_properties,
-                texture_properties=texture_properties,
-                physical_properties=physical_properties,
-                chemical_properties=chemical_properties,
-                salinity_properties=salinity_properties
-            )
+            return analysis
             
         except HTTPException:
             raise
@@ -620,104 +1619,18 @@ class SoilAnalysisService:
                 detail=f"Soil analysis failed: {str(e)}"
             )
     
-    def _extract_basic_properties(self, soil_data: Dict[str, Any]) -> List[SoilProperty]:
-        """Temel toprak özelliklerini çıkar"""
-        properties = []
-        
-        if soil_data.get('PH_WATER') not in [-9.0, -9, None]:
-            properties.append(SoilProperty(name="pH", value=soil_data.get('PH_WATER'), unit="pH units"))
-        
-        if soil_data.get('ORG_CARBON') not in [-9.0, -9, None]:
-            properties.append(SoilProperty(name="Organic Carbon", value=soil_data.get('ORG_CARBON'), unit="%"))
-        
-        if soil_data.get('TOTAL_N') not in [-9.0, -9, None]:
-            properties.append(SoilProperty(name="Total Nitrogen", value=soil_data.get('TOTAL_N'), unit="%"))
-        
-        if soil_data.get('CN_RATIO') not in [-9.0, -9, None]:
-            properties.append(SoilProperty(name="C/N Ratio", value=soil_data.get('CN_RATIO'), unit="ratio"))
-        
-        return properties
-    
-    def _extract_texture_properties(self, soil_data: Dict[str, Any]) -> List[SoilProperty]:
-        """Toprak doku özelliklerini çıkar"""
-        properties = []
-        
-        if soil_data.get('CLAY') not in [-9, -9.0, None]:
-            properties.append(SoilProperty(name="Clay", value=soil_data.get('CLAY'), unit="%"))
-        
-        if soil_data.get('SILT') not in [-9, -9.0, None]:
-            properties.append(SoilProperty(name="Silt", value=soil_data.get('SILT'), unit="%"))
-        
-        if soil_data.get('SAND') not in [-9, -9.0, None]:
-            properties.append(SoilProperty(name="Sand", value=soil_data.get('SAND'), unit="%"))
-        
-        if soil_data.get('COARSE') not in [-9, -9.0, None]:
-            properties.append(SoilProperty(name="Coarse Fragments", value=soil_data.get('COARSE'), unit="%"))
-        
-        return properties
-    
-    def _extract_physical_properties(self, soil_data: Dict[str, Any]) -> List[SoilProperty]:
-        """Fiziksel özellikleri çıkar"""
-        properties = []
-        
-        if soil_data.get('BULK') not in [-9.0, -9, None]:
-            properties.append(SoilProperty(name="Bulk Density", value=soil_data.get('BULK'), unit="g/cm³"))
-        
-        if soil_data.get('REF_BULK') not in [-9.0, -9, None]:
-            properties.append(SoilProperty(name="Reference Bulk Density", value=soil_data.get('REF_BULK'), unit="g/cm³"))
-        
-        if soil_data.get('ROOT_DEPTH') not in [-9, -9.0, None]:
-            properties.append(SoilProperty(name="Root Depth", value=soil_data.get('ROOT_DEPTH'), unit="m"))
-        
-        if soil_data.get('AWC') not in [-9, -9.0, None]:
-            properties.append(SoilProperty(name="Available Water Capacity", value=soil_data.get('AWC'), unit="mm/m"))
-        
-        return properties
-    
-    def _extract_chemical_properties(self, soil_data: Dict[str, Any]) -> List[SoilProperty]:
-        """Kimyasal özellikleri çıkar"""
-        properties = []
-        
-        if soil_data.get('CEC_SOIL') not in [-9, -9.0, None]:
-            properties.append(SoilProperty(name="Cation Exchange Capacity", value=soil_data.get('CEC_SOIL'), unit="cmol/kg"))
-        
-        if soil_data.get('CEC_CLAY') not in [-9, -9.0, None]:
-            properties.append(SoilProperty(name="Clay CEC", value=soil_data.get('CEC_CLAY'), unit="cmol/kg"))
-        
-        if soil_data.get('CEC_EFF') not in [-9.0, -9, None]:
-            properties.append(SoilProperty(name="Effective CEC", value=soil_data.get('CEC_EFF'), unit="cmol/kg"))
-        
-        if soil_data.get('TEB') not in [-9.0, -9, None]:
-            properties.append(SoilProperty(name="Total Exchangeable Bases", value=soil_data.get('TEB'), unit="cmol/kg"))
-        
-        if soil_data.get('BSAT') not in [-9, -9.0, None]:
-            properties.append(SoilProperty(name="Base Saturation", value=soil_data.get('BSAT'), unit="%"))
-        
-        if soil_data.get('ESP') not in [-9, -9.0, None]:
-            properties.append(SoilProperty(name="Exchangeable Sodium Percentage", value=soil_data.get('ESP'), unit="%"))
-        
-        if soil_data.get('ALUM_SAT') not in [-9, -9.0, None]:
-            properties.append(SoilProperty(name="Aluminum Saturation", value=soil_data.get('ALUM_SAT'), unit="%"))
-        
-        return properties
-    
-    def _extract_salinity_properties(self, soil_data: Dict[str, Any]) -> List[SoilProperty]:
-        """Tuzluluk özelliklerini çıkar"""
-        properties = []
-        
-        if soil_data.get('ELEC_COND') not in [-9, -9.0, None]:
-            properties.append(SoilProperty(name="Electrical Conductivity", value=soil_data.get('ELEC_COND'), unit="dS/m"))
-        
-        if soil_data.get('TCARBON_EQ') not in [-9.0, -9, None]:
-            properties.append(SoilProperty(name="Total Carbon Equivalent", value=soil_data.get('TCARBON_EQ'), unit="%"))
-        
-        if soil_data.get('GYPSUM') not in [-9.0, -9, None]:
-            properties.append(SoilProperty(name="Gypsum Content", value=soil_data.get('GYPSUM'), unit="%"))
-        
-        return properties
+    @staticmethod
+    def _extract_properties(soil_data: Dict[str, Any], spec: Tuple[Tuple[str, str, str], ...]) -> List[Dict[str, Any]]:
+        """Özellik tablosuna göre eksik olmayan değerleri çıkar"""
+        return [
+            {"name": name, "value": value, "unit": unit}
+            for key, name, unit in spec
+            if (value := soil_data.get(key)) is not None and value not in _MISSING
+        ]
 
     def generate_turkey_points(self, mode: str, lon_step: float = 0.5, lat_step: float = 0.5, 
-                              count: Optional[int] = None, save_to_file: bool = True) -> TurkeyPointsResponse:
+                              count: Optional[int] = None, save_to_file: bool = True,
+                              seed: Optional[int] = None, sampler: str = 'uniform') -> TurkeyPointsResponse:
         """
         Türkiye sınırları içinde eşit aralıklı veya rastgele noktalar üretir
         
@@ -727,6 +1640,8 @@ class SoilAnalysisService:
             lat_step: Enlem adımı (grid modu için)
             count: Toplam nokta sayısı (stratified modu için)
             save_to_file: Sonuçları txt dosyasına kaydet
+            seed: Rastgele üretici tohumu (stratified modu için, tekrarlanabilir sonuç)
+            sampler: "uniform" (kara hücrelerine orantılı rastgele) veya "halton" (düşük tutarsızlıklı dizi, stratified modu için)
             
         Returns:
             Türkiye noktaları yanıtı
@@ -742,6 +1657,12 @@ class SoilAnalysisService:
                     detail="Mode must be 'grid' or 'stratified'"
                 )
             
+            if sampler not in ['uniform', 'halton']:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Sampler must be 'uniform' or 'halton'"
+                )
+            
             # Türkiye sınırlarını al (shapefile'dan veya fallback)
             if isinstance(self.turkey_bounds, dict):
                 # Fallback bounds kullan
@@ -770,23 +1691,27 @@ class SoilAnalysisService:
                         detail=f"Too many points ({total_points}). Please increase step values."
                     )
                 
-                # Grid noktaları üret ve Türkiye sınırları içinde kontrol et
-                points = []
-                lon = min_lon
-                while lon <= max_lon:
-                    lat = min_lat
-                    while lat <= max_lat:
-                        if self._is_point_in_turkey(lon, lat):
-                            # Şehir adını al
-                            city_name = self._get_city_name(lon, lat)
-                            if city_name:  # Sadece şehir adı bulunan noktaları ekle
-                                points.append(PointResponse(
-                                    longitude=round(lon, 6), 
-                                    latitude=round(lat, 6),
-                                    city=city_name
-                                ))
-                        lat += lat_step
-                    lon += lon_step
+                # Grid noktalarını üret ve Türkiye sınırlarını tek seferde kontrol et
+                lons, lats = np.meshgrid(
+                    min_lon + np.arange(lon_count) * lon_step,
+                    min_lat + np.arange(lat_count) * lat_step,
+                    indexing='ij'
+                )
+                lons, lats = lons.ravel(), lats.ravel()
+                inside = self._points_in_turkey_mask(lons, lats)
+                
+                # Koordinatlar dizi üzerinde tek seferde yuvarlanır
+                coords = list(zip(np.round(lons[inside], 6).tolist(), np.round(lats[inside], 6).tolist()))
+                
+                # Şehir adlarını toplu al
+                city_names = self._get_city_names(coords)
+                
+                # Sadece şehir adı bulunan noktalar (lon, lat, şehir) demeti olarak tutulur
+                point_rows = [
+                    (lon, lat, city_name)
+                    for (lon, lat), city_name in zip(coords, city_names)
+                    if city_name
+                ]
                     
             else:  # stratified mode
                 if count is None or count <= 0:
@@ -801,29 +1726,59 @@ class SoilAnalysisService:
                         detail="Maximum 20000 points allowed"
                     )
                 
-                # Stratified rastgele noktalar üret - sadece Türkiye içindekileri al
-                points = []
-                attempts = 0
-                max_attempts = count * 20  # Maksimum deneme sayısı (şehir kontrolü için artırıldı)
+                # Stratified rastgele noktalar üret - adayları toplu üretip tek seferde maskele
+                point_rows = []
+                batch_size = max(count * 2, 4096)  # Tur başına aday sayısı
+                batches = 0
+                rng = np.random.default_rng(seed)
+                # Halton dizisi bbox'u daha düzgün kaplar; turlar arasında dizi kaldığı yerden devam eder
+                halton = qmc.Halton(d=2, seed=seed) if sampler == 'halton' else None
                 
-                while len(points) < count and attempts < max_attempts:
-                    lon = random.uniform(min_lon, max_lon)
-                    lat = random.uniform(min_lat, max_lat)
+                while len(point_rows) < count and batches < STRATIFIED_MAX_BATCHES:
+                    # Bbox içinde toplu aday üret, Türkiye dışındakiler tek maskeyle elenir
+                    if halton is not None:
+                        xy = qmc.scale(halton.random(batch_size), [min_lon, min_lat], [max_lon, max_lat])
+                        lons, lats = xy[:, 0], xy[:, 1]
+                    elif self._strata_weights is not None:
+                        # Kara içeren hücrelere eşit dağıtım: deniz/komşu ülke hücrelerine aday düşmez,
+                        # eksik nokta sayısı beklenen kabul oranına bölünerek tek turda tamamlanır
+                        needed = count - len(point_rows)
+                        lons, lats = self._sample_land_strata(
+                            rng, int(math.ceil(needed / self._strata_acceptance * 1.1)) + 16
+                        )
+                    else:
+                        lons = rng.uniform(min_lon, max_lon, batch_size)
+                        lats = rng.uniform(min_lat, max_lat, batch_size)
+                    batches += 1
+                    
+                    inside = self._points_in_turkey_mask(lons, lats)
                     
-                    if self._is_point_in_turkey(lon, lat):
-                        # Şehir adını al
-                        city_name = self._get_city_name(lon, lat)
-                        if city_name:  # Sadece şehir adı bulunan noktaları ekle
-                            points.append(PointResponse(
-                                longitude=round(lon, 6), 
-                                latitude=round(lat, 6),
-                                city=city_name
-                            ))
+                    # Yalnızca eksik nokta kadar adayın şehir adını toplu al
+                    needed = count - len(point_rows)
+                    coords = list(zip(
+                        np.round(lons[inside][:needed], 6).tolist(),
+                        np.round(lats[inside][:needed], 6).tolist()
+                    ))
+                    city_names = self._get_city_names(coords)
                     
-                    attempts += 1
+                    point_rows.extend(
+                        (lon, lat, city_name)
+                        for (lon, lat), city_name in zip(coords, city_names)
+                        if city_name  # Sadece şehir adı bulunan noktaları ekle
+                    )
                 
-                if len(points) < count:
-                    logger.warning(f"Could only generate {len(points)} points out of {count} requested")
+                if len(point_rows) < count:
+                    logger.warning(f"Could only generate {len(point_rows)} points out of {count} requested")
+            
+            # Yanıt modelleri üretim bittikten sonra tek geçişte kurulur;
+            # iç veriden kurulduğu için doğrulama atlanır
+            points = [
+                PointResponse.model_construct(longitude=lon, latitude=lat, city=city_name)
+                for lon, lat, city_name in point_rows
+            ]
+            
+            # Üretim zamanı bir kez alınır: dosya adı, TXT başlığı ve yanıt aynı anı gösterir
+            generated_at = datetime.now()
             
             # Dosyaya kaydet
             file_path = None
@@ -831,44 +1786,41 @@ class SoilAnalysisService:
             if save_to_file:
                 try:
                     # Dosya adı oluştur
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                    timestamp = generated_at.strftime("%Y%m%d_%H%M%S")
                     base = f"turkey_points_{mode}_{timestamp}"
                     filename = f"{base}.txt"
                     csv_filename = f"{base}.csv"
                     file_path = os.path.join(self.script_dir, filename)
                     csv_file_path = os.path.join(self.script_dir, csv_filename)
                     
-                    # Koordinatları TXT dosyasına yaz
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(f"# Türkiye Koordinat Noktaları - {mode.upper()} Modu\n")
-                        f.write(f"# Üretim Tarihi: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                        f.write(f"# Toplam Nokta Sayısı: {len(points)}\n")
-                        f.write(f"# Format: longitude,latitude\n")
-                        
-                        # Fallback bilgisi (dikdörtgen sınırlar) varsa yaz
-                        if isinstance(self.turkey_bounds, dict):
-                            f.write(f"# Fallback bounds in use: lon=[{self.turkey_bounds['min_lon']}, {self.turkey_bounds['max_lon']}], lat=[{self.turkey_bounds['min_lat']}, {self.turkey_bounds['max_lat']}]\n")
-                        else:
-                            # Shapefile kullanıldıysa bounding box bilgisini bilgi amaçlı yaz
-                            minx, miny, maxx, maxy = self.turkey_bounds.bounds
-                            f.write(f"# Using shapefile geometry (bbox): lon=[{round(minx,4)}, {round(maxx,4)}], lat=[{round(miny,4)}, {round(maxy,4)}]\n")
-                        
-                        f.write("#" + "="*50 + "\n")
-                        
-                        for point in points:
-                            f.write(f"{point.longitude},{point.latitude}\n")
+                    # TXT içeriği bellekte birleştirilip tek seferde yazılır
+                    lines = [
+                        f"# Türkiye Koordinat Noktaları - {mode.upper()} Modu\n",
+                        f"# Üretim Tarihi: {generated_at.strftime('%Y-%m-%d %H:%M:%S')}\n",
+                        f"# Toplam Nokta Sayısı: {len(points)}\n",
+                        "# Format: longitude,latitude\n"
+                    ]
                     
-                    # Koordinatları CSV dosyasına longitude,latitude,city olarak yaz (başlık yok)
-                    try:
-                        with open(csv_file_path, 'w', encoding='utf-8') as cf:
-                            for point in points:
-                                cf.write(f"{point.longitude},{point.latitude},{point.city or ''}\n")
-                        logger.info(f"Points saved to CSV file: {csv_file_path}")
-                    except Exception as csv_err:
-                        logger.error(f"CSV file save error: {str(csv_err)}")
-                        csv_file_path = None
+                    # Fallback bilgisi (dikdörtgen sınırlar) varsa yaz
+                    if isinstance(self.turkey_bounds, dict):
+                        lines.append(f"# Fallback bounds in use: lon=[{self.turkey_bounds['min_lon']}, {self.turkey_bounds['max_lon']}], lat=[{self.turkey_bounds['min_lat']}, {self.turkey_bounds['max_lat']}]\n")
+                    else:
+                        # Shapefile kullanıldıysa bounding box bilgisini bilgi amaçlı yaz
+                        minx, miny, maxx, maxy = self.turkey_bounds.bounds
+                        lines.append(f"# Using shapefile geometry (bbox): lon=[{round(minx,4)}, {round(maxx,4)}], lat=[{round(miny,4)}, {round(maxy,4)}]\n")
+                    
+                    lines.append("#" + "="*50 + "\n")
+                    lines.extend(f"{lon},{lat}\n" for lon, lat, _ in point_rows)
                     
-                    logger.info(f"Points saved to file: {file_path}")
+                    # İki dosya birlikte açılır; CSV (longitude,latitude,city, başlık yok) üretimdeki
+                    # demetlerden doğrudan yazılır, noktalar Python'da yalnızca TXT için bir kez gezilir
+                    with open(file_path, 'w', encoding='utf-8', buffering=POINTS_WRITE_BUFFER) as f, \
+                         open(csv_file_path, 'w', newline='', encoding='utf-8',
+                              buffering=POINTS_WRITE_BUFFER) as cf:
+                        f.write("".join(lines))
+                        csv.writer(cf, lineterminator='\n').writerows(point_rows)
+                    
+                    logger.info(f"Points saved to files: {file_path}, {csv_file_path}")
                     
                 except Exception as e:
                     logger.error(f"File save error: {str(e)}")
@@ -878,7 +1830,7 @@ class SoilAnalysisService:
             return TurkeyPointsResponse(
                 success=True,
                 message=f"Turkey points generated successfully using {mode} mode",
-                timestamp=datetime.now(),
+                timestamp=generated_at,
                 mode=mode,
                 total_points=len(points),
                 points=points,
@@ -896,6 +1848,39 @@ class SoilAnalysisService:
                 detail=f"Points generation failed: {str(e)}"
             )
 
+    def _analyze_to_row(self, longitude: float, latitude: float, city: str,
+                        soil_id: Optional[int]) -> List[Any]:
+        """Tek nokta için CSV satırını CSV_RESULT_COLUMNS sırasında düz liste olarak oluştur"""
+        if not soil_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No soil data found for the given coordinates"
+            )
+        
+        soil_data = self.get_soil_data_from_database(soil_id)
+        if not soil_data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Soil data not found in database"
+            )
+        
+        # Koordinatlar ve sınıflandırma - ara analiz sözlüğü kurulmadan doğrudan konuma yazılır
+        wrb4 = soil_data.get('WRB4', 'N/A')
+        wrb2 = soil_data.get('WRB2', 'N/A')
+        result_row = [
+            longitude, latitude, city, soil_id,
+            wrb4, WRB_DESCRIPTIONS.get(soil_data.get('WRB4', '')),
+            wrb2, WRB_DESCRIPTIONS.get(soil_data.get('WRB2', '')),
+            soil_data.get('FAO90', 'N/A')
+        ]
+        
+        # Özellikler sabit kolon sırasıyla eklenir, eksik değerler boş kalır
+        result_row.extend(
+            '' if (value := soil_data.get(key)) is None or value in _MISSING else value
+            for key in CSV_PROPERTY_KEYS
+        )
+        return result_row
+    
     def analyze_coordinates_from_csv(self, csv_file_path: str) -> SoilAnalysisCSVResponse:
         """
         CSV dosyasındaki koordinatlar için toprak analizi yapar ve sonuçları CSV'ye kaydeder
@@ -910,8 +1895,6 @@ class SoilAnalysisService:
             HTTPException: Dosya okuma veya analiz hatası
         """
         try:
-            import pandas as pd
-            
             # CSV dosyasını oku
             if not os.path.exists(csv_file_path):
                 raise HTTPException(
@@ -919,106 +1902,91 @@ class SoilAnalysisService:
                     detail=f"CSV file not found: {csv_file_path}"
                 )
             
-            # CSV'yi oku - sadece koordinatları al
-            df = pd.read_csv(csv_file_path, skiprows=1, header=None, names=['longitude', 'latitude', 'city'])
-            
-            # Veri tiplerini dönüştür
-            df['longitude'] = pd.to_numeric(df['longitude'], errors='coerce')
-            df['latitude'] = pd.to_numeric(df['latitude'], errors='coerce')
-            
-            # Geçersiz koordinatları filtrele
-            df = df.dropna(subset=['longitude', 'latitude'])
+            # CSV'yi tek geçişte (lon, lat, şehir) demetlerine oku - DataFrame kurulmaz.
+            # İlk satır başlıktır; sayıya çevrilemeyen koordinatlar atlanır
+            rows = []
+            with open(csv_file_path, 'r', newline='', encoding='utf-8-sig') as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                for record in reader:
+                    if len(record) < 2:
+                        continue
+                    try:
+                        longitude, latitude = float(record[0]), float(record[1])
+                    except ValueError:
+                        continue
+                    if math.isnan(longitude) or math.isnan(latitude):
+                        continue
+                    rows.append((longitude, latitude, record[2] if len(record) > 2 else ''))
             
-            if df.empty:
+            if not rows:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="No valid coordinates found in CSV file"
                 )
             
-            logger.info(f"Processing {len(df)} coordinates from CSV file")
+            logger.info(f"Processing {len(rows)} coordinates from CSV file")
+            
+            # Tüm noktaların toprak ID'lerini tek toplu okumayla al
+            soil_ids = self.get_soil_ids_batch([(longitude, latitude) for longitude, latitude, _ in rows])
             
-            # Sonuçları saklamak için liste
-            results = []
             successful_count = 0
             failed_count = 0
             
-            # Her koordinat için analiz yap
-            for index, row in df.iterrows():
-                try:
-                    longitude = float(row['longitude'])
-                    latitude = float(row['latitude'])
-                    city = str(row['city']) if pd.notna(row['city']) else ''
-                    
-                    # Toprak analizi yap
-                    soil_analysis = self.analyze_soil(longitude, latitude)
-                    
-                    # Sonuçları hazırla - sadece koordinatlar ve kütüphane verileri
-                    result_row = {
-                        'longitude': longitude,
-                        'latitude': latitude,
-                        'city': city,
-                        'soil_id': soil_analysis.soil_id,
-                        'wrb4_code': soil_analysis.classification.wrb4_code,
-                        'wrb4_description': soil_analysis.classification.wrb4_description,
-                        'wrb2_code': soil_analysis.classification.wrb2_code,
-                        'wrb2_description': soil_analysis.classification.wrb2_description,
-                        'fao90_code': soil_analysis.classification.fao90_code
-                    }
-                    
-                    # Temel özellikleri ekle
-                    for prop in soil_analysis.basic_properties:
-                        result_row[f'basic_{prop.name.lower().replace(" ", "_")}'] = prop.value
-                    
-                    # Doku özelliklerini ekle
-                    for prop in soil_analysis.texture_properties:
-                        result_row[f'texture_{prop.name.lower().replace(" ", "_")}'] = prop.value
-                    
-                    # Fiziksel özellikleri ekle
-                    for prop in soil_analysis.physical_properties:
-                        result_row[f'physical_{prop.name.lower().replace(" ", "_")}'] = prop.value
-                    
-                    # Kimyasal özellikleri ekle
-                    for prop in soil_analysis.chemical_properties:
-                        result_row[f'chemical_{prop.name.lower().replace(" ", "_")}'] = prop.value
-                    
-                    # Tuzluluk özelliklerini ekle
-                    for prop in soil_analysis.salinity_properties:
-                        result_row[f'salinity_{prop.name.lower().replace(" ", "_")}'] = prop.value
-                    
-                    results.append(result_row)
-                    successful_count += 1
-                    
-                    logger.info(f"Analysis completed for ({longitude}, {latitude}) - {city}")
-                    
-                except Exception as e:
-                    logger.warning(f"Analysis failed for ({row['longitude']}, {row['latitude']}): {str(e)}")
-                    failed_count += 1
-                    continue
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_filename = f"soil_analysis_results_{timestamp}.csv"
+            output_path = os.path.join(self.script_dir, output_filename)
             
-            # Sonuçları CSV'ye kaydet
-            if results:
-                output_df = pd.DataFrame(results)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                output_filename = f"soil_analysis_results_{timestamp}.csv"
-                output_path = os.path.join(self.script_dir, output_filename)
-                output_df.to_csv(output_path, index=False, encoding='utf-8')
+            # Sonuçlar bellekte biriktirilmeden parça parça CSV'ye yazılır (eksik özellikler boş)
+            with open(output_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(CSV_RESULT_COLUMNS)
+                chunk: List[List[Any]] = []
                 
-                logger.info(f"Soil analysis results saved to: {output_path}")
+                # Her koordinat için analiz yap - ODBC yolunda sorgular iş parçacıklarında örtüşür.
+                # Future'lar gönderim sırasıyla tüketilir, çıktı girdi sırasını korur;
+                # hatalar satır başına try/except yerine future.exception() ile toplanır
+                with ThreadPoolExecutor(max_workers=CSV_ANALYSIS_WORKERS) as executor:
+                    futures = [
+                        executor.submit(self._analyze_to_row, longitude, latitude, city, soil_id)
+                        for (longitude, latitude, city), soil_id in zip(rows, soil_ids)
+                    ]
+                    info_enabled = logger.isEnabledFor(logging.INFO)
+                    for index, (future, (longitude, latitude, _)) in enumerate(zip(futures, rows), 1):
+                        if info_enabled and index % CSV_LOG_EVERY == 0:
+                            logger.info("Analyzed %d/%d coordinates (%.3f, %.3f)", index, len(rows), longitude, latitude)
+                        error = future.exception()
+                        if error is not None:
+                            logger.warning("Analysis failed for (%s, %s): %s", longitude, latitude, error)
+                            failed_count += 1
+                            continue
+                        chunk.append(future.result())
+                        successful_count += 1
+                        if len(chunk) >= CSV_WRITE_CHUNK:
+                            writer.writerows(chunk)
+                            chunk.clear()
+                            f.flush()
                 
-                return SoilAnalysisCSVResponse(
-                    success=True,
-                    message=f"Soil analysis completed for {successful_count} coordinates",
-                    timestamp=datetime.now(),
-                    total_processed=len(df),
-                    successful_analyses=successful_count,
-                    failed_analyses=failed_count,
-                    csv_file_path=output_path
-                )
-            else:
+                writer.writerows(chunk)
+            
+            if successful_count == 0:
+                os.remove(output_path)
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="No successful analyses completed"
                 )
+            
+            logger.info(f"Soil analysis results saved to: {output_path}")
+            
+            return SoilAnalysisCSVResponse(
+                success=True,
+                message=f"Soil analysis completed for {successful_count} coordinates",
+                timestamp=datetime.now(),
+                total_processed=len(rows),
+                successful_analyses=successful_count,
+                failed_analyses=failed_count,
+                csv_file_path=output_path
+            )
                 
         except HTTPException:
             raise
@@ -1037,6 +2005,12 @@ except Exception as e:
     logger.error(f"Failed to initialize Soil Analysis Service: {str(e)}")
     soil_service = None
 
+@router.on_event("shutdown")
+def close_soil_service():
+    """Uygulama kapanırken raster dosyasını kapat"""
+    if soil_service is not None:
+        soil_service.close()
+
 @router.get("/", response_model=Dict[str, str])
 async def root():
     """API ana endpoint'i"""
@@ -1062,7 +2036,12 @@ async def health_check():
         "service": "Soil Analysis API"
     }
 
-@router.post("/analyze", response_model=SoilAnalysisResponse)
+@router.post(
+    "/analyze",
+    response_model=None,
+    response_class=ORJSONResponse,
+    responses={200: {"model": SoilAnalysisResponse}}
+)
 async def analyze_soil(request: ManualRequest):
     """
     Manuel koordinat ile toprak analizi
@@ -1094,7 +2073,12 @@ async def analyze_soil(request: ManualRequest):
             detail=f"Analysis failed: {str(e)}"
         )
 
-@router.post("/analyze/auto", response_model=SoilAnalysisResponse)
+@router.post(
+    "/analyze/auto",
+    response_model=None,
+    response_class=ORJSONResponse,
+    responses={200: {"model": SoilAnalysisResponse}}
+)
 async def analyze_soil_auto(request: AutoRequest):
     """
     Otomatik konum tespiti ile toprak analizi
@@ -1117,8 +2101,8 @@ async def analyze_soil_auto(request: AutoRequest):
     try:
         logger.info("Automatic soil analysis request")
         
-        # Otomatik koordinat tespiti
-        longitude, latitude = soil_service.get_automatic_coordinates()
+        # Otomatik koordinat tespiti (geocoder senkron HTTP isteği atar, event loop'u bloklamasın)
+        longitude, latitude = await run_in_threadpool(soil_service.get_automatic_coordinates)
         
         if longitude is None or latitude is None:
             raise HTTPException(
@@ -1144,7 +2128,9 @@ async def generate_turkey_points(
     lon_step: float = 0.5,
     lat_step: float = 0.5,
     count: Optional[int] = None,
-    save_to_file: bool = True
+    save_to_file: bool = True,
+    seed: Optional[int] = None,
+    sampler: str = "uniform"
 ):
     """
     Türkiye sınırları içinde eşit aralıklı veya rastgele noktalar üretir
@@ -1155,6 +2141,8 @@ async def generate_turkey_points(
         lat_step: Enlem adımı (grid modu için, varsayılan: 0.5)
         count: Toplam nokta sayısı (stratified modu için)
         save_to_file: Sonuçları txt dosyasına kaydet (varsayılan: True)
+        seed: Rastgele üretici tohumu (stratified modu için, isteğe bağlı)
+        sampler: "uniform" veya "halton" (stratified modu için, varsayılan: uniform)
         
     Returns:
         Türkiye noktaları listesi ve dosya bilgisi
@@ -1170,7 +2158,10 @@ async def generate_turkey_points(
     
     try:
         logger.info(f"Turkey points generation request: mode={mode}, lon_step={lon_step}, lat_step={lat_step}, count={count}")
-        return soil_service.generate_turkey_points(mode, lon_step, lat_step, count, save_to_file)
+        # Toplu reverse geocoding kendi event loop'unu çalıştırır, bu yüzden iş parçacığında yürüt
+        return await run_in_threadpool(
+            soil_service.generate_turkey_points, mode, lon_step, lat_step, count, save_to_file, seed, sampler
+        )
         
     except HTTPException:
         raise
@@ -1203,7 +2194,7 @@ async def analyze_coordinates_from_csv_endpoint(csv_file_path: str):
     
     try:
         logger.info(f"CSV soil analysis request for file: {csv_file_path}")
-        return soil_service.analyze_coordinates_from_csv(csv_file_path)
+        return await run_in_threadpool(soil_service.analyze_coordinates_from_csv, csv_file_path)
         
     except HTTPException:
         raise
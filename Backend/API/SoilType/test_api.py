@@ -9,10 +9,68 @@ Kullanıcıdan manuel/otomatik seçim alır ve ham JSON response'u gösterir.
 
 import httpx
 import asyncio
-import json
-import geocoder
+import csv
+import os
+import sys
+from datetime import datetime
+import orjson
 from typing import Dict, Any
 
+# Test edilen API adresi (istekler bu adrese göre göreli yollarla atılır)
+API_BASE_URL = "http://localhost:8000"
+
+# IP tabanlı konum servisi (mutlak URL olduğu için base_url'den bağımsız çağrılır)
+IP_LOOKUP_URL = "https://ipapi.co/json/"
+
+# SOIL_TEST_DEBUG=1 ile gönderilen istek gövdeleri de yazdırılır
+DEBUG = os.environ.get("SOIL_TEST_DEBUG") == "1"
+
+# İstemci tarafı toplu analizde aynı anda açık tutulan en fazla istek
+ANALYZE_WORKERS = 10
+
+# Bu sayıdan fazla nokta dönerse ham JSON yalnızca istenirse yazdırılır
+RAW_JSON_MAX_POINTS = 50
+
+# Ham JSON stdout'a bu boyutta parçalarla yazılır
+STDOUT_CHUNK = 1 << 16
+
+# Üretilen Türkiye noktalarının toplu analizinde eşzamanlı istek sayısı
+TURKEY_ANALYZE_WORKERS = 20
+
+# Analiz yanıtındaki özellik listeleri (CSV kolonları kategori önekiyle yazılır: basic_ph, ...)
+PROPERTY_FIELDS = (
+    'basic_properties', 'texture_properties', 'physical_properties',
+    'chemical_properties', 'salinity_properties'
+)
+
+def _pretty_json(data) -> str:
+    """Yanıtı girintili JSON metnine çevir (büyük nokta listelerinde orjson çok daha hızlı)"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+def _write_json_stream(data):
+    """Yanıtı girintili JSON olarak tek kopya bayt halinde parça parça stdout'a yaz"""
+    payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    view = memoryview(payload)
+    for start in range(0, len(view), STDOUT_CHUNK):
+        out.write(view[start:start + STDOUT_CHUNK])
+    out.write(b"\n")
+    out.flush()
+
+def _print_classification(result):
+    """Analiz yanıtının Soil ID ve sınıflandırma özetini yazdır"""
+    classification = result.get('classification') or {}
+    na = 'N/A'
+    wrb4_code = classification.get('wrb4_code', na)
+    wrb4_description = classification.get('wrb4_description', na)
+    wrb2_code = classification.get('wrb2_code', na)
+    wrb2_description = classification.get('wrb2_description', na)
+    print(f"   🆔 Soil ID: {result.get('soil_id', na)}")
+    print(f"   🌍 WRB4: {wrb4_code} - {wrb4_description}")
+    print(f"   🌍 WRB2: {wrb2_code} - {wrb2_description}")
+    print(f"   🌍 FAO90: {classification.get('fao90_code', na)}")
+
 def get_manual_coordinates():
     """Kullanıcıdan manuel koordinat alır"""
     print("\n📍 Manuel Koordinat Girişi")
@@ -42,16 +100,17 @@ def get_manual_coordinates():
         print("\n❌ İşlem iptal edildi")
         return None, None
 
-def get_automatic_coordinates():
+async def get_automatic_coordinates(client):
     """IP adresi üzerinden otomatik konum bulur"""
     print("\n🌐 Otomatik Konum Tespiti")
     print("-" * 30)
     print("Konumunuz algılanıyor... (Bu işlem biraz sürebilir)")
     
     try:
-        g = geocoder.ip('me')
-        if g.ok:
-            lat, lon = g.latlng
+        response = await client.get(IP_LOOKUP_URL, timeout=5.0)
+        location = orjson.loads(response.content) if response.status_code == 200 else {}
+        lat, lon = location.get('latitude'), location.get('longitude')
+        if lat is not None and lon is not None:
             # Koordinatları tam sayıya yuvarla
             lat_rounded = round(lat)
             lon_rounded = round(lon)
@@ -97,116 +156,106 @@ def get_user_choice():
             print("\n❌ İşlem iptal edildi")
             return "exit"
 
-async def test_manual_analysis(longitude, latitude):
+async def test_manual_analysis(client, longitude, latitude):
     """Manuel koordinat analizi testi"""
     print(f"\n🧪 Manuel Analiz Testi")
     print(f"📍 Koordinatlar: Boylam={longitude}, Enlem={latitude}")
     print("-" * 50)
     
-    async with httpx.AsyncClient() as client:
-        try:
-            # JSON request body oluştur
-            request_data = {
-                "method": "Manual",
-                "longitude": longitude,
-                "latitude": latitude
-            }
+    try:
+        # JSON request body oluştur
+        request_data = {
+            "method": "Manual",
+            "longitude": longitude,
+            "latitude": latitude
+        }
+        
+        if DEBUG:
+            print(f"📤 Gönderilen JSON: {_pretty_json(request_data)}")
+        
+        response = await client.post(
+            "/soiltype/analyze",
+            json=request_data,
+            timeout=30.0
+        )
+        
+        print(f"📊 HTTP Status: {response.status_code}")
+        
+        if response.status_code == 200:
+            result = orjson.loads(response.content)
+            print("✅ Başarılı!")
             
-            print(f"📤 Gönderilen JSON: {json.dumps(request_data, indent=2)}")
+            # Ham JSON response'u yazdır
+            print("\n📋 Ham JSON Response:")
+            print("=" * 50)
+            print(_pretty_json(result))
+            print("=" * 50)
             
-            response = await client.post(
-                "http://localhost:8000/soiltype/analyze",
-                json=request_data,
-                timeout=30.0
-            )
+            # Özet bilgiler
+            print(f"\n📊 Özet Bilgiler:")
+            _print_classification(result)
             
-            print(f"📊 HTTP Status: {response.status_code}")
+        else:
+            print(f"❌ Hata: {response.status_code}")
+            print(f"📝 Hata Mesajı: {response.text}")
             
-            if response.status_code == 200:
-                result = response.json()
-                print("✅ Başarılı!")
-                
-                # Ham JSON response'u yazdır
-                print("\n📋 Ham JSON Response:")
-                print("=" * 50)
-                print(json.dumps(result, indent=2, ensure_ascii=False))
-                print("=" * 50)
-                
-                # Özet bilgiler
-                print(f"\n📊 Özet Bilgiler:")
-                print(f"   🆔 Soil ID: {result.get('soil_id', 'N/A')}")
-                
-                classification = result.get('classification', {})
-                print(f"   🌍 WRB4: {classification.get('wrb4_code', 'N/A')} - {classification.get('wrb4_description', 'N/A')}")
-                print(f"   🌍 WRB2: {classification.get('wrb2_code', 'N/A')} - {classification.get('wrb2_description', 'N/A')}")
-                print(f"   🌍 FAO90: {classification.get('fao90_code', 'N/A')}")
-                
-            else:
-                print(f"❌ Hata: {response.status_code}")
-                print(f"📝 Hata Mesajı: {response.text}")
-                
-        except httpx.TimeoutException:
-            print("⏰ Zaman aşımı!")
-        except httpx.ConnectError:
-            print("🔌 Bağlantı hatası! API çalışıyor mu?")
-        except Exception as e:
-            print(f"💥 Beklenmeyen hata: {e}")
+    except httpx.TimeoutException:
+        print("⏰ Zaman aşımı!")
+    except httpx.ConnectError:
+        print("🔌 Bağlantı hatası! API çalışıyor mu?")
+    except Exception as e:
+        print(f"💥 Beklenmeyen hata: {e}")
 
-async def test_auto_analysis():
+async def test_auto_analysis(client):
     """Otomatik konum tespiti testi"""
     print(f"\n🌐 Otomatik Analiz Testi")
     print("-" * 50)
     
-    async with httpx.AsyncClient() as client:
-        try:
-            # JSON request body oluştur
-            request_data = {
-                "method": "Auto"
-            }
+    try:
+        # JSON request body oluştur
+        request_data = {
+            "method": "Auto"
+        }
+        
+        if DEBUG:
+            print(f"📤 Gönderilen JSON: {_pretty_json(request_data)}")
+        
+        response = await client.post(
+            "/soiltype/analyze/auto",
+            json=request_data,
+            timeout=30.0
+        )
+        
+        print(f"📊 HTTP Status: {response.status_code}")
+        
+        if response.status_code == 200:
+            result = orjson.loads(response.content)
+            print("✅ Başarılı!")
             
-            print(f"📤 Gönderilen JSON: {json.dumps(request_data, indent=2)}")
+            # Ham JSON response'u yazdır
+            print("\n📋 Ham JSON Response:")
+            print("=" * 50)
+            print(_pretty_json(result))
+            print("=" * 50)
             
-            response = await client.post(
-                "http://localhost:8000/soiltype/analyze/auto",
-                json=request_data,
-                timeout=30.0
-            )
+            # Özet bilgiler
+            print(f"\n📊 Özet Bilgiler:")
+            coords = result.get('coordinates', {})
+            print(f"   📍 Koordinatlar: Boylam={coords.get('longitude', 'N/A')}, Enlem={coords.get('latitude', 'N/A')}")
+            _print_classification(result)
             
-            print(f"📊 HTTP Status: {response.status_code}")
+        else:
+            print(f"❌ Hata: {response.status_code}")
+            print(f"📝 Hata Mesajı: {response.text}")
             
-            if response.status_code == 200:
-                result = response.json()
-                print("✅ Başarılı!")
-                
-                # Ham JSON response'u yazdır
-                print("\n📋 Ham JSON Response:")
-                print("=" * 50)
-                print(json.dumps(result, indent=2, ensure_ascii=False))
-                print("=" * 50)
-                
-                # Özet bilgiler
-                print(f"\n📊 Özet Bilgiler:")
-                coords = result.get('coordinates', {})
-                print(f"   📍 Koordinatlar: Boylam={coords.get('longitude', 'N/A')}, Enlem={coords.get('latitude', 'N/A')}")
-                print(f"   🆔 Soil ID: {result.get('soil_id', 'N/A')}")
-                
-                classification = result.get('classification', {})
-                print(f"   🌍 WRB4: {classification.get('wrb4_code', 'N/A')} - {classification.get('wrb4_description', 'N/A')}")
-                print(f"   🌍 WRB2: {classification.get('wrb2_code', 'N/A')} - {classification.get('wrb2_description', 'N/A')}")
-                print(f"   🌍 FAO90: {classification.get('fao90_code', 'N/A')}")
-                
-            else:
-                print(f"❌ Hata: {response.status_code}")
-                print(f"📝 Hata Mesajı: {response.text}")
-                
-        except httpx.TimeoutException:
-            print("⏰ Zaman aşımı!")
-        except httpx.ConnectError:
-            print("🔌 Bağlantı hatası! API çalışıyor mu?")
-        except Exception as e:
-            print(f"💥 Beklenmeyen hata: {e}")
+    except httpx.TimeoutException:
+        print("⏰ Zaman aşımı!")
+    except httpx.ConnectError:
+        print("🔌 Bağlantı hatası! API çalışıyor mu?")
+    except Exception as e:
+        print(f"💥 Beklenmeyen hata: {e}")
 
-async def test_turkey_points():
+async def test_turkey_points(client):
     """Türkiye noktaları üretme testi"""
     print(f"\n🇹🇷 Türkiye Noktaları Üretme Testi")
     print("-" * 50)
@@ -249,71 +298,183 @@ async def test_turkey_points():
     print(f"\n📍 Türkiye sınırları kontrol edilecek...")
     print(f"   (Shapefile'dan gerçek sınırlar kullanılacak)")
     
-    async with httpx.AsyncClient() as client:
-        try:
-            # URL parametrelerini hazırla
-            params = {"mode": mode, "save_to_file": True}
+    try:
+        # URL parametrelerini hazırla
+        params = {"mode": mode, "save_to_file": True}
+        
+        if mode == "grid":
+            params["lon_step"] = lon_step
+            params["lat_step"] = lat_step
+        else:
+            params["count"] = count
+        
+        print(f"📤 İstek parametreleri: {params}")
+        
+        response = await client.get(
+            "/soiltype/points/turkey",
+            params=params,
+            timeout=9000.0
+        )
+        
+        print(f"📊 HTTP Status: {response.status_code}")
+        
+        if response.status_code == 200:
+            result = orjson.loads(response.content)
+            print("✅ Başarılı!")
             
-            if mode == "grid":
-                params["lon_step"] = lon_step
-                params["lat_step"] = lat_step
-            else:
-                params["count"] = count
+            # Ham JSON response'u yazdır (büyük yanıtlarda yalnızca istenirse)
+            total_points = result.get('total_points') or 0
+            if total_points <= RAW_JSON_MAX_POINTS or input(
+                f"\n📋 {total_points} noktalık ham JSON yazdırılsın mı? (e/h): "
+            ).strip().lower() == 'e':
+                print("\n📋 Ham JSON Response:")
+                print("=" * 50)
+                _write_json_stream(result)
+                print("=" * 50)
             
-            print(f"📤 İstek parametreleri: {params}")
+            # Özet bilgiler
+            print(f"\n📊 Özet Bilgiler:")
+            print(f"   🎯 Mod: {result.get('mode', 'N/A')}")
+            print(f"   📍 Toplam Nokta: {result.get('total_points', 'N/A')}")
+            print(f"   💾 Dosya Kaydedildi: {'Evet' if result.get('file_saved', False) else 'Hayır'}")
+            if result.get('file_path'):
+                print(f"   📁 Dosya Yolu: {result.get('file_path')}")
             
-            response = await client.get(
-                "http://localhost:8000/soiltype/points/turkey",
-                params=params,
-                timeout=9000.0
-            )
+            # İlk 5 noktayı göster
+            points = result.get('points', [])
+            if points:
+                print(f"\n📍 İlk 5 Nokta:")
+                for i, point in enumerate(points[:5]):
+                    city_info = f" - {point.get('city', 'Şehir bilgisi yok')}" if point.get('city') else " - Şehir bilgisi yok"
+                    print(f"   {i+1}. Boylam: {point.get('longitude')}, Enlem: {point.get('latitude')}{city_info}")
+                if len(points) > 5:
+                    print(f"   ... ve {len(points) - 5} nokta daha")
             
-            print(f"📊 HTTP Status: {response.status_code}")
+            # CSV dosyası bilgisi
+            if result.get('csv_file_path'):
+                print(f"   📊 CSV Dosyası: {result.get('csv_file_path')}")
             
-            if response.status_code == 200:
-                result = response.json()
-                print("✅ Başarılı!")
-                
-                # Ham JSON response'u yazdır
-                print("\n📋 Ham JSON Response:")
-                print("=" * 50)
-                print(json.dumps(result, indent=2, ensure_ascii=False))
-                print("=" * 50)
-                
-                # Özet bilgiler
-                print(f"\n📊 Özet Bilgiler:")
-                print(f"   🎯 Mod: {result.get('mode', 'N/A')}")
-                print(f"   📍 Toplam Nokta: {result.get('total_points', 'N/A')}")
-                print(f"   💾 Dosya Kaydedildi: {'Evet' if result.get('file_saved', False) else 'Hayır'}")
-                if result.get('file_path'):
-                    print(f"   📁 Dosya Yolu: {result.get('file_path')}")
-                
-                # İlk 5 noktayı göster
-                points = result.get('points', [])
-                if points:
-                    print(f"\n📍 İlk 5 Nokta:")
-                    for i, point in enumerate(points[:5]):
-                        city_info = f" - {point.get('city', 'Şehir bilgisi yok')}" if point.get('city') else " - Şehir bilgisi yok"
-                        print(f"   {i+1}. Boylam: {point.get('longitude')}, Enlem: {point.get('latitude')}{city_info}")
-                    if len(points) > 5:
-                        print(f"   ... ve {len(points) - 5} nokta daha")
-                
-                # CSV dosyası bilgisi
-                if result.get('csv_file_path'):
-                    print(f"   📊 CSV Dosyası: {result.get('csv_file_path')}")
-                
-            else:
-                print(f"❌ Hata: {response.status_code}")
-                print(f"📝 Hata Mesajı: {response.text}")
-                
-        except httpx.TimeoutException:
-            print("⏰ Zaman aşımı!")
-        except httpx.ConnectError:
-            print("🔌 Bağlantı hatası! API çalışıyor mu?")
-        except Exception as e:
-            print(f"💥 Beklenmeyen hata: {e}")
+            if points and input(f"\n🔬 {len(points)} nokta için toprak analizi yapılsın mı? (e/h): ").strip().lower() == 'e':
+                await analyze_turkey_points(client, points)
+            
+        else:
+            print(f"❌ Hata: {response.status_code}")
+            print(f"📝 Hata Mesajı: {response.text}")
+            
+    except httpx.TimeoutException:
+        print("⏰ Zaman aşımı!")
+    except httpx.ConnectError:
+        print("🔌 Bağlantı hatası! API çalışıyor mu?")
+    except Exception as e:
+        print(f"💥 Beklenmeyen hata: {e}")
+
+def read_points_csv(csv_file_path):
+    """longitude,latitude,city CSV'sini (ilk satır başlık) (boylam, enlem, şehir) listesine oku"""
+    points = []
+    with open(csv_file_path, 'r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for record in reader:
+            if len(record) < 2:
+                continue
+            try:
+                longitude, latitude = float(record[0]), float(record[1])
+            except ValueError:
+                continue
+            points.append((longitude, latitude, record[2] if len(record) > 2 else ''))
+    return points
+
+async def analyze_points(client, points, workers=ANALYZE_WORKERS):
+    """
+    Noktaları eşzamanlı POST /soiltype/analyze istekleriyle analiz et
+    
+    Aynı anda en fazla `workers` istek açık tutulur; sonuçlar girdi sırasıyla
+    ((boylam, enlem, şehir), yanıt veya None) olarak döner.
+    """
+    semaphore = asyncio.Semaphore(workers)
+    
+    async def analyze_one(point):
+        longitude, latitude, _ = point
+        async with semaphore:
+            try:
+                response = await client.post(
+                    "/soiltype/analyze",
+                    json={"method": "Manual", "longitude": longitude, "latitude": latitude},
+                    timeout=30.0
+                )
+            except httpx.HTTPError:
+                return point, None
+        if response.status_code != 200:
+            return point, None
+        return point, orjson.loads(response.content)
+    
+    return await asyncio.gather(*(analyze_one(point) for point in points))
 
-async def test_csv_analysis():
+def write_analysis_csv(output_path, results):
+    """analyze_points sonuçlarını CSV'ye yaz (başarısız noktalar atlanır), yazılan satır sayısını döndür"""
+    columns = ['longitude', 'latitude', 'city', 'soil_id', 'wrb4_code', 'wrb4_description',
+               'wrb2_code', 'wrb2_description', 'fao90_code']
+    rows = []
+    for (longitude, latitude, city), result in results:
+        if result is None:
+            continue
+        row = {'longitude': longitude, 'latitude': latitude, 'city': city, 'soil_id': result.get('soil_id')}
+        row.update(result.get('classification', {}))
+        for field in PROPERTY_FIELDS:
+            prefix = field.split('_', 1)[0]
+            for prop in result.get(field, []):
+                column = f"{prefix}_{prop['name'].lower().replace(' ', '_')}"
+                if column not in columns:
+                    columns.append(column)
+                row[column] = prop['value']
+        rows.append(row)
+    
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, restval='', extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
+
+async def analyze_turkey_points(client, points):
+    """Üretilen Türkiye noktalarını eşzamanlı analiz edip sonuçları CSV'ye yaz"""
+    point_list = [(p.get('longitude'), p.get('latitude'), p.get('city') or '') for p in points]
+    print(f"📤 {len(point_list)} nokta, {TURKEY_ANALYZE_WORKERS} eşzamanlı istekle analiz ediliyor...")
+    results = await analyze_points(client, point_list, workers=TURKEY_ANALYZE_WORKERS)
+    
+    output_path = f"turkey_points_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    successful = write_analysis_csv(output_path, results)
+    print(f"   ✅ Başarılı Analiz: {successful}")
+    print(f"   ❌ Başarısız Analiz: {len(point_list) - successful}")
+    print(f"   📁 Sonuç Dosyası: {os.path.abspath(output_path)}")
+
+async def test_csv_analysis_concurrent(client, csv_file_path):
+    """CSV noktalarını istemci tarafında eşzamanlı /soiltype/analyze istekleriyle analiz et"""
+    try:
+        points = read_points_csv(csv_file_path)
+    except OSError as e:
+        print(f"❌ Dosya okunamadı: {e}")
+        return
+    
+    if not points:
+        print("❌ CSV'de geçerli koordinat bulunamadı!")
+        return
+    
+    print(f"📤 {len(points)} nokta, {ANALYZE_WORKERS} eşzamanlı istekle analiz ediliyor...")
+    results = await analyze_points(client, points)
+    
+    output_path = os.path.join(
+        os.path.dirname(os.path.abspath(csv_file_path)),
+        f"soil_analysis_results_client_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    )
+    successful = write_analysis_csv(output_path, results)
+    
+    print(f"\n📊 Özet Bilgiler:")
+    print(f"   📍 Toplam İşlenen: {len(points)}")
+    print(f"   ✅ Başarılı Analiz: {successful}")
+    print(f"   ❌ Başarısız Analiz: {len(points) - successful}")
+    print(f"   📁 Sonuç Dosyası: {output_path}")
+
+async def test_csv_analysis(client):
     """CSV'den toplu toprak analizi testi"""
     print(f"\n📊 CSV'den Toplu Toprak Analizi Testi")
     print("-" * 50)
@@ -325,83 +486,88 @@ async def test_csv_analysis():
         print("❌ Dosya yolu boş olamaz!")
         return
     
-    async with httpx.AsyncClient() as client:
-        try:
-            print(f"📤 İşlenen dosya: {csv_file_path}")
-            print("⏳ Analiz başlıyor... (Bu işlem uzun sürebilir)")
+    print("Analiz yöntemi:")
+    print("1. Sunucu tarafında (POST /soiltype/analyze/csv)")
+    print("2. İstemci tarafında eşzamanlı (POST /soiltype/analyze)")
+    if input("Seçiminiz (1-2, varsayılan 1): ").strip() == "2":
+        await test_csv_analysis_concurrent(client, csv_file_path)
+        return
+    
+    try:
+        print(f"📤 İşlenen dosya: {csv_file_path}")
+        print("⏳ Analiz başlıyor... (Bu işlem uzun sürebilir)")
+        
+        response = await client.post(
+            "/soiltype/analyze/csv",
+            params={"csv_file_path": csv_file_path},
+            timeout=1800.0  # 30 dakika timeout
+        )
+        
+        print(f"📊 HTTP Status: {response.status_code}")
+        
+        if response.status_code == 200:
+            result = orjson.loads(response.content)
+            print("✅ Başarılı!")
             
-            response = await client.post(
-                "http://localhost:8000/soiltype/analyze/csv",
-                params={"csv_file_path": csv_file_path},
-                timeout=1800.0  # 30 dakika timeout
-            )
+            # Ham JSON response'u yazdır
+            print("\n📋 Ham JSON Response:")
+            print("=" * 50)
+            print(_pretty_json(result))
+            print("=" * 50)
             
-            print(f"📊 HTTP Status: {response.status_code}")
+            # Özet bilgiler
+            print(f"\n📊 Özet Bilgiler:")
+            print(f"   📍 Toplam İşlenen: {result.get('total_processed', 'N/A')}")
+            print(f"   ✅ Başarılı Analiz: {result.get('successful_analyses', 'N/A')}")
+            print(f"   ❌ Başarısız Analiz: {result.get('failed_analyses', 'N/A')}")
             
-            if response.status_code == 200:
-                result = response.json()
-                print("✅ Başarılı!")
-                
-                # Ham JSON response'u yazdır
-                print("\n📋 Ham JSON Response:")
-                print("=" * 50)
-                print(json.dumps(result, indent=2, ensure_ascii=False))
-                print("=" * 50)
-                
-                # Özet bilgiler
-                print(f"\n📊 Özet Bilgiler:")
-                print(f"   📍 Toplam İşlenen: {result.get('total_processed', 'N/A')}")
-                print(f"   ✅ Başarılı Analiz: {result.get('successful_analyses', 'N/A')}")
-                print(f"   ❌ Başarısız Analiz: {result.get('failed_analyses', 'N/A')}")
-                
-                if result.get('csv_file_path'):
-                    print(f"   📁 Sonuç Dosyası: {result.get('csv_file_path')}")
-                
-            else:
-                print(f"❌ Hata: {response.status_code}")
-                print(f"📝 Hata Mesajı: {response.text}")
-                
-        except httpx.TimeoutException:
-            print("⏰ Zaman aşımı! (30 dakika)")
-        except httpx.ConnectError:
-            print("🔌 Bağlantı hatası! API çalışıyor mu?")
-        except Exception as e:
-            print(f"💥 Beklenmeyen hata: {e}")
+            if result.get('csv_file_path'):
+                print(f"   📁 Sonuç Dosyası: {result.get('csv_file_path')}")
+            
+        else:
+            print(f"❌ Hata: {response.status_code}")
+            print(f"📝 Hata Mesajı: {response.text}")
+            
+    except httpx.TimeoutException:
+        print("⏰ Zaman aşımı! (30 dakika)")
+    except httpx.ConnectError:
+        print("🔌 Bağlantı hatası! API çalışıyor mu?")
+    except Exception as e:
+        print(f"💥 Beklenmeyen hata: {e}")
 
-async def test_health_check():
+async def test_health_check(client):
     """Sağlık kontrolü testi"""
     print("🏥 Sağlık Kontrolü")
     print("-" * 30)
     
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get("http://localhost:8000/soiltype/health", timeout=10.0)
-            
-            if response.status_code == 200:
-                result = response.json()
-                print("✅ API sağlıklı!")
-                print(f"📊 Status: {result.get('status', 'N/A')}")
-                print(f"🕒 Timestamp: {result.get('timestamp', 'N/A')}")
-                return True
-            else:
-                print(f"❌ Hata: {response.status_code}")
-                print(f"📝 Mesaj: {response.text}")
-                return False
-                
-        except httpx.ConnectError:
-            print("🔌 Bağlantı hatası! API çalışıyor mu?")
-            return False
-        except Exception as e:
-            print(f"💥 Beklenmeyen hata: {e}")
+    try:
+        response = await client.get("/soiltype/health", timeout=10.0)
+        
+        if response.status_code == 200:
+            result = orjson.loads(response.content)
+            print("✅ API sağlıklı!")
+            print(f"📊 Status: {result.get('status', 'N/A')}")
+            print(f"🕒 Timestamp: {result.get('timestamp', 'N/A')}")
+            return True
+        else:
+            print(f"❌ Hata: {response.status_code}")
+            print(f"📝 Mesaj: {response.text}")
             return False
+            
+    except httpx.ConnectError:
+        print("🔌 Bağlantı hatası! API çalışıyor mu?")
+        return False
+    except Exception as e:
+        print(f"💥 Beklenmeyen hata: {e}")
+        return False
 
-async def main():
-    """Ana test fonksiyonu"""
+async def run_tests(client: httpx.AsyncClient):
+    """Ana test döngüsü (tüm istekler aynı istemciyi kullanır)"""
     print("🌍 Soil Analysis API Interactive Test Suite")
     print("=" * 60)
     
     # Sağlık kontrolü
-    health_ok = await test_health_check()
+    health_ok = await test_health_check(client)
     if not health_ok:
         print("\n❌ API çalışmıyor! Lütfen API'yi başlatın.")
         return
@@ -412,22 +578,22 @@ async def main():
         if choice == "manual":
             longitude, latitude = get_manual_coordinates()
             if longitude is not None and latitude is not None:
-                await test_manual_analysis(longitude, latitude)
+                await test_manual_analysis(client, longitude, latitude)
             else:
                 print("❌ Geçersiz koordinatlar!")
                 
         elif choice == "auto":
-            longitude, latitude = get_automatic_coordinates()
+            longitude, latitude = await get_automatic_coordinates(client)
             if longitude is not None and latitude is not None:
-                await test_auto_analysis()
+                await test_auto_analysis(client)
             else:
                 print("❌ Otomatik konum tespiti başarısız!")
                 
         elif choice == "turkey_points":
-            await test_turkey_points()
+            await test_turkey_points(client)
                 
         elif choice == "csv_analysis":
-            await test_csv_analysis()
+            await test_csv_analysis(client)
                 
         elif choice == "exit":
             print("\n👋 Çıkış yapılıyor...")
@@ -443,5 +609,14 @@ async def main():
             print("\n👋 Test tamamlandı!")
             break
 
+async def main():
+    """Ana test fonksiyonu - tek bağlantı havuzu açıp testleri çalıştırır"""
+    async with httpx.AsyncClient(
+        base_url=API_BASE_URL,
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=1000),
+        timeout=httpx.Timeout(30.0, connect=5.0)
+    ) as client:
+        await run_tests(client)
+
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
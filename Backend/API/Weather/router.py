@@ -1,65 +1,234 @@
 # Weather router - hava durumu API endpoint'leri
 
-import requests
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel, Field, field_validator
-import re
-from typing import Optional
-import geocoder
+import httpx
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator, model_validator
+import asyncio
+import ipaddress
+import random
+import time
+from collections import OrderedDict, deque
+from itertools import repeat
+from types import MappingProxyType
+from urllib.parse import urlencode
+from typing import Any, Dict, Literal, Optional
 import logging
 from datetime import date,datetime,timedelta
 
-router = APIRouter(prefix="/weather", tags=["Weather"])
+router = APIRouter(prefix="/weather", tags=["Weather"], default_response_class=ORJSONResponse)
 
 
-# Logging konfigürasyonu
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Logging konfigürasyonu uygulama (main.py) tarafından yapılır
 logger = logging.getLogger(__name__)
 
+# HTTP/2 desteği için h2 paketi gerekir (httpx[http2]); yoksa HTTP/1.1 kullanılır
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Open-Meteo istekleri için paylaşılan bağlantı havuzu (ilk istekte kurulur, kapanışta kapatılır)
+_weather_client: Optional[httpx.AsyncClient] = None
+
+def get_weather_client() -> httpx.AsyncClient:
+    """Paylaşılan httpx istemcisini döndür (FastAPI dependency)"""
+    global _weather_client
+    if _weather_client is None or _weather_client.is_closed:
+        # HTTP/2 ile eşzamanlı Open-Meteo istekleri tek TLS bağlantısı üzerinden çoğullanır
+        _weather_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60),
+            timeout=httpx.Timeout(5.0, connect=2.0)
+        )
+    return _weather_client
+
+# Open-Meteo yanıt önbelleği: (tür, enlem, boylam (2 hane), ...) -> (son geçerlilik, ham JSON)
+# Süre türe göre: tahminler saatlik güncellenir, arşiv verisi değişmez
+WEATHER_CACHE_TTLS = MappingProxyType({
+    "hourly": 600,
+    "hourly_batch": 600,
+    "combined": 600,
+    "daily": 1800,
+    "archive": 86400,
+})
+WEATHER_CACHE_SIZE = 1024
+_weather_cache: "OrderedDict[tuple, tuple[float, Dict[str, Any]]]" = OrderedDict()
+_weather_cache_lock = asyncio.Lock()
+
+# Aynı anahtar için süren Open-Meteo istekleri: önbellek boşken eşzamanlı gelen
+# istekler yeni istek atmak yerine ilk isteğin sonucunu bekler (single-flight)
+_inflight: "Dict[tuple, asyncio.Task]" = {}
+
+# Geçici Open-Meteo hatalarında (ağ hatası / 5xx) üstel bekleme ile tekrar deneme
+OPEN_METEO_ATTEMPTS = 3
+OPEN_METEO_RETRY_DELAY = 0.2  # ilk bekleme (saniye), her denemede iki katına çıkar
+OPEN_METEO_RETRY_MAX_DELAY = 2.0
+
+# Devre kesici: CIRCUIT_WINDOW saniyede CIRCUIT_FAIL_THRESHOLD'dan fazla başarısız istek olursa
+# Open-Meteo CIRCUIT_OPEN_SECONDS boyunca hiç çağrılmaz
+CIRCUIT_FAIL_THRESHOLD = 5
+CIRCUIT_WINDOW = 60.0
+CIRCUIT_OPEN_SECONDS = 30.0
+_open_meteo_failures: "deque[float]" = deque()
+_circuit_open_until = 0.0
+
+def _record_open_meteo_failure():
+    """Başarısız isteği kaydet, eşik aşıldıysa devreyi aç"""
+    global _circuit_open_until
+    now = time.monotonic()
+    _open_meteo_failures.append(now)
+    while _open_meteo_failures and _open_meteo_failures[0] < now - CIRCUIT_WINDOW:
+        _open_meteo_failures.popleft()
+    if len(_open_meteo_failures) > CIRCUIT_FAIL_THRESHOLD:
+        _circuit_open_until = now + CIRCUIT_OPEN_SECONDS
+        _open_meteo_failures.clear()
+        logger.warning("Open-Meteo circuit opened for %.0f s", CIRCUIT_OPEN_SECONDS)
+
+async def _get_with_retry(client: httpx.AsyncClient, url: str) -> httpx.Response:
+    """GET isteğini ağ hatası ve 5xx yanıtlarda üstel bekleme + jitter ile tekrarla (4xx hemen yükselir)"""
+    delay = OPEN_METEO_RETRY_DELAY
+    for attempt in range(OPEN_METEO_ATTEMPTS):
+        try:
+            response = await client.get(url)
+            response.raise_for_status()
+            return response
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code < 500 or attempt == OPEN_METEO_ATTEMPTS - 1:
+                raise
+        except httpx.RequestError:
+            if attempt == OPEN_METEO_ATTEMPTS - 1:
+                raise
+        await asyncio.sleep(delay + random.uniform(0, delay))
+        delay = min(delay * 2, OPEN_METEO_RETRY_MAX_DELAY)
+
+async def _fetch_json(client: httpx.AsyncClient, url: str, cache_key: tuple) -> Optional[Dict[str, Any]]:
+    """
+    Open-Meteo JSON yanıtını al; süresi dolmamış önbellek kaydı varsa ağa gitmeden döndür
+    
+    Open-Meteo'ya ulaşılamazsa (ağ hatası, 5xx ya da açık devre) aynı anahtarın süresi
+    dolmuş son başarılı yanıtı döndürülür. Böyle bir kayıt yoksa HTTP hataları
+    (tekrar denemeler tükendikten sonra) httpx.HTTPError olarak yükselir, devre açıksa None döner.
+    """
+    async with _weather_cache_lock:
+        cached = _weather_cache.get(cache_key)
+        if cached is not None and cached[0] > time.monotonic():
+            _weather_cache.move_to_end(cache_key)
+            return cached[1]
+    stale = cached[1] if cached is not None else None
+    
+    if time.monotonic() < _circuit_open_until:
+        if stale is not None:
+            logger.warning("Open-Meteo circuit open, serving stale %s data", cache_key[0])
+        return stale
+    
+    task = _inflight.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_and_cache(client, url, cache_key, stale))
+        _inflight[cache_key] = task
+        task.add_done_callback(lambda _: _inflight.pop(cache_key, None))
+    # shield: bekleyenlerden birinin iptali ortak isteği diğerleri için iptal etmez
+    return await asyncio.shield(task)
+
+async def _fetch_and_cache(client: httpx.AsyncClient, url: str, cache_key: tuple, stale: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Open-Meteo'ya isteği at, başarılı yanıtı önbelleğe yaz (hata durumunda varsa eski yanıtı döndür)"""
+    # 4xx/5xx yanıtlar gövde ayrıştırılmadan httpx.HTTPStatusError olarak yükselir
+    try:
+        response = await _get_with_retry(client, url)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code < 500:
+            raise
+        _record_open_meteo_failure()
+        if stale is None:
+            raise
+        logger.warning("Open-Meteo returned %s, serving stale %s data", e.response.status_code, cache_key[0])
+        return stale
+    except httpx.RequestError as e:
+        _record_open_meteo_failure()
+        if stale is None:
+            raise
+        logger.warning("Open-Meteo unreachable (%s), serving stale %s data", e, cache_key[0])
+        return stale
+    data = orjson.loads(response.content)
+    
+    # Yalnızca başarılı yanıtlar saklanır; boyut aşılınca en eski kayıt atılır
+    async with _weather_cache_lock:
+        _weather_cache[cache_key] = (time.monotonic() + WEATHER_CACHE_TTLS[cache_key[0]], data)
+        _weather_cache.move_to_end(cache_key)
+        while len(_weather_cache) > WEATHER_CACHE_SIZE:
+            _weather_cache.popitem(last=False)
+    return data
+
+@router.on_event("shutdown")
+async def close_weather_client():
+    """Uygulama kapanırken paylaşılan httpx istemcisini kapat"""
+    global _weather_client
+    if _weather_client is not None:
+        await _weather_client.aclose()
+        _weather_client = None
+
 # Pydantic modelleri
+# Doğrulama pydantic-core tarafında yapılır (strict: "32.5" gibi metinler sayıya çevrilmez);
+# yalnızca method yazımı Literal kontrolünden önce normalize edilir
+def _normalize_method(v):
+    """"manual", "AUTO" gibi yazımları "Manual" / "Auto" biçimine çevir (Soil router ile aynı kural)"""
+    return v.title() if isinstance(v, str) else v
+
 class ManualRequest(BaseModel):
     """Manuel koordinat girişi için model"""
-    method: str = Field(..., description="Method type", example="Manual")
+    model_config = ConfigDict(strict=True)
+    
+    method: Literal["Manual"] = Field(..., description="Method type", example="Manual")
     longitude: float = Field(..., ge=-180, le=180, description="Boylam (-180 ile 180 arası)")
     latitude: float = Field(..., ge=-90, le=90, description="Enlem (-90 ile 90 arası)")
     
-    @field_validator('method')
+    @field_validator('method', mode='before')
     @classmethod
-    def validate_method(cls, v):
-        if v.lower() != 'manual':
-            raise ValueError('Method must be "Manual" for manual coordinates')
-        return v.title()
+    def normalize_method(cls, v):
+        return _normalize_method(v)
+
+class Location(BaseModel):
+    """Toplu istekteki tek bir koordinat"""
+    model_config = ConfigDict(strict=True)
     
-    @field_validator('longitude', 'latitude')
+    longitude: float = Field(..., ge=-180, le=180, description="Boylam (-180 ile 180 arası)")
+    latitude: float = Field(..., ge=-90, le=90, description="Enlem (-90 ile 90 arası)")
+
+# Tek Open-Meteo isteğinde sorulabilecek en fazla konum (URL uzunluğu sınırlı kalsın)
+BATCH_MAX_LOCATIONS = 50
+
+class BatchRequest(BaseModel):
+    """Birden çok manuel koordinat için model (ör. birden çok tarlası olan çiftlik)"""
+    model_config = ConfigDict(strict=True)
+    
+    method: Literal["Manual"] = Field(..., description="Method type", example="Manual")
+    locations: list[Location] = Field(..., min_length=1, max_length=BATCH_MAX_LOCATIONS, description="Koordinat listesi")
+    
+    @field_validator('method', mode='before')
     @classmethod
-    def validate_coordinates(cls, v):
-        """Koordinat değerlerini doğrula ve güvenlik kontrolü yap"""
-        if not isinstance(v, (int, float)):
-            raise ValueError('Coordinates must be numeric')
-        
-        # SQL injection koruması - sadece sayısal değerlere izin ver
-        if re.search(r'[^0-9.\-]', str(v)):
-            raise ValueError('Invalid coordinate format - only numbers, dots and minus allowed')
-        
-        return float(v)
+    def normalize_method(cls, v):
+        return _normalize_method(v)
+
+# Saatlik yanıt biçimi (rows: saat başına kayıt, columns: Open-Meteo'nun alan başına dizileri)
+HourlyLayout = Literal["rows", "columns"]
 
 class AutoRequest(BaseModel):
     """Otomatik konum tespiti için model"""
-    method: str = Field(..., description="Method type", example="Auto")
+    model_config = ConfigDict(strict=True)
+    
+    method: Literal["Auto"] = Field(..., description="Method type", example="Auto")
     day: int = Field(1, ge=1, le=16, description="Gün sayısı (1-16 arası)", example=1)
     
-    @field_validator('method')
+    @field_validator('method', mode='before')
     @classmethod
-    def validate_method(cls, v):
-        if v.lower() != 'auto':
-            raise ValueError('Method must be "Auto" for automatic location detection')
-        return v.title()
+    def normalize_method(cls, v):
+        return _normalize_method(v)
     
 #API'de kullanılan WMO kodlarının Türkçe açıklamaları
-WMO_CODES_TR = {
+WMO_CODES_TR = MappingProxyType({
     0: "Açık",
     1: "Az Bulutlu",
     2: "Parçalı Bulutlu",
@@ -88,343 +257,391 @@ WMO_CODES_TR = {
     95: "Gök Gürültülü Fırtına",
     96: "Gök Gürültülü Fırtına (Hafif Dolu)",
     99: "Gök Gürültülü Fırtına (Şiddetli Dolu)"
-}
+})
 
-def _validate_dates(start_date: date, end_date: date):
-    if start_date > end_date:
-        raise HTTPException(status_code=400, detail="start_date must be <= end_date")
-    
-    if end_date > date.today() + timedelta(days=16):  # örnek: gelecekte çok ileri tarihleri engelle
-        raise HTTPException(status_code=400, detail="end_date too far in the future")
+def _translate_weather_codes(codes) -> list:
+    """WMO kod listesini Türkçe açıklamalara çevir (sözlük aramaları map ile C seviyesinde yapılır)"""
+    return list(map(WMO_CODES_TR.get, codes, repeat("Bilinmeyen")))
+
+class DateRange(BaseModel):
+    """Arşiv sorguları için tarih aralığı (aralık kontrolü pydantic model doğrulamasında yapılır)"""
+    start_date: date
+    end_date: date
     
+    @model_validator(mode="after")
+    def check_range(self):
+        if self.start_date > self.end_date:
+            raise ValueError("start_date must be <= end_date")
+        if self.end_date > date.today() + timedelta(days=16):  # gelecekte çok ileri tarihleri engelle
+            raise ValueError("end_date too far in the future")
+        return self
+
+def get_date_range(start_date: date, end_date: date) -> DateRange:
+    """Path'teki tarihleri DateRange ile doğrula; hatalı aralık handler'a girmeden 422 döner (FastAPI dependency)"""
+    try:
+        return DateRange(start_date=start_date, end_date=end_date)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("path", *error["loc"])} for error in e.errors(include_url=False, include_context=False)]
+        )
+
+# IP tabanlı konum servisi (paylaşılan httpx istemcisiyle event loop'u bloklamadan çağrılır)
+IP_LOCATION_URL = "http://ip-api.com/json/"
+
+# İstemci IP'si -> (son geçerlilik, boylam, enlem); bir IP'nin konumu dakikalarca değişmez
+IP_LOCATION_TTL = 600  # saniye
+IP_LOCATION_CACHE_SIZE = 4096
+_ip_location_cache: "OrderedDict[str, tuple[float, float, float]]" = OrderedDict()
 
-def get_automatic_coordinates() -> tuple[Optional[float], Optional[float]]:
+def _public_ip(ip: Optional[str]) -> str:
+    """Yerel/özel ağ adreslerinde boş döner (ip-api sunucunun kendi IP'sini kullanır)"""
+    try:
+        return ip if ip and ipaddress.ip_address(ip).is_global else ""
+    except ValueError:
+        return ""
+
+async def get_automatic_coordinates(client: httpx.AsyncClient, ip: Optional[str] = None) -> tuple[Optional[float], Optional[float]]:
     """
     IP adresinden otomatik konum tespiti
     
+    Args:
+        ip: İstemci IP adresi; verilmezse ya da yerel ağ adresiyse sunucunun IP'si kullanılır
+    
     Returns:
         (longitude, latitude) tuple veya (None, None)
         
     Raises:
         Exception: Konum tespit hatası
     """
+    ip = _public_ip(ip)
+    cached = _ip_location_cache.get(ip)
+    if cached is not None and cached[0] > time.monotonic():
+        _ip_location_cache.move_to_end(ip)
+        return cached[1], cached[2]
+    
     try:
         logger.info("Attempting automatic location detection...")
-        g = geocoder.ip('me')
+        response = await client.get(f"{IP_LOCATION_URL}{ip}", timeout=5.0)
+        location = orjson.loads(response.content) if response.status_code == 200 else {}
         
-        if g.ok:
-            lat, lon = g.latlng
-            logger.info(f"Location detected: Lat={lat}, Lon={lon}")
+        if location.get("status") == "success":
+            lat, lon = location.get("lat"), location.get("lon")
+            logger.info("Location detected: Lat=%s, Lon=%s", lat, lon)
+            # Yalnızca başarılı tespitler saklanır; boyut aşılınca en eski kayıt atılır
+            _ip_location_cache[ip] = (time.monotonic() + IP_LOCATION_TTL, lon, lat)
+            _ip_location_cache.move_to_end(ip)
+            while len(_ip_location_cache) > IP_LOCATION_CACHE_SIZE:
+                _ip_location_cache.popitem(last=False)
             return lon, lat
         else:
             logger.warning("Automatic location detection failed")
             return None, None
             
     except Exception as e:
-        logger.error(f"Error in automatic location detection: {str(e)}")
+        logger.error("Error in automatic location detection: %s", e)
         raise Exception(f"Location detection error: {str(e)}")
         
-def get_hourly_Data(latitude, longitude,day=1):
-    url = "https://api.open-meteo.com/v1/forecast"
-    params = {
-        "latitude": latitude,
-        "longitude": longitude,
-        "hourly": "precipitation,temperature_2m,relative_humidity_2m,apparent_temperature,soil_moisture_0_to_1cm,soil_moisture_1_to_3cm,soil_moisture_3_to_9cm,soil_moisture_9_to_27cm,soil_moisture_27_to_81cm,soil_temperature_0cm,soil_temperature_6cm,soil_temperature_18cm,soil_temperature_54cm,cape,precipitation_probability,rain,snowfall,snow_depth,wind_direction_10m,wind_speed_10m,wind_gusts_10m,weather_code,showers",
-        "timezone": "auto",
-        "forecast_days": day
+# Open-Meteo uç noktaları
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+
+# Koordinatlar 0.01° ızgaraya yuvarlanır (~1 km, tahmin modelinin çözünürlüğünden ince):
+# yakın konumlar aynı önbellek anahtarını ve aynı Open-Meteo isteğini paylaşır
+def _grid(latitude, longitude):
+    return round(latitude, 2), round(longitude, 2)
+
+# Saatlik tahmin isteğinin sabit sorgu metni bir kez kodlanır (istek başına yalnızca koordinat ve gün eklenir)
+HOURLY_VARIABLES = "precipitation,temperature_2m,relative_humidity_2m,apparent_temperature,soil_moisture_0_to_1cm,soil_moisture_1_to_3cm,soil_moisture_3_to_9cm,soil_moisture_9_to_27cm,soil_moisture_27_to_81cm,soil_temperature_0cm,soil_temperature_6cm,soil_temperature_18cm,soil_temperature_54cm,cape,precipitation_probability,rain,snowfall,snow_depth,wind_direction_10m,wind_speed_10m,wind_gusts_10m,weather_code,showers"
+_HOURLY_URL = f"{FORECAST_URL}?{urlencode({'hourly': HOURLY_VARIABLES, 'timezone': 'auto'})}"
+
+# Saatlik kayıtlarda "time" alanından sonra sırasıyla yer alan Open-Meteo alanları (weather_code en sonda eklenir)
+HOURLY_ROW_FIELDS = (
+    "precipitation", "temperature_2m", "wind_direction_10m", "wind_speed_10m", "wind_gusts_10m",
+    "relative_humidity_2m", "apparent_temperature",
+    "soil_moisture_0_to_1cm", "soil_moisture_1_to_3cm", "soil_moisture_3_to_9cm",
+    "soil_moisture_9_to_27cm", "soil_moisture_27_to_81cm",
+    "soil_temperature_0cm", "soil_temperature_6cm", "soil_temperature_18cm", "soil_temperature_54cm",
+    "precipitation_probability", "rain", "snowfall", "showers", "snow_depth", "cape"
+)
+
+def _build_hourly_rows(data, latitude, longitude):
+    """
+    Open-Meteo saatlik yanıtını saat başına kayıtlara çevir
+    
+    Koordinatlar kayıtlara tekrar tekrar eklenmez, yanıtta bir kez yer alır;
+    saat listesi yoksa None döner.
+    """
+    hourly = data.get("hourly") or {}
+    time_data = hourly.get("time") or []
+    if not time_data:
+        return None
+    
+    columns = [(name, hourly.get(name) or []) for name in HOURLY_ROW_FIELDS]
+    columns.append(("weather_code", _translate_weather_codes(hourly.get("weather_code") or [])))
+
+    data_by_time = []
+    for i, t in enumerate(time_data):
+        # güvenli indeksleme ile her zaman tek bir zaman nesnesi oluştur
+        entry = {"time": t}
+        for name, values in columns:
+            entry[name] = values[i] if i < len(values) else None
+        data_by_time.append(entry)
+    return {
+        "coordinates": {"longitude": longitude, "latitude": latitude},
+        "hours": data_by_time
     }
 
-    try: 
-        response = requests.get(url, params=params)
-        if response.status_code==200:
-            data = response.json()
-
-            temperature_data = data.get("hourly").get("temperature_2m", [])
-            soil_temperature_0cm_data = data.get("hourly").get("soil_temperature_0cm", [])
-            soil_temperature_6cm_data = data.get("hourly").get("soil_temperature_6cm", [])
-            soil_temperature_18cm_data = data.get("hourly").get("soil_temperature_18cm", [])
-            soil_temperature_54cm_data = data.get("hourly").get("soil_temperature_54cm", [])
-            soil_moisture_0_to_1cm_data = data.get("hourly").get("soil_moisture_0_to_1cm", [])
-            soil_moisture_1_to_3cm_data = data.get("hourly").get("soil_moisture_1_to_3cm", [])
-            soil_moisture_3_to_9cm_data = data.get("hourly").get("soil_moisture_3_to_9cm", [])
-            soil_moisture_9_to_27cm_data = data.get("hourly").get("soil_moisture_9_to_27cm", [])
-            soil_moisture_27_to_81cm_data = data.get("hourly").get("soil_moisture_27_to_81cm", [])
-            apparent_temperature_data = data.get("hourly").get("apparent_temperature", [])
-            rainfall_data = data.get("hourly").get("precipitation", [])
-            rain_data= data.get("hourly").get("rain", [])
-            precipitation_probability_data = data.get("hourly").get("precipitation_probability", [])
-            relative_humidity_2m_data = data.get("hourly").get("relative_humidity_2m", [])
-            snowfall_data = data.get("hourly").get("snowfall", [])
-            snow_depth_data = data.get("hourly").get("snow_depth", [])
-            showers_data = data.get("hourly").get("showers", [])
-            cape_data = data.get("hourly").get("cape", [])
-            wind_direction_data = data.get("hourly").get("wind_direction_10m", [])
-            wind_speed_data = data.get("hourly").get("wind_speed_10m", [])
-            wind_gusts_data = data.get("hourly").get("wind_gusts_10m", [])
-            weather_code_data = data.get("hourly").get("weather_code", [])
-            weather_code_data = [WMO_CODES_TR.get(code, "Bilinmeyen") for code in weather_code_data]
-            time_data = data.get("hourly").get("time", [])
+def _build_hourly_columns(data, latitude, longitude):
+    """
+    Open-Meteo saatlik yanıtını satırlara çevirmeden sütun (alan başına liste) biçiminde döndür
+    
+    Open-Meteo her alanı zaten zamanla paralel bir dizi olarak verir; satır pivotu atlanır,
+    yalnızca hava durumu kodları Türkçe açıklamalara çevrilir.
+    """
+    hourly = data.get("hourly") or {}
+    time_data = hourly.get("time") or []
+    if not time_data:
+        return None
+    
+    fields = {name: hourly.get(name) or [] for name in HOURLY_VARIABLES.split(",")}
+    fields["weather_code"] = _translate_weather_codes(fields["weather_code"])
+    return {
+        "time": time_data,
+        "fields": fields,
+        "coordinates": {"longitude": longitude, "latitude": latitude}
+    }
 
-            
-            data_by_time = []
-            for i, t in enumerate(time_data):
-                # güvenli indeksleme ile her zaman tek bir zaman nesnesi oluştur
-                entry = {
-                    "time": t,
-                    "precipitation": rainfall_data[i] if i < len(rainfall_data) else None,
-                    "temperature_2m": temperature_data[i] if i < len(temperature_data) else None,
-                    "wind_direction_10m": wind_direction_data[i] if i < len(wind_direction_data) else None,
-                    "wind_speed_10m": wind_speed_data[i] if i < len(wind_speed_data) else None,
-                    "wind_gusts_10m": wind_gusts_data[i] if i < len(wind_gusts_data) else None,
-                    "relative_humidity_2m": relative_humidity_2m_data[i] if i < len(relative_humidity_2m_data) else None,
-                    "apparent_temperature": apparent_temperature_data[i] if i < len(apparent_temperature_data) else None,
-                    "soil_moisture_0_to_1cm": soil_moisture_0_to_1cm_data[i] if i < len(soil_moisture_0_to_1cm_data) else None,
-                    "soil_moisture_1_to_3cm": soil_moisture_1_to_3cm_data[i] if i < len(soil_moisture_1_to_3cm_data) else None,
-                    "soil_moisture_3_to_9cm": soil_moisture_3_to_9cm_data[i] if i < len(soil_moisture_3_to_9cm_data) else None,
-                    "soil_moisture_9_to_27cm": soil_moisture_9_to_27cm_data[i] if i < len(soil_moisture_9_to_27cm_data) else None,
-                    "soil_moisture_27_to_81cm": soil_moisture_27_to_81cm_data[i] if i < len(soil_moisture_27_to_81cm_data) else None,
-                    "soil_temperature_0cm": soil_temperature_0cm_data[i] if i < len(soil_temperature_0cm_data) else None,
-                    "soil_temperature_6cm": soil_temperature_6cm_data[i] if i < len(soil_temperature_6cm_data) else None,
-                    "soil_temperature_18cm": soil_temperature_18cm_data[i] if i < len(soil_temperature_18cm_data) else None,
-                    "soil_temperature_54cm": soil_temperature_54cm_data[i] if i < len(soil_temperature_54cm_data) else None,
-                    "precipitation_probability": precipitation_probability_data[i] if i < len(precipitation_probability_data) else None,
-                    "rain": rain_data[i] if i < len(rain_data) else None,
-                    "snowfall": snowfall_data[i] if i < len(snowfall_data) else None,
-                    "showers": showers_data[i] if i < len(showers_data) else None,
-                    "snow_depth": snow_depth_data[i] if i < len(snow_depth_data) else None,
-                    "cape": cape_data[i] if i < len(cape_data) else None,
-                    "weather_code": weather_code_data[i] if i < len(weather_code_data) else None
-                }
-                data_by_time.append(entry)
-                data_by_time.append({"coordinates": {"longitude": longitude, "latitude": latitude}})
+async def get_hourly_Data(client: httpx.AsyncClient, latitude, longitude,day=1, layout="rows"):
+    lat, lon = _grid(latitude, longitude)
+    url = f"{_HOURLY_URL}&latitude={lat}&longitude={lon}&forecast_days={day}"
 
-            return data_by_time
+    try: 
+        data = await _fetch_json(client, url, ('hourly', lat, lon, day))
+        if data is not None:
+            if layout == "columns":
+                return _build_hourly_columns(data, latitude, longitude)
+            return _build_hourly_rows(data, latitude, longitude)
             
+    except (httpx.HTTPError, orjson.JSONDecodeError, KeyError, IndexError):
+        return None
+    
 
+async def get_hourly_Data_batch(client: httpx.AsyncClient, coordinates, day=1):
+    """
+    Birden çok konumun saatlik tahminini tek Open-Meteo isteğiyle alma fonksiyonu
+    
+    Args:
+        coordinates: (boylam, enlem) listesi
+    
+    Returns:
+        Konum sırasıyla get_hourly_Data ile aynı biçimde sonuç listesi veya None
+    """
+    grid = [_grid(latitude, longitude) for longitude, latitude in coordinates]
+    lats = ",".join(str(lat) for lat, _ in grid)
+    lons = ",".join(str(lon) for _, lon in grid)
+    url = f"{_HOURLY_URL}&latitude={lats}&longitude={lons}&forecast_days={day}"
+
+    try: 
+        data = await _fetch_json(client, url, ('hourly_batch', tuple(grid), day))
+        if data is not None:
+            # Tek konumda Open-Meteo liste yerine tek nesne döndürür
+            locations = data if isinstance(data, list) else [data]
+            if len(locations) != len(coordinates):
+                return None
+            results = [
+                _build_hourly_rows(location, latitude, longitude)
+                for location, (longitude, latitude) in zip(locations, coordinates)
+            ]
+            if all(results):
+                return results
             
-    except requests.exceptions.RequestException as e:
+    except (httpx.HTTPError, orjson.JSONDecodeError, KeyError, IndexError):
         return None
     
 
-# Günlük hava durumu verilerini al
-def get_daily_Data(latitude, longitude,days=1):
-
-    url = "https://api.open-meteo.com/v1/forecast"
-    params = {
-        "latitude": latitude,
-        "longitude": longitude,
-        "daily": "et0_fao_evapotranspiration,precipitation_sum,temperature_2m_mean,apparent_temperature_max,apparent_temperature_mean,apparent_temperature_min,rain_sum,showers_sum,snowfall_sum,precipitation_hours,precipitation_probability_mean,daylight_duration,sunshine_duration,wind_direction_10m_dominant,wind_speed_10m_max,wind_gusts_10m_max,weather_code",
-        "timezone": "auto",
-        "forecast_days": days
+# Günlük tahmin ve arşiv isteklerinde ortak istenen değişkenler
+DAILY_VARIABLES = "et0_fao_evapotranspiration,precipitation_sum,temperature_2m_mean,apparent_temperature_max,apparent_temperature_mean,apparent_temperature_min,rain_sum,showers_sum,snowfall_sum,precipitation_hours,precipitation_probability_mean,daylight_duration,sunshine_duration,wind_direction_10m_dominant,wind_speed_10m_max,wind_gusts_10m_max,weather_code"
+_DAILY_QUERY = urlencode({"daily": DAILY_VARIABLES, "timezone": "auto"})
+_DAILY_URL = f"{FORECAST_URL}?{_DAILY_QUERY}"
+_ARCHIVE_URL = f"{ARCHIVE_URL}?{_DAILY_QUERY}"
+
+# Günlük kayıtlarda "day" alanından sonra sırasıyla yer alan Open-Meteo alanları
+DAILY_ROW_FIELDS = (
+    "precipitation_sum", "et0_fao_evapotranspiration", "temperature_2m_mean",
+    "apparent_temperature_max", "apparent_temperature_mean", "apparent_temperature_min",
+    "rain_sum", "showers_sum", "snowfall_sum", "precipitation_probability_mean",
+    "precipitation_hours", "daylight_duration", "sunshine_duration",
+    "wind_direction_10m_dominant", "wind_speed_10m_max", "wind_gusts_10m_max"
+)
+
+def _build_daily_rows(data, latitude, longitude):
+    """
+    Open-Meteo günlük yanıtını gün başına kayıtlara çevir (tahmin ve arşiv için ortak)
+    
+    Koordinatlar kayıtlara tekrar tekrar eklenmez, yanıtta bir kez yer alır.
+    "daily" bloğu ya da gün listesi yoksa (ör. geçersiz koordinatta {"error": true})
+    hiçbir liste kurulmadan None döner.
+    """
+    daily = data.get("daily") or {}
+    day_data = daily.get("time") or []
+    if not day_data:
+        return None
+    
+    columns = [(name, daily.get(name) or []) for name in DAILY_ROW_FIELDS]
+    weather_codes = daily.get("weather_code") or []
+    weather_code = WMO_CODES_TR.get(weather_codes[0], "Bilinmeyen") if weather_codes else None
+    
+    data_by_day = []
+    for i, d in enumerate(day_data):
+        entry = {"day": d}
+        for name, values in columns:
+            entry[name] = values[i] if i < len(values) else None
+        entry["weather_code"] = weather_code
+        data_by_day.append(entry)
+    return {
+        "coordinates": {"longitude": longitude, "latitude": latitude},
+        "days": data_by_day
     }
 
+# Günlük hava durumu verilerini al
+async def get_daily_Data(client: httpx.AsyncClient, latitude, longitude,days=1):
+
+    lat, lon = _grid(latitude, longitude)
+    url = f"{_DAILY_URL}&latitude={lat}&longitude={lon}&forecast_days={days}"
+
     try: 
-        response = requests.get(url, params=params)
-        if response.status_code==200:
-            data = response.json()
-
-            rainfall_data = data.get("daily").get("precipitation_sum", []),
-            daily_et0_data = data.get("daily").get("et0_fao_evapotranspiration", [])
-            apparant_temperature_max_data = data.get("daily").get("apparent_temperature_max", [])
-            apparant_temperature_mean_data = data.get("daily").get("apparent_temperature_mean", [])
-            apparant_temperature_min_data = data.get("daily").get("apparent_temperature_min", [])
-            rain_Sum_data = data.get("daily").get("rain_sum", [])
-            showers_Sum_data = data.get("daily").get("showers_sum", [])
-            snow_Fall_sum_data = data.get("daily").get("snowfall_sum", [])
-            preci_Probability_mean_data = data.get("daily").get("precipitation_probability_mean", [])
-            preci_Hours_data = data.get("daily").get("precipitation_hours", [])
-            daylight_Duration_data = data.get("daily").get("daylight_duration", [])
-            sunshine_Duration_data = data.get("daily").get("sunshine_duration", [])
-            day_data = data.get("daily").get("time", [])
-            temperature_data = data.get("daily").get("temperature_2m_mean", [])
-            daily_et0_data = data.get("daily").get("et0_fao_evapotranspiration", [])
-            wind_direction_data = data.get("daily").get("wind_direction_10m_dominant", [])
-            wind_speed_data = data.get("daily").get("wind_speed_10m_max", [])
-            wind_gusts_data = data.get("daily").get("wind_gusts_10m_max", [])
-            weather_code_data = data.get("daily").get("weather_code", [])
-            weather_code_data = WMO_CODES_TR.get(weather_code_data[0], "Bilinmeyen")
-            
-            data_by_day = []
-            for i, d in enumerate(day_data):
-                entry={
-                    "day":d,
-                    "precipitation_sum": rainfall_data[0][i] if i < len(rainfall_data[0]) else None,
-                    "et0_fao_evapotranspiration": daily_et0_data[i] if  i < len(daily_et0_data) else None,
-                    "temperature_2m_mean": temperature_data[i] if i < len(temperature_data) else None,
-                    "apparent_temperature_max": apparant_temperature_max_data[i] if i < len(apparant_temperature_max_data) else None,
-                    "apparent_temperature_mean": apparant_temperature_mean_data[i] if i < len(apparant_temperature_mean_data) else None,
-                    "apparent_temperature_min": apparant_temperature_min_data[i] if i < len(apparant_temperature_min_data) else None,
-                    "rain_sum": rain_Sum_data[i] if i < len(rain_Sum_data) else None,
-                    "showers_sum": showers_Sum_data[i] if i < len(showers_Sum_data) else None,
-                    "snowfall_sum": snow_Fall_sum_data[i] if i < len(snow_Fall_sum_data) else None,
-                    "precipitation_probability_mean": preci_Probability_mean_data[i] if i < len(preci_Probability_mean_data) else None,
-                    "precipitation_hours": preci_Hours_data[i] if i < len(preci_Hours_data) else None,
-                    "daylight_duration": daylight_Duration_data[i] if i < len(daylight_Duration_data) else None,
-                    "sunshine_duration": sunshine_Duration_data[i] if i < len(sunshine_Duration_data) else None,
-                    "wind_direction_10m_dominant": wind_direction_data[i] if i < len(wind_direction_data) else None,
-                    "wind_speed_10m_max": wind_speed_data[i] if i < len(wind_speed_data) else None,
-                    "wind_gusts_10m_max": wind_gusts_data[i] if i < len(wind_gusts_data) else None,
-                    "weather_code": weather_code_data
-                }
-                data_by_day.append(entry)
-                data_by_day.append({"coordinates": {"longitude": longitude, "latitude": latitude}})
-            return data_by_day
+        data = await _fetch_json(client, url, ('daily', lat, lon, days))
+        if data is not None:
+            return _build_daily_rows(data, latitude, longitude)
             
-    except requests.exceptions.RequestException as e:
+    except (httpx.HTTPError, orjson.JSONDecodeError, KeyError, IndexError):
         return None
 
-def get_data_by_date(latitude, longitude, start_date, end_date):
+async def get_data_by_date(client: httpx.AsyncClient, latitude, longitude, start_date, end_date):
     """ Belirli bir tarih için veri alma fonksiyonu """
-    url = "https://archive-api.open-meteo.com/v1/archive"
-    params = {
-    "latitude": latitude,
-    "longitude": longitude,
-    "start_date": start_date,
-    "end_date": end_date,
-    "daily": "et0_fao_evapotranspiration,precipitation_sum,temperature_2m_mean,apparent_temperature_max,apparent_temperature_mean,apparent_temperature_min,rain_sum,showers_sum,snowfall_sum,precipitation_hours,precipitation_probability_mean,daylight_duration,sunshine_duration,wind_direction_10m_dominant,wind_speed_10m_max,wind_gusts_10m_max,weather_code",
-    "timezone": "auto"
-    }
+    lat, lon = _grid(latitude, longitude)
+    url = f"{_ARCHIVE_URL}&latitude={lat}&longitude={lon}&start_date={start_date}&end_date={end_date}"
 
     try: 
-        response = requests.get(url, params=params)
-        if response.status_code==200:
-            data = response.json()
-
-            rainfall_data = data.get("daily").get("precipitation_sum", []),
-            daily_et0_data = data.get("daily").get("et0_fao_evapotranspiration", [])
-            apparant_temperature_max_data = data.get("daily").get("apparent_temperature_max", [])
-            apparant_temperature_mean_data = data.get("daily").get("apparent_temperature_mean", [])
-            apparant_temperature_min_data = data.get("daily").get("apparent_temperature_min", [])
-            rain_Sum_data = data.get("daily").get("rain_sum", [])
-            showers_Sum_data = data.get("daily").get("showers_sum", [])
-            snow_Fall_sum_data = data.get("daily").get("snowfall_sum", [])
-            preci_Probability_mean_data = data.get("daily").get("precipitation_probability_mean", [])
-            preci_Hours_data = data.get("daily").get("precipitation_hours", [])
-            daylight_Duration_data = data.get("daily").get("daylight_duration", [])
-            sunshine_Duration_data = data.get("daily").get("sunshine_duration", [])
-            day_data = data.get("daily").get("time", [])
-            temperature_data = data.get("daily").get("temperature_2m_mean", [])
-            daily_et0_data = data.get("daily").get("et0_fao_evapotranspiration", [])
-            wind_direction_data = data.get("daily").get("wind_direction_10m_dominant", [])
-            wind_speed_data = data.get("daily").get("wind_speed_10m_max", [])
-            wind_gusts_data = data.get("daily").get("wind_gusts_10m_max", [])
-            weather_code_data = data.get("daily").get("weather_code", [])
-            weather_code_data = WMO_CODES_TR.get(weather_code_data[0], "Bilinmeyen")
+        data = await _fetch_json(client, url, ('archive', lat, lon, str(start_date), str(end_date)))
+        if data is not None:
+            return _build_daily_rows(data, latitude, longitude)
             
-            data_by_day = []
-            for i, d in enumerate(day_data):
-                entry={
-                    "day":d,
-                    "precipitation_sum": rainfall_data[0][i] if i < len(rainfall_data[0]) else None,
-                    "et0_fao_evapotranspiration": daily_et0_data[i] if  i < len(daily_et0_data) else None,
-                    "temperature_2m_mean": temperature_data[i] if i < len(temperature_data) else None,
-                    "apparent_temperature_max": apparant_temperature_max_data[i] if i < len(apparant_temperature_max_data) else None,
-                    "apparent_temperature_mean": apparant_temperature_mean_data[i] if i < len(apparant_temperature_mean_data) else None,
-                    "apparent_temperature_min": apparant_temperature_min_data[i] if i < len(apparant_temperature_min_data) else None,
-                    "rain_sum": rain_Sum_data[i] if i < len(rain_Sum_data) else None,
-                    "showers_sum": showers_Sum_data[i] if i < len(showers_Sum_data) else None,
-                    "snowfall_sum": snow_Fall_sum_data[i] if i < len(snow_Fall_sum_data) else None,
-                    "precipitation_probability_mean": preci_Probability_mean_data[i] if i < len(preci_Probability_mean_data) else None,
-                    "precipitation_hours": preci_Hours_data[i] if i < len(preci_Hours_data) else None,
-                    "daylight_duration": daylight_Duration_data[i] if i < len(daylight_Duration_data) else None,
-                    "sunshine_duration": sunshine_Duration_data[i] if i < len(sunshine_Duration_data) else None,
-                    "wind_direction_10m_dominant": wind_direction_data[i] if i < len(wind_direction_data) else None,
-                    "wind_speed_10m_max": wind_speed_data[i] if i < len(wind_speed_data) else None,
-                    "wind_gusts_10m_max": wind_gusts_data[i] if i < len(wind_gusts_data) else None,
-                    "weather_code": weather_code_data
+    except (httpx.HTTPError, orjson.JSONDecodeError, KeyError, IndexError):
+        return None
+
+
+# Saatlik ve günlük tahmin tek forecast isteğinde birlikte istenir (iki ayrı tur yerine tek tur)
+_COMBINED_URL = f"{FORECAST_URL}?{urlencode({'hourly': HOURLY_VARIABLES, 'daily': DAILY_VARIABLES, 'timezone': 'auto'})}"
+
+async def get_combined_Data(client: httpx.AsyncClient, latitude, longitude, days=1):
+    """ Saatlik ve günlük tahmini tek Open-Meteo isteğiyle alma fonksiyonu """
+    lat, lon = _grid(latitude, longitude)
+    url = f"{_COMBINED_URL}&latitude={lat}&longitude={lon}&forecast_days={days}"
+
+    try: 
+        data = await _fetch_json(client, url, ('combined', lat, lon, days))
+        if data is not None:
+            hourly = _build_hourly_rows(data, latitude, longitude)
+            daily = _build_daily_rows(data, latitude, longitude)
+            if hourly and daily:
+                return {
+                    "coordinates": hourly["coordinates"],
+                    "hourly": hourly["hours"],
+                    "daily": daily["days"]
                 }
-                data_by_day.append(entry)
-                data_by_day.append({"coordinates": {"longitude": longitude, "latitude": latitude}})
-            return data_by_day
             
-    except requests.exceptions.RequestException as e:
+    except (httpx.HTTPError, orjson.JSONDecodeError, KeyError, IndexError):
         return None
 
 
-@router.post("/dailyweather/auto")
-async def daily_weather_auto(request: AutoRequest, days: int = Query(default=1, ge=1, le=16, description="Gün sayısı (1-16 arası)")):
-    """Otomatik konum tespiti ile günlük hava durumu (days optional query param)"""
+async def _weather_response(client: httpx.AsyncClient, fetch, coordinates: Optional[tuple], *args, client_ip: Optional[str] = None):
+    """
+    Endpoint'lerin ortak akışı: koordinatı belirle, veriyi çek, hataları HTTP koduna çevir
+    
+    Args:
+        fetch: get_daily_Data / get_hourly_Data / get_data_by_date
+        coordinates: (boylam, enlem) veya otomatik konum için None
+        args: fetch'e koordinatlardan sonra geçilecek parametreler (gün sayısı, tarih aralığı)
+        client_ip: Otomatik konumda konumu tespit edilecek istemci IP adresi
+    """
     try:
-        lon, lat = get_automatic_coordinates()
-        if lon is None or lat is None:
-            return {"error": "Konum tespit edilemedi"}
-            
-        data = get_daily_Data(lat, lon, days)
-        if data:           
+        if coordinates is None:
+            lon, lat = await get_automatic_coordinates(client, client_ip)
+            if lon is None or lat is None:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Konum tespit edilemedi")
+        else:
+            lon, lat = coordinates
+        
+        data = await fetch(client, lat, lon, *args)
+        if data:
             return data
-        return {"error": "Hava durumu verisi alınamadı"}
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Hava durumu verisi alınamadı")
+    except HTTPException:
+        raise
     except Exception as e:
-        return {"error": f"Hata oluştu: {str(e)}"}
+        logger.error("Weather endpoint error: %s", e)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Hata oluştu: {str(e)}")
+
 
+def _client_ip(http_request: Request) -> Optional[str]:
+    """İsteği yapan istemcinin IP adresi (yoksa None)"""
+    return http_request.client.host if http_request.client else None
+
+
+@router.post("/dailyweather/auto")
+async def daily_weather_auto(request: AutoRequest, http_request: Request, days: int = Query(default=1, ge=1, le=16, description="Gün sayısı (1-16 arası)"), client: httpx.AsyncClient = Depends(get_weather_client)):
+    """Otomatik konum tespiti ile günlük hava durumu (days optional query param)"""
+    return await _weather_response(client, get_daily_Data, None, days, client_ip=_client_ip(http_request))
 
 
 @router.post("/dailyweather/manual")
-async def daily_weather_manual(request: ManualRequest, days: int = Query(default=1, ge=1, le=16, description="Gün sayısı (1-16 arası)")):
+async def daily_weather_manual(request: ManualRequest, days: int = Query(default=1, ge=1, le=16, description="Gün sayısı (1-16 arası)"), client: httpx.AsyncClient = Depends(get_weather_client)):
     """Manuel koordinatlar ile günlük hava durumu (days optional query param)"""
-    try:
-        data = get_daily_Data(request.latitude, request.longitude, days)
-        if data:
-            return data
-        return {"error": "Hava durumu verisi alınamadı"}
-    except Exception as e:
-        return {"error": f"Hata oluştu: {str(e)}"}
+    return await _weather_response(client, get_daily_Data, (request.longitude, request.latitude), days)
     
 @router.post("/dailyweather/bydate/manual/{start_date}/{end_date}")
-async def daily_weather_by_date(request: ManualRequest, start_date: date, end_date: date):
+async def daily_weather_by_date(request: ManualRequest, dates: DateRange = Depends(get_date_range), client: httpx.AsyncClient = Depends(get_weather_client)):
     """ Belirtilen tarih aralığında manuel koordinatlar ile günlük hava durumu 
         Tarih formatı: YYYY-AA-GG
     """
-
-    try:
-        _validate_dates(start_date,end_date)
-        data = get_data_by_date(request.latitude, request.longitude, start_date, end_date)
-        if data:
-            return data
-        return {"error": "Hava durumu verisi alınamadı"}
-    except Exception as e:
-        return {"error": f"Hata oluştu: {str(e)}"}
+    return await _weather_response(client, get_data_by_date, (request.longitude, request.latitude), dates.start_date, dates.end_date)
 
 @router.post("/dailyweather/bydate/auto/{start_date}/{end_date}")
-async def daily_weather_by_date_auto(request: AutoRequest, start_date: date, end_date: date):
+async def daily_weather_by_date_auto(request: AutoRequest, http_request: Request, dates: DateRange = Depends(get_date_range), client: httpx.AsyncClient = Depends(get_weather_client)):
     """ Belirtilen tarih aralığında otomatik konum tespiti ile günlük hava durumu
         Tarih formatı: YYYY-AA-GG
     """
-    try:
-        _validate_dates(start_date,end_date)
-        lon, lat = get_automatic_coordinates()
-        if lon is None or lat is None:
-            return {"error": "Konum tespit edilemedi"}
-            
-        data = get_data_by_date(lat, lon, start_date, end_date)
-        if data:           
-            return data
-        return {"error": "Hava durumu verisi alınamadı"}
-    except Exception as e:
-        return {"error": f"Hata oluştu: {str(e)}"}
+    return await _weather_response(client, get_data_by_date, None, dates.start_date, dates.end_date, client_ip=_client_ip(http_request))
         
 @router.post("/hourlyweather/auto")
-async def hourly_weather_auto(request: AutoRequest, days: int = Query(default=1, ge=1, le=16, description="Gün sayısı (1-16 arası)")):
-    """Otomatik konum tespiti ile saatlik hava durumu (days optional query param)"""
-    try:
-        lon, lat = get_automatic_coordinates()
-        if lon is None or lat is None:
-            return {"error": "Konum tespit edilemedi"}
-            
-        data = get_hourly_Data(lat, lon, day=days)
-        if data:
-            return data
-        return {"error": "Hava durumu verisi alınamadı"}
-    except Exception as e:
-        return {"error": f"Hata oluştu: {str(e)}"}
+async def hourly_weather_auto(request: AutoRequest, http_request: Request, days: int = Query(default=1, ge=1, le=16, description="Gün sayısı (1-16 arası)"), layout: HourlyLayout = Query(default="rows", description="rows: saat başına kayıt listesi, columns: alan başına değer listeleri"), client: httpx.AsyncClient = Depends(get_weather_client)):
+    """Otomatik konum tespiti ile saatlik hava durumu (days ve layout optional query param)"""
+    return await _weather_response(client, get_hourly_Data, None, days, layout, client_ip=_client_ip(http_request))
 
 @router.post("/hourlyweather/manual")
-async def hourly_weather_manual(request: ManualRequest, days: int = Query(default=1, ge=1, le=16, description="Gün sayısı (1-16 arası)")):
-    """Manuel koordinatlar ile saatlik hava durumu (days optional query param)"""
-    
+async def hourly_weather_manual(request: ManualRequest, days: int = Query(default=1, ge=1, le=16, description="Gün sayısı (1-16 arası)"), layout: HourlyLayout = Query(default="rows", description="rows: saat başına kayıt listesi, columns: alan başına değer listeleri"), client: httpx.AsyncClient = Depends(get_weather_client)):
+    """Manuel koordinatlar ile saatlik hava durumu (days ve layout optional query param)"""
+    return await _weather_response(client, get_hourly_Data, (request.longitude, request.latitude), days, layout)
+
+@router.post("/combinedweather/auto")
+async def combined_weather_auto(request: AutoRequest, http_request: Request, days: int = Query(default=1, ge=1, le=16, description="Gün sayısı (1-16 arası)"), client: httpx.AsyncClient = Depends(get_weather_client)):
+    """Otomatik konum tespiti ile saatlik + günlük hava durumu (tek Open-Meteo isteği)"""
+    return await _weather_response(client, get_combined_Data, None, days, client_ip=_client_ip(http_request))
+
+@router.post("/combinedweather/manual")
+async def combined_weather_manual(request: ManualRequest, days: int = Query(default=1, ge=1, le=16, description="Gün sayısı (1-16 arası)"), client: httpx.AsyncClient = Depends(get_weather_client)):
+    """Manuel koordinatlar ile saatlik + günlük hava durumu (tek Open-Meteo isteği)"""
+    return await _weather_response(client, get_combined_Data, (request.longitude, request.latitude), days)
+
+@router.post("/hourlyweather/batch")
+async def hourly_weather_batch(request: BatchRequest, days: int = Query(default=1, ge=1, le=16, description="Gün sayısı (1-16 arası)"), client: httpx.AsyncClient = Depends(get_weather_client)):
+    """Birden çok manuel koordinat için saatlik hava durumu (tek Open-Meteo isteği, konum sırasıyla liste)"""
     try:
-        data = get_hourly_Data(request.latitude, request.longitude, day=days)
-        if data:
-            return data
-        return {"error": "Hava durumu verisi alınamadı"}
+        data = await get_hourly_Data_batch(client, [(location.longitude, location.latitude) for location in request.locations], days)
     except Exception as e:
-        return {"error": f"Hata oluştu: {str(e)}"}
\ No newline at end of file
+        logger.error("Weather endpoint error: %s", e)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Hata oluştu: {str(e)}")
+    if data:
+        return data
+    raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Hava durumu verisi alınamadı")
\ No newline at end of file
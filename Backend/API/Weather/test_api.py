@@ -9,11 +9,24 @@ Kullanıcıdan manuel/otomatik seçim alır ve hava durumu verilerini gösterir.
 
 import httpx
 import asyncio
-import json
-import geocoder
+import os
+import orjson
 from typing import Dict, Any
 from datetime import date, datetime
 
+# Test edilen API adresi (istekler bu adrese göre göreli yollarla atılır)
+API_BASE_URL = "http://localhost:8000"
+
+# IP tabanlı konum servisi (mutlak URL olduğu için base_url'den bağımsız çağrılır)
+IP_LOOKUP_URL = "https://ipapi.co/json/"
+
+# WEATHER_TEST_DEBUG=1 ile gönderilen istek gövdeleri de yazdırılır
+DEBUG = os.environ.get("WEATHER_TEST_DEBUG") == "1"
+
+def _pretty_json(data) -> str:
+    """Yanıtı girintili JSON metnine çevir (büyük nokta listelerinde orjson çok daha hızlı)"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
 def get_manual_coordinates():
     """Kullanıcıdan manuel koordinat alır"""
     print("\n📍 Manuel Koordinat Girişi")
@@ -39,16 +52,17 @@ def get_manual_coordinates():
         print("\n❌ İşlem iptal edildi")
         return None, None
 
-def get_automatic_coordinates():
+async def get_automatic_coordinates(client):
     """IP adresi üzerinden otomatik konum bulur"""
     print("\n🌐 Otomatik Konum Tespiti")
     print("-" * 30)
     print("Konumunuz algılanıyor... (Bu işlem biraz sürebilir)")
     
     try:
-        g = geocoder.ip('me')
-        if g.ok:
-            lat, lon = g.latlng
+        response = await client.get(IP_LOOKUP_URL, timeout=5.0)
+        location = orjson.loads(response.content) if response.status_code == 200 else {}
+        lat, lon = location.get('latitude'), location.get('longitude')
+        if lat is not None and lon is not None:
             print(f"✅ Konum algılandı: Enlem={lat}, Boylam={lon}")
             print("(Not: Bu konum, IP adresinize dayalı bir tahmindir.)")
             return lon, lat
@@ -147,364 +161,369 @@ def get_date_range():
         print("\n❌ İşlem iptal edildi")
         return None, None
 
-async def test_daily_weather_manual(longitude, latitude, days=1):
+async def test_daily_weather_manual(client, longitude, latitude, days=1):
     """Manuel koordinat ile günlük hava durumu testi"""
     print(f"\n🌤️ Günlük Hava Durumu Testi (Manuel)")
     print(f"📍 Koordinatlar: Boylam={longitude}, Enlem={latitude}")
     print(f"📅 Gün sayısı: {days}")
     print("-" * 50)
     
-    async with httpx.AsyncClient() as client:
-        try:
-            # JSON request body oluştur
-            request_data = {
-                "method": "Manual",
-                "longitude": longitude,
-                "latitude": latitude
-            }
+    try:
+        # JSON request body oluştur
+        request_data = {
+            "method": "Manual",
+            "longitude": longitude,
+            "latitude": latitude
+        }
+        
+        if DEBUG:
+            print(f"📤 Gönderilen JSON: {_pretty_json(request_data)}")
+        
+        response = await client.post(
+            f"/weather/dailyweather/manual?days={days}",
+            json=request_data,
+            timeout=30.0
+        )
+        
+        print(f"📊 HTTP Status: {response.status_code}")
+        
+        if response.status_code == 200:
+            result = orjson.loads(response.content)
+            print("✅ Başarılı!")
             
-            print(f"📤 Gönderilen JSON: {json.dumps(request_data, indent=2)}")
+            # Ham JSON response'u yazdır
+            print("\n📋 Ham JSON Response:")
+            print("=" * 50)
+            print(_pretty_json(result))
+            print("=" * 50)
             
-            response = await client.post(
-                f"http://localhost:8000/weather/dailyweather/manual?days={days}",
-                json=request_data,
-                timeout=30.0
-            )
+            # Özet bilgiler
+            print(f"\n📊 Özet Bilgiler:")
+            rows = result.get("days") if isinstance(result, dict) else None
+            if rows:
+                first_day = rows[0]
+                print(f"   📅 İlk Gün: {first_day.get('day', 'N/A')}")
+                print(f"   🌡️ Ortalama Sıcaklık: {first_day.get('temperature_2m_mean', 'N/A')}°C")
+                print(f"   🌧️ Yağış Toplamı: {first_day.get('precipitation_sum', 'N/A')}mm")
+                print(f"   🌤️ Hava Durumu: {first_day.get('weather_code', 'N/A')}")
             
-            print(f"📊 HTTP Status: {response.status_code}")
+        else:
+            print(f"❌ Hata: {response.status_code}")
+            print(f"📝 Hata Mesajı: {response.text}")
             
-            if response.status_code == 200:
-                result = response.json()
-                print("✅ Başarılı!")
-                
-                # Ham JSON response'u yazdır
-                print("\n📋 Ham JSON Response:")
-                print("=" * 50)
-                print(json.dumps(result, indent=2, ensure_ascii=False))
-                print("=" * 50)
-                
-                # Özet bilgiler
-                print(f"\n📊 Özet Bilgiler:")
-                if isinstance(result, list) and result:
-                    first_day = result[0]
-                    print(f"   📅 İlk Gün: {first_day.get('day', 'N/A')}")
-                    print(f"   🌡️ Ortalama Sıcaklık: {first_day.get('temperature_2m_mean', 'N/A')}°C")
-                    print(f"   🌧️ Yağış Toplamı: {first_day.get('precipitation_sum', 'N/A')}mm")
-                    print(f"   🌤️ Hava Durumu: {first_day.get('weather_code', 'N/A')}")
-                
-            else:
-                print(f"❌ Hata: {response.status_code}")
-                print(f"📝 Hata Mesajı: {response.text}")
-                
-        except httpx.TimeoutException:
-            print("⏰ Zaman aşımı!")
-        except httpx.ConnectError:
-            print("🔌 Bağlantı hatası! API çalışıyor mu?")
-        except Exception as e:
-            print(f"💥 Beklenmeyen hata: {e}")
+    except httpx.TimeoutException:
+        print("⏰ Zaman aşımı!")
+    except httpx.ConnectError:
+        print("🔌 Bağlantı hatası! API çalışıyor mu?")
+    except Exception as e:
+        print(f"💥 Beklenmeyen hata: {e}")
 
-async def test_daily_weather_auto(days=1):
+async def test_daily_weather_auto(client, days=1):
     """Otomatik konum ile günlük hava durumu testi"""
     print(f"\n🌤️ Günlük Hava Durumu Testi (Otomatik)")
     print(f"📅 Gün sayısı: {days}")
     print("-" * 50)
     
-    async with httpx.AsyncClient() as client:
-        try:
-            # JSON request body oluştur
-            request_data = {
-                "method": "Auto"
-            }
+    try:
+        # JSON request body oluştur
+        request_data = {
+            "method": "Auto"
+        }
+        
+        if DEBUG:
+            print(f"📤 Gönderilen JSON: {_pretty_json(request_data)}")
+        
+        response = await client.post(
+            f"/weather/dailyweather/auto?days={days}",
+            json=request_data,
+            timeout=30.0
+        )
+        
+        print(f"📊 HTTP Status: {response.status_code}")
+        
+        if response.status_code == 200:
+            result = orjson.loads(response.content)
+            print("✅ Başarılı!")
             
-            print(f"📤 Gönderilen JSON: {json.dumps(request_data, indent=2)}")
+            # Ham JSON response'u yazdır
+            print("\n📋 Ham JSON Response:")
+            print("=" * 50)
+            print(_pretty_json(result))
+            print("=" * 50)
             
-            response = await client.post(
-                f"http://localhost:8000/weather/dailyweather/auto?days={days}",
-                json=request_data,
-                timeout=30.0
-            )
+            # Özet bilgiler
+            print(f"\n📊 Özet Bilgiler:")
+            rows = result.get("days") if isinstance(result, dict) else None
+            if rows:
+                first_day = rows[0]
+                print(f"   📅 İlk Gün: {first_day.get('day', 'N/A')}")
+                print(f"   🌡️ Ortalama Sıcaklık: {first_day.get('temperature_2m_mean', 'N/A')}°C")
+                print(f"   🌧️ Yağış Toplamı: {first_day.get('precipitation_sum', 'N/A')}mm")
+                print(f"   🌤️ Hava Durumu: {first_day.get('weather_code', 'N/A')}")
             
-            print(f"📊 HTTP Status: {response.status_code}")
+        else:
+            print(f"❌ Hata: {response.status_code}")
+            print(f"📝 Hata Mesajı: {response.text}")
             
-            if response.status_code == 200:
-                result = response.json()
-                print("✅ Başarılı!")
-                
-                # Ham JSON response'u yazdır
-                print("\n📋 Ham JSON Response:")
-                print("=" * 50)
-                print(json.dumps(result, indent=2, ensure_ascii=False))
-                print("=" * 50)
-                
-                # Özet bilgiler
-                print(f"\n📊 Özet Bilgiler:")
-                if isinstance(result, list) and result:
-                    first_day = result[0]
-                    print(f"   📅 İlk Gün: {first_day.get('day', 'N/A')}")
-                    print(f"   🌡️ Ortalama Sıcaklık: {first_day.get('temperature_2m_mean', 'N/A')}°C")
-                    print(f"   🌧️ Yağış Toplamı: {first_day.get('precipitation_sum', 'N/A')}mm")
-                    print(f"   🌤️ Hava Durumu: {first_day.get('weather_code', 'N/A')}")
-                
-            else:
-                print(f"❌ Hata: {response.status_code}")
-                print(f"📝 Hata Mesajı: {response.text}")
-                
-        except httpx.TimeoutException:
-            print("⏰ Zaman aşımı!")
-        except httpx.ConnectError:
-            print("🔌 Bağlantı hatası! API çalışıyor mu?")
-        except Exception as e:
-            print(f"💥 Beklenmeyen hata: {e}")
+    except httpx.TimeoutException:
+        print("⏰ Zaman aşımı!")
+    except httpx.ConnectError:
+        print("🔌 Bağlantı hatası! API çalışıyor mu?")
+    except Exception as e:
+        print(f"💥 Beklenmeyen hata: {e}")
 
-async def test_hourly_weather_manual(longitude, latitude, days=1):
+async def test_hourly_weather_manual(client, longitude, latitude, days=1):
     """Manuel koordinat ile saatlik hava durumu testi"""
     print(f"\n⏰ Saatlik Hava Durumu Testi (Manuel)")
     print(f"📍 Koordinatlar: Boylam={longitude}, Enlem={latitude}")
     print(f"📅 Gün sayısı: {days}")
     print("-" * 50)
     
-    async with httpx.AsyncClient() as client:
-        try:
-            # JSON request body oluştur
-            request_data = {
-                "method": "Manual",
-                "longitude": longitude,
-                "latitude": latitude
-            }
+    try:
+        # JSON request body oluştur
+        request_data = {
+            "method": "Manual",
+            "longitude": longitude,
+            "latitude": latitude
+        }
+        
+        if DEBUG:
+            print(f"📤 Gönderilen JSON: {_pretty_json(request_data)}")
+        
+        response = await client.post(
+            f"/weather/hourlyweather/manual?days={days}",
+            json=request_data,
+            timeout=30.0
+        )
+        
+        print(f"📊 HTTP Status: {response.status_code}")
+        
+        if response.status_code == 200:
+            result = orjson.loads(response.content)
+            print("✅ Başarılı!")
             
-            print(f"📤 Gönderilen JSON: {json.dumps(request_data, indent=2)}")
+            # Ham JSON response'u yazdır
+            print("\n📋 Ham JSON Response:")
+            print("=" * 50)
+            print(_pretty_json(result))
+            print("=" * 50)
             
-            response = await client.post(
-                f"http://localhost:8000/weather/hourlyweather/manual?days={days}",
-                json=request_data,
-                timeout=30.0
-            )
+            # Özet bilgiler
+            print(f"\n📊 Özet Bilgiler:")
+            rows = result.get("hours") if isinstance(result, dict) else None
+            if rows:
+                first_hour = rows[0]
+                print(f"   ⏰ İlk Saat: {first_hour.get('time', 'N/A')}")
+                print(f"   🌡️ Sıcaklık: {first_hour.get('temperature_2m', 'N/A')}°C")
+                print(f"   💧 Nem: {first_hour.get('relative_humidity_2m', 'N/A')}%")
+                print(f"   🌤️ Hava Durumu: {first_hour.get('weather_code', 'N/A')}")
             
-            print(f"📊 HTTP Status: {response.status_code}")
+        else:
+            print(f"❌ Hata: {response.status_code}")
+            print(f"📝 Hata Mesajı: {response.text}")
             
-            if response.status_code == 200:
-                result = response.json()
-                print("✅ Başarılı!")
-                
-                # Ham JSON response'u yazdır
-                print("\n📋 Ham JSON Response:")
-                print("=" * 50)
-                print(json.dumps(result, indent=2, ensure_ascii=False))
-                print("=" * 50)
-                
-                # Özet bilgiler
-                print(f"\n📊 Özet Bilgiler:")
-                if isinstance(result, list) and result:
-                    first_hour = result[0]
-                    print(f"   ⏰ İlk Saat: {first_hour.get('time', 'N/A')}")
-                    print(f"   🌡️ Sıcaklık: {first_hour.get('temperature_2m', 'N/A')}°C")
-                    print(f"   💧 Nem: {first_hour.get('relative_humidity_2m', 'N/A')}%")
-                    print(f"   🌤️ Hava Durumu: {first_hour.get('weather_code', 'N/A')}")
-                
-            else:
-                print(f"❌ Hata: {response.status_code}")
-                print(f"📝 Hata Mesajı: {response.text}")
-                
-        except httpx.TimeoutException:
-            print("⏰ Zaman aşımı!")
-        except httpx.ConnectError:
-            print("🔌 Bağlantı hatası! API çalışıyor mu?")
-        except Exception as e:
-            print(f"💥 Beklenmeyen hata: {e}")
+    except httpx.TimeoutException:
+        print("⏰ Zaman aşımı!")
+    except httpx.ConnectError:
+        print("🔌 Bağlantı hatası! API çalışıyor mu?")
+    except Exception as e:
+        print(f"💥 Beklenmeyen hata: {e}")
 
-async def test_hourly_weather_auto(days=1):
+async def test_hourly_weather_auto(client, days=1):
     """Otomatik konum ile saatlik hava durumu testi"""
     print(f"\n⏰ Saatlik Hava Durumu Testi (Otomatik)")
     print(f"📅 Gün sayısı: {days}")
     print("-" * 50)
     
-    async with httpx.AsyncClient() as client:
-        try:
-            # JSON request body oluştur
-            request_data = {
-                "method": "Auto"
-            }
+    try:
+        # JSON request body oluştur
+        request_data = {
+            "method": "Auto"
+        }
+        
+        if DEBUG:
+            print(f"📤 Gönderilen JSON: {_pretty_json(request_data)}")
+        
+        response = await client.post(
+            f"/weather/hourlyweather/auto?days={days}",
+            json=request_data,
+            timeout=30.0
+        )
+        
+        print(f"📊 HTTP Status: {response.status_code}")
+        
+        if response.status_code == 200:
+            result = orjson.loads(response.content)
+            print("✅ Başarılı!")
             
-            print(f"📤 Gönderilen JSON: {json.dumps(request_data, indent=2)}")
+            # Ham JSON response'u yazdır
+            print("\n📋 Ham JSON Response:")
+            print("=" * 50)
+            print(_pretty_json(result))
+            print("=" * 50)
             
-            response = await client.post(
-                f"http://localhost:8000/weather/hourlyweather/auto?days={days}",
-                json=request_data,
-                timeout=30.0
-            )
+            # Özet bilgiler
+            print(f"\n📊 Özet Bilgiler:")
+            rows = result.get("hours") if isinstance(result, dict) else None
+            if rows:
+                first_hour = rows[0]
+                print(f"   ⏰ İlk Saat: {first_hour.get('time', 'N/A')}")
+                print(f"   🌡️ Sıcaklık: {first_hour.get('temperature_2m', 'N/A')}°C")
+                print(f"   💧 Nem: {first_hour.get('relative_humidity_2m', 'N/A')}%")
+                print(f"   🌤️ Hava Durumu: {first_hour.get('weather_code', 'N/A')}")
             
-            print(f"📊 HTTP Status: {response.status_code}")
+        else:
+            print(f"❌ Hata: {response.status_code}")
+            print(f"📝 Hata Mesajı: {response.text}")
             
-            if response.status_code == 200:
-                result = response.json()
-                print("✅ Başarılı!")
-                
-                # Ham JSON response'u yazdır
-                print("\n📋 Ham JSON Response:")
-                print("=" * 50)
-                print(json.dumps(result, indent=2, ensure_ascii=False))
-                print("=" * 50)
-                
-                # Özet bilgiler
-                print(f"\n📊 Özet Bilgiler:")
-                if isinstance(result, list) and result:
-                    first_hour = result[0]
-                    print(f"   ⏰ İlk Saat: {first_hour.get('time', 'N/A')}")
-                    print(f"   🌡️ Sıcaklık: {first_hour.get('temperature_2m', 'N/A')}°C")
-                    print(f"   💧 Nem: {first_hour.get('relative_humidity_2m', 'N/A')}%")
-                    print(f"   🌤️ Hava Durumu: {first_hour.get('weather_code', 'N/A')}")
-                
-            else:
-                print(f"❌ Hata: {response.status_code}")
-                print(f"📝 Hata Mesajı: {response.text}")
-                
-        except httpx.TimeoutException:
-            print("⏰ Zaman aşımı!")
-        except httpx.ConnectError:
-            print("🔌 Bağlantı hatası! API çalışıyor mu?")
-        except Exception as e:
-            print(f"💥 Beklenmeyen hata: {e}")
+    except httpx.TimeoutException:
+        print("⏰ Zaman aşımı!")
+    except httpx.ConnectError:
+        print("🔌 Bağlantı hatası! API çalışıyor mu?")
+    except Exception as e:
+        print(f"💥 Beklenmeyen hata: {e}")
 
-async def test_daily_weather_by_date_manual(longitude, latitude, start_date, end_date):
+async def test_daily_weather_by_date_manual(client, longitude, latitude, start_date, end_date):
     """Manuel koordinat ile tarih aralığı günlük hava durumu testi"""
     print(f"\n📅 Tarih Aralığı Günlük Hava Durumu Testi (Manuel)")
     print(f"📍 Koordinatlar: Boylam={longitude}, Enlem={latitude}")
     print(f"📅 Tarih Aralığı: {start_date} - {end_date}")
     print("-" * 50)
     
-    async with httpx.AsyncClient() as client:
-        try:
-            # JSON request body oluştur
-            request_data = {
-                "method": "Manual",
-                "longitude": longitude,
-                "latitude": latitude
-            }
+    try:
+        # JSON request body oluştur
+        request_data = {
+            "method": "Manual",
+            "longitude": longitude,
+            "latitude": latitude
+        }
+        
+        if DEBUG:
+            print(f"📤 Gönderilen JSON: {_pretty_json(request_data)}")
+        
+        response = await client.post(
+            f"/weather/dailyweather/bydate/manual/{start_date}/{end_date}",
+            json=request_data,
+            timeout=30.0
+        )
+        
+        print(f"📊 HTTP Status: {response.status_code}")
+        
+        if response.status_code == 200:
+            result = orjson.loads(response.content)
+            print("✅ Başarılı!")
             
-            print(f"📤 Gönderilen JSON: {json.dumps(request_data, indent=2)}")
+            # Ham JSON response'u yazdır
+            print("\n📋 Ham JSON Response:")
+            print("=" * 50)
+            print(_pretty_json(result))
+            print("=" * 50)
             
-            response = await client.post(
-                f"http://localhost:8000/weather/dailyweather/bydate/manual/{start_date}/{end_date}",
-                json=request_data,
-                timeout=30.0
-            )
+            # Özet bilgiler
+            print(f"\n📊 Özet Bilgiler:")
+            rows = result.get("days") if isinstance(result, dict) else None
+            if rows:
+                first_day = rows[0]
+                print(f"   📅 İlk Gün: {first_day.get('day', 'N/A')}")
+                print(f"   🌡️ Ortalama Sıcaklık: {first_day.get('temperature_2m_mean', 'N/A')}°C")
+                print(f"   🌧️ Yağış Toplamı: {first_day.get('precipitation_sum', 'N/A')}mm")
+                print(f"   🌤️ Hava Durumu: {first_day.get('weather_code', 'N/A')}")
             
-            print(f"📊 HTTP Status: {response.status_code}")
+        else:
+            print(f"❌ Hata: {response.status_code}")
+            print(f"📝 Hata Mesajı: {response.text}")
             
-            if response.status_code == 200:
-                result = response.json()
-                print("✅ Başarılı!")
-                
-                # Ham JSON response'u yazdır
-                print("\n📋 Ham JSON Response:")
-                print("=" * 50)
-                print(json.dumps(result, indent=2, ensure_ascii=False))
-                print("=" * 50)
-                
-                # Özet bilgiler
-                print(f"\n📊 Özet Bilgiler:")
-                if isinstance(result, list) and result:
-                    first_day = result[0]
-                    print(f"   📅 İlk Gün: {first_day.get('day', 'N/A')}")
-                    print(f"   🌡️ Ortalama Sıcaklık: {first_day.get('temperature_2m_mean', 'N/A')}°C")
-                    print(f"   🌧️ Yağış Toplamı: {first_day.get('precipitation_sum', 'N/A')}mm")
-                    print(f"   🌤️ Hava Durumu: {first_day.get('weather_code', 'N/A')}")
-                
-            else:
-                print(f"❌ Hata: {response.status_code}")
-                print(f"📝 Hata Mesajı: {response.text}")
-                
-        except httpx.TimeoutException:
-            print("⏰ Zaman aşımı!")
-        except httpx.ConnectError:
-            print("🔌 Bağlantı hatası! API çalışıyor mu?")
-        except Exception as e:
-            print(f"💥 Beklenmeyen hata: {e}")
+    except httpx.TimeoutException:
+        print("⏰ Zaman aşımı!")
+    except httpx.ConnectError:
+        print("🔌 Bağlantı hatası! API çalışıyor mu?")
+    except Exception as e:
+        print(f"💥 Beklenmeyen hata: {e}")
 
-async def test_daily_weather_by_date_auto(start_date, end_date):
+async def test_daily_weather_by_date_auto(client, start_date, end_date):
     """Otomatik konum ile tarih aralığı günlük hava durumu testi"""
     print(f"\n📅 Tarih Aralığı Günlük Hava Durumu Testi (Otomatik)")
     print(f"📅 Tarih Aralığı: {start_date} - {end_date}")
     print("-" * 50)
     
-    async with httpx.AsyncClient() as client:
-        try:
-            # JSON request body oluştur
-            request_data = {
-                "method": "Auto"
-            }
+    try:
+        # JSON request body oluştur
+        request_data = {
+            "method": "Auto"
+        }
+        
+        if DEBUG:
+            print(f"📤 Gönderilen JSON: {_pretty_json(request_data)}")
+        
+        response = await client.post(
+            f"/weather/dailyweather/bydate/auto/{start_date}/{end_date}",
+            json=request_data,
+            timeout=30.0
+        )
+        
+        print(f"📊 HTTP Status: {response.status_code}")
+        
+        if response.status_code == 200:
+            result = orjson.loads(response.content)
+            print("✅ Başarılı!")
             
-            print(f"📤 Gönderilen JSON: {json.dumps(request_data, indent=2)}")
+            # Ham JSON response'u yazdır
+            print("\n📋 Ham JSON Response:")
+            print("=" * 50)
+            print(_pretty_json(result))
+            print("=" * 50)
             
-            response = await client.post(
-                f"http://localhost:8000/weather/dailyweather/bydate/auto/{start_date}/{end_date}",
-                json=request_data,
-                timeout=30.0
-            )
+            # Özet bilgiler
+            print(f"\n📊 Özet Bilgiler:")
+            rows = result.get("days") if isinstance(result, dict) else None
+            if rows:
+                first_day = rows[0]
+                print(f"   📅 İlk Gün: {first_day.get('day', 'N/A')}")
+                print(f"   🌡️ Ortalama Sıcaklık: {first_day.get('temperature_2m_mean', 'N/A')}°C")
+                print(f"   🌧️ Yağış Toplamı: {first_day.get('precipitation_sum', 'N/A')}mm")
+                print(f"   🌤️ Hava Durumu: {first_day.get('weather_code', 'N/A')}")
             
-            print(f"📊 HTTP Status: {response.status_code}")
+        else:
+            print(f"❌ Hata: {response.status_code}")
+            print(f"📝 Hata Mesajı: {response.text}")
             
-            if response.status_code == 200:
-                result = response.json()
-                print("✅ Başarılı!")
-                
-                # Ham JSON response'u yazdır
-                print("\n📋 Ham JSON Response:")
-                print("=" * 50)
-                print(json.dumps(result, indent=2, ensure_ascii=False))
-                print("=" * 50)
-                
-                # Özet bilgiler
-                print(f"\n📊 Özet Bilgiler:")
-                if isinstance(result, list) and result:
-                    first_day = result[0]
-                    print(f"   📅 İlk Gün: {first_day.get('day', 'N/A')}")
-                    print(f"   🌡️ Ortalama Sıcaklık: {first_day.get('temperature_2m_mean', 'N/A')}°C")
-                    print(f"   🌧️ Yağış Toplamı: {first_day.get('precipitation_sum', 'N/A')}mm")
-                    print(f"   🌤️ Hava Durumu: {first_day.get('weather_code', 'N/A')}")
-                
-            else:
-                print(f"❌ Hata: {response.status_code}")
-                print(f"📝 Hata Mesajı: {response.text}")
-                
-        except httpx.TimeoutException:
-            print("⏰ Zaman aşımı!")
-        except httpx.ConnectError:
-            print("🔌 Bağlantı hatası! API çalışıyor mu?")
-        except Exception as e:
-            print(f"💥 Beklenmeyen hata: {e}")
+    except httpx.TimeoutException:
+        print("⏰ Zaman aşımı!")
+    except httpx.ConnectError:
+        print("🔌 Bağlantı hatası! API çalışıyor mu?")
+    except Exception as e:
+        print(f"💥 Beklenmeyen hata: {e}")
 
-async def test_health_check():
+async def test_health_check(client):
     """Sağlık kontrolü testi"""
     print("🏥 Sağlık Kontrolü")
     print("-" * 30)
     
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get("http://localhost:8000/health", timeout=10.0)
-            
-            if response.status_code == 200:
-                print("✅ Weather API sağlıklı!")
-                return True
-            else:
-                print(f"❌ Hata: {response.status_code}")
-                print(f"📝 Mesaj: {response.text}")
-                return False
-                
-        except httpx.ConnectError:
-            print("🔌 Bağlantı hatası! API çalışıyor mu?")
-            return False
-        except Exception as e:
-            print(f"💥 Beklenmeyen hata: {e}")
+    try:
+        response = await client.get("/health", timeout=10.0)
+        
+        if response.status_code == 200:
+            print("✅ Weather API sağlıklı!")
+            return True
+        else:
+            print(f"❌ Hata: {response.status_code}")
+            print(f"📝 Mesaj: {response.text}")
             return False
+            
+    except httpx.ConnectError:
+        print("🔌 Bağlantı hatası! API çalışıyor mu?")
+        return False
+    except Exception as e:
+        print(f"💥 Beklenmeyen hata: {e}")
+        return False
 
-async def main():
-    """Ana test fonksiyonu"""
+async def run_tests(client: httpx.AsyncClient):
+    """Ana test döngüsü (tüm istekler aynı istemciyi kullanır)"""
     print("🌤️ Weather API Interactive Test Suite")
     print("=" * 60)
     
     # Sağlık kontrolü
-    health_ok = await test_health_check()
+    health_ok = await test_health_check(client)
     if not health_ok:
         print("\n❌ API çalışmıyor! Lütfen API'yi başlatın.")
         return
@@ -519,34 +538,34 @@ async def main():
                 
                 if weather_type == "daily":
                     days = get_days_input()
-                    await test_daily_weather_manual(longitude, latitude, days)
+                    await test_daily_weather_manual(client, longitude, latitude, days)
                 elif weather_type == "hourly":
                     days = get_days_input()
-                    await test_hourly_weather_manual(longitude, latitude, days)
+                    await test_hourly_weather_manual(client, longitude, latitude, days)
                 elif weather_type == "daily_by_date":
                     start_date, end_date = get_date_range()
                     if start_date and end_date:
-                        await test_daily_weather_by_date_manual(longitude, latitude, start_date, end_date)
+                        await test_daily_weather_by_date_manual(client, longitude, latitude, start_date, end_date)
                 elif weather_type == "back":
                     continue
             else:
                 print("❌ Geçersiz koordinatlar!")
                 
         elif choice == "auto":
-            longitude, latitude = get_automatic_coordinates()
+            longitude, latitude = await get_automatic_coordinates(client)
             if longitude is not None and latitude is not None:
                 weather_type = get_weather_test_type()
                 
                 if weather_type == "daily":
                     days = get_days_input()
-                    await test_daily_weather_auto(days)
+                    await test_daily_weather_auto(client, days)
                 elif weather_type == "hourly":
                     days = get_days_input()
-                    await test_hourly_weather_auto(days)
+                    await test_hourly_weather_auto(client, days)
                 elif weather_type == "daily_by_date":
                     start_date, end_date = get_date_range()
                     if start_date and end_date:
-                        await test_daily_weather_by_date_auto(start_date, end_date)
+                        await test_daily_weather_by_date_auto(client, start_date, end_date)
                 elif weather_type == "back":
                     continue
             else:
@@ -566,5 +585,14 @@ async def main():
             print("\n👋 Test tamamlandı!")
             break
 
+async def main():
+    """Ana test fonksiyonu - tek bağlantı havuzu açıp testleri çalıştırır"""
+    async with httpx.AsyncClient(
+        base_url=API_BASE_URL,
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=1000),
+        timeout=httpx.Timeout(30.0, connect=5.0)
+    ) as client:
+        await run_tests(client)
+
 if __name__ == "__main__":
     asyncio.run(main())
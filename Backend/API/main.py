@@ -3,6 +3,7 @@
 
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from SoilType import soil_api as soil_router
 from Weather import router as weather_router
 from MachineLearning import ml_api as ml_router
@@ -33,6 +34,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 1 KB üzerindeki yanıtları (saatlik hava durumu, toprak analizi listeleri) gzip ile sıkıştır
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Router'ları ekle
 app.include_router(soil_router.router)
 app.include_router(weather_router.router)
@@ -8,6 +8,7 @@ import atexit
 import subprocess
 import time
 import json
+import orjson
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -22,6 +23,10 @@ api_process = None
 chatbot_instance = None
 service_manager_instance = None
 
+# Toprak özelliklerinde eksik değer işaretleri (HWSD2 -9 kodu ve metin karşılıkları)
+_MISSING = frozenset({-9, -9.0})
+_MISSING_TEXT = frozenset({'na', 'n/a', 'null'})
+
 # FastAPI app for frontend communication
 app = FastAPI(
     title="UMAY Chatbot API",
@@ -260,6 +265,30 @@ def root():
 async def manifest():
     return FileResponse(os.path.join(PathConfig.FRONTEND_DIR, "manifest.json"))
 
+# Frontend proxy endpoint'lerinin Backend API'ye (8000) istekleri için paylaşılan bağlantı havuzu
+BACKEND_API_URL = "http://localhost:8000"
+_backend_client = None
+
+def get_backend_client():
+    """Backend API için paylaşılan httpx istemcisini döndür (ilk istekte kurulur)"""
+    global _backend_client
+    import httpx
+    if _backend_client is None or _backend_client.is_closed:
+        _backend_client = httpx.AsyncClient(
+            base_url=BACKEND_API_URL,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            timeout=30.0
+        )
+    return _backend_client
+
+@app.on_event("shutdown")
+async def close_backend_client():
+    """Sunucu kapanırken paylaşılan httpx istemcisini kapat"""
+    global _backend_client
+    if _backend_client is not None:
+        await _backend_client.aclose()
+        _backend_client = None
+
 @app.get("/api/health")
 async def api_health():
     return {"status": "ok", "service": "UMAY Chatbot API"}
@@ -380,42 +409,39 @@ async def chat_endpoint(request: ChatRequest):
 async def weather_endpoint(request: dict):
     """Frontend'den gelen hava durumu isteklerini işle"""
     try:
-        import httpx
-        
-        # Backend Weather API'ye otomatik konum ile istek gönder
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "http://localhost:8000/weather/dailyweather/auto",
-                json={
-                    "method": "Auto"
-                },
-                params={"days": 1},
-                timeout=30.0
-            )
+        # Backend Weather API'ye otomatik konum ile istek gönder (paylaşılan bağlantı havuzu)
+        response = await get_backend_client().post(
+            "/weather/dailyweather/auto",
+            json={
+                "method": "Auto"
+            },
+            params={"days": 1}
+        )
             
-            if response.status_code == 200:
-                data = response.json()
-                if isinstance(data, list) and len(data) > 0:
-                    # İlk günün verilerini al
-                    daily_data = data[0]
-                    return {
-                        "temperature": daily_data.get('temperature_2m_mean'),
-                        "weather_code": daily_data.get('weather_code'),
-                        "rain_sum": daily_data.get('rain_sum'),
-                        "showers_sum": daily_data.get('showers_sum'),
-                        "snowfall_sum": daily_data.get('snowfall_sum'),
-                        "apparent_temperature_min": daily_data.get('apparent_temperature_min'),
-                        "apparent_temperature_mean": daily_data.get('apparent_temperature_mean'),
-                        "apparent_temperature_max": daily_data.get('apparent_temperature_max'),
-                        "precipitation_sum": daily_data.get('precipitation_sum'),
-                        "wind_speed_max": daily_data.get('wind_speed_10m_max'),
-                        "wind_gusts_max": daily_data.get('wind_gusts_10m_max'),
-                        "sunshine_duration": daily_data.get('sunshine_duration')
-                    }
-                else:
-                    return {"error": "Hava durumu verisi alınamadı"}
+        if response.status_code == 200:
+            data = orjson.loads(response.content)
+            days_data = data.get("days") if isinstance(data, dict) else None
+            if days_data:
+                # İlk günün verilerini al
+                daily_data = days_data[0]
+                return {
+                    "temperature": daily_data.get('temperature_2m_mean'),
+                    "weather_code": daily_data.get('weather_code'),
+                    "rain_sum": daily_data.get('rain_sum'),
+                    "showers_sum": daily_data.get('showers_sum'),
+                    "snowfall_sum": daily_data.get('snowfall_sum'),
+                    "apparent_temperature_min": daily_data.get('apparent_temperature_min'),
+                    "apparent_temperature_mean": daily_data.get('apparent_temperature_mean'),
+                    "apparent_temperature_max": daily_data.get('apparent_temperature_max'),
+                    "precipitation_sum": daily_data.get('precipitation_sum'),
+                    "wind_speed_max": daily_data.get('wind_speed_10m_max'),
+                    "wind_gusts_max": daily_data.get('wind_gusts_10m_max'),
+                    "sunshine_duration": daily_data.get('sunshine_duration')
+                }
             else:
-                return {"error": f"API Error: {response.status_code}"}
+                return {"error": "Hava durumu verisi alınamadı"}
+        else:
+            return {"error": f"API Error: {response.status_code}"}
         
     except Exception as e:
         print(f"❌ Weather endpoint hatası: {e}")
@@ -426,71 +452,67 @@ async def weather_endpoint(request: dict):
 async def soil_endpoint(request: dict):
     """Frontend'den gelen toprak analizi isteklerini işle"""
     try:
-        import httpx
+        # Backend Soil API'ye otomatik konum ile istek gönder (paylaşılan bağlantı havuzu)
+        response = await get_backend_client().post(
+            "/soiltype/analyze/auto",
+            json={
+                "method": "Auto"
+            }
+        )
         
-        # Backend Soil API'ye otomatik konum ile istek gönder
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "http://localhost:8000/soiltype/analyze/auto",
-                json={
-                    "method": "Auto"
-                },
-                timeout=30.0
-            )
+        if response.status_code == 200:
+            soil_data = orjson.loads(response.content)
             
-            if response.status_code == 200:
-                soil_data = response.json()
-                
-                # Gerçek toprak analizi verilerini döndür
-                classification = soil_data.get('classification', {})
-                basic_props = soil_data.get('basic_properties', [])
-                texture_props = soil_data.get('texture_properties', [])
-                physical_props = soil_data.get('physical_properties', [])
-                chemical_props = soil_data.get('chemical_properties', [])
-                salinity_props = soil_data.get('salinity_properties', [])
-                
-                # Tüm özellikleri birleştir
-                all_properties = basic_props + texture_props + physical_props + chemical_props + salinity_props
+            # Gerçek toprak analizi verilerini döndür
+            classification = soil_data.get('classification', {})
+            basic_props = soil_data.get('basic_properties', [])
+            texture_props = soil_data.get('texture_properties', [])
+            physical_props = soil_data.get('physical_properties', [])
+            chemical_props = soil_data.get('chemical_properties', [])
+            salinity_props = soil_data.get('salinity_properties', [])
+            
+            # Tüm özellikleri birleştir
+            all_properties = basic_props + texture_props + physical_props + chemical_props + salinity_props
+            
+            # Geçerli değerleri filtrele ve formatla
+            valid_properties = {}
+            for prop in all_properties:
+                name = prop.get('name', '')
+                value = prop.get('value')
+                unit = prop.get('unit', '')
                 
-                # Geçerli değerleri filtrele ve formatla
-                valid_properties = {}
-                for prop in all_properties:
-                    name = prop.get('name', '')
-                    value = prop.get('value')
-                    unit = prop.get('unit', '')
+                # Null, -9, None değerleri filtrele
+                if value is not None and value not in _MISSING and str(value).lower() not in _MISSING_TEXT:
+                    # Sayısal değerleri 2 ondalık basamakla yuvarla
+                    if isinstance(value, (int, float)):
+                        formatted_value = f"{round(float(value), 2)}"
+                    else:
+                        formatted_value = str(value)
                     
-                    # Null, -9, None değerleri filtrele
-                    if value is not None and value != -9 and value != -9.0 and str(value).lower() not in ['na', 'n/a', 'null']:
-                        # Sayısal değerleri 2 ondalık basamakla yuvarla
-                        if isinstance(value, (int, float)):
-                            formatted_value = f"{round(float(value), 2)}"
-                        else:
-                            formatted_value = str(value)
-                        
-                        # Birim varsa ekle
-                        if unit:
-                            valid_properties[name] = f"{formatted_value} {unit}"
-                        else:
-                            valid_properties[name] = formatted_value
-                
-                # Toprak tipi bilgileri
-                # wrb4_description boşsa wrb2_description'a düş
-                soil_type = classification.get('wrb4_description') or classification.get('wrb2_description') or 'Bilinmiyor'
-                # wrb4_code yoksa wrb2_code'a düş
-                soil_code = classification.get('wrb4_code') or classification.get('wrb2_code') or 'N/A'
-                
-                # Temel bilgileri ekle
-                result = {
-                    "soil_type": soil_type,
-                    "soil_code": soil_code,
-                    "description": f"Toprak ID: {soil_data.get('soil_id', 'N/A')}",
-                    **valid_properties  # Tüm geçerli özellikleri ekle
-                }
-                
-                return result
-            else:
-                return {"error": f"API Error: {response.status_code}"}
-        
+                    # Birim varsa ekle
+                    if unit:
+                        valid_properties[name] = f"{formatted_value} {unit}"
+                    else:
+                        valid_properties[name] = formatted_value
+            
+            # Toprak tipi bilgileri
+            # wrb4_description boşsa wrb2_description'a düş
+            soil_type = classification.get('wrb4_description') or classification.get('wrb2_description') or 'Bilinmiyor'
+            # wrb4_code yoksa wrb2_code'a düş
+            soil_code = classification.get('wrb4_code') or classification.get('wrb2_code') or 'N/A'
+            
+            # Temel bilgileri ekle
+            result = {
+                "soil_type": soil_type,
+                "soil_code": soil_code,
+                "description": f"Toprak ID: {soil_data.get('soil_id', 'N/A')}",
+                **valid_properties  # Tüm geçerli özellikleri ekle
+            }
+            
+            return result
+        else:
+            return {"error": f"API Error: {response.status_code}"}
+    
     except Exception as e:
         print(f"❌ Soil endpoint hatası: {e}")
         return {"error": f"Toprak analizi yapılamadı: {str(e)}"}
@@ -1,6 +1,6 @@
 # tools/weather_tool.py
-import requests
 import httpx
+import orjson
 import asyncio
 from typing import Dict, Any, Optional, Tuple
 import geocoder
@@ -10,11 +10,46 @@ class WeatherTool:
         self.name = "Weather Tool"
         self.description = "Gerçek hava durumu verilerini sağlar - günlük ve saatlik tahminler"
         self.api_base_url = api_base_url
+        # Tüm istekler için paylaşılan bağlantı havuzu (çalışan event loop değişirse yeniden kurulur)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Çalışan event loop'a bağlı paylaşılan httpx istemcisini döndür"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.api_base_url,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                timeout=30.0
+            )
+            self._client_loop = loop
+        return self._client
+    
+    async def aclose(self):
+        """Paylaşılan httpx istemcisini kapat"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+    
+    async def _post_weather(self, path: str, request_data: Dict[str, Any], days: int) -> Dict[str, Any]:
+        """Weather API'ye POST at, sonucu {"success", "data"/"error"} sözlüğüne çevir"""
+        try:
+            response = await self._get_client().post(path, params={"days": days}, json=request_data)
+            
+            if response.status_code == 200:
+                return {"success": True, "data": orjson.loads(response.content)}
+            else:
+                return {"success": False, "error": f"API Error: {response.status_code}"}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
     
     async def get_automatic_coordinates(self) -> Tuple[Optional[float], Optional[float]]:
         """IP adresinden otomatik konum tespiti"""
         try:
-            g = geocoder.ip('me')
+            # geocoder senkron HTTP isteği atar; event loop'u bloklamaması için thread'de çalıştırılır
+            g = await asyncio.to_thread(geocoder.ip, 'me')
             if g.ok:
                 lat, lon = g.latlng
                 return lon, lat
@@ -24,97 +59,35 @@ class WeatherTool:
     
     async def get_daily_weather_auto(self, days: int = 1) -> Dict[str, Any]:
         """Otomatik konum ile günlük hava durumu"""
-        try:
-            async with httpx.AsyncClient() as client:
-                request_data = {"method": "Auto"}
-                response = await client.post(
-                    f"{self.api_base_url}/weather/dailyweather/auto?days={days}",
-                    json=request_data,
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    return {"success": True, "data": response.json()}
-                else:
-                    return {"success": False, "error": f"API Error: {response.status_code}"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        return await self._post_weather("/weather/dailyweather/auto", {"method": "Auto"}, days)
     
     async def get_daily_weather_manual(self, longitude: float, latitude: float, days: int = 1) -> Dict[str, Any]:
         """Manuel koordinat ile günlük hava durumu"""
-        try:
-            async with httpx.AsyncClient() as client:
-                request_data = {
-                    "method": "Manual",
-                    "longitude": longitude,
-                    "latitude": latitude
-                }
-                response = await client.post(
-                    f"{self.api_base_url}/weather/dailyweather/manual?days={days}",
-                    json=request_data,
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    return {"success": True, "data": response.json()}
-                else:
-                    return {"success": False, "error": f"API Error: {response.status_code}"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        return await self._post_weather("/weather/dailyweather/manual", {"method": "Manual", "longitude": longitude, "latitude": latitude}, days)
     
     async def get_hourly_weather_auto(self, days: int = 1) -> Dict[str, Any]:
         """Otomatik konum ile saatlik hava durumu"""
-        try:
-            async with httpx.AsyncClient() as client:
-                request_data = {"method": "Auto"}
-                response = await client.post(
-                    f"{self.api_base_url}/weather/hourlyweather/auto?days={days}",
-                    json=request_data,
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    return {"success": True, "data": response.json()}
-                else:
-                    return {"success": False, "error": f"API Error: {response.status_code}"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        return await self._post_weather("/weather/hourlyweather/auto", {"method": "Auto"}, days)
     
     async def get_hourly_weather_manual(self, longitude: float, latitude: float, days: int = 1) -> Dict[str, Any]:
         """Manuel koordinat ile saatlik hava durumu"""
-        try:
-            async with httpx.AsyncClient() as client:
-                request_data = {
-                    "method": "Manual",
-                    "longitude": longitude,
-                    "latitude": latitude
-                }
-                response = await client.post(
-                    f"{self.api_base_url}/weather/hourlyweather/manual?days={days}",
-                    json=request_data,
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    return {"success": True, "data": response.json()}
-                else:
-                    return {"success": False, "error": f"API Error: {response.status_code}"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        return await self._post_weather("/weather/hourlyweather/manual", {"method": "Manual", "longitude": longitude, "latitude": latitude}, days)
     
     def format_weather_response(self, weather_data: Dict[str, Any], weather_type: str = "daily") -> str:
         """Hava durumu verilerini kullanıcı dostu formatta döndür"""
         if not weather_data.get("success"):
             return f"❌ Hava durumu verisi alınamadı: {weather_data.get('error', 'Bilinmeyen hata')}"
         
+        # Kayıtlar yanıtın "days" (günlük) ya da "hours" (saatlik) alanındadır
         data = weather_data["data"]
-        if not isinstance(data, list) or not data:
+        rows = data.get("days" if weather_type == "daily" else "hours") if isinstance(data, dict) else None
+        if not rows:
             return "❌ Hava durumu verisi bulunamadı"
         
         if weather_type == "daily":
-            return self._format_daily_weather(data)
+            return self._format_daily_weather(rows)
         else:
-            return self._format_hourly_weather(data)
+            return self._format_hourly_weather(rows)
     
     def _format_daily_weather(self, data: list) -> str:
         """Günlük hava durumu formatla"""
@@ -182,4 +155,10 @@ class WeatherTool:
     
     def __call__(self, input_text: str) -> str:
         """Tool çağrıldığında çalışacak metod (sync wrapper)"""
-        return asyncio.run(self.get_weather_analysis())
\ No newline at end of file
+        async def run_once():
+            # asyncio.run kendi loop'unu kapattığı için havuz da aynı çağrıda kapatılır
+            try:
+                return await self.get_weather_analysis()
+            finally:
+                await self.aclose()
+        return asyncio.run(run_once())
\ No newline at end of file